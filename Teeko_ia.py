@@ -1,896 +1,3462 @@
-# teeko_full_fixed.py
-import tkinter as tk
-from tkinter import messagebox
-import random
-import math
-import copy
-import sys
-
-def style_button(btn):
-    btn.configure(bg="#017cbf", fg="#ffffff", font=("Arial", 12, "bold"), bd=0, relief="flat", padx=10, pady=5)
-    btn.bind("<Enter>", lambda e: btn.configure(bg="#009344"))
-    btn.bind("<Leave>", lambda e: btn.configure(bg="#017cbf"))
-
-
-# ---------------- Constantes ----------------
-SIZE = 5
-CELL_SIZE = 90
-PLAYER1 = "X"   # X commence tjrs
-PLAYER2 = "O"
-EMPTY = "."
-COLORS = {PLAYER1: "black", PLAYER2: "beige", EMPTY: "grey"}
-
-# Niveaux de difficulté
-DIFFICULTIES = {
-    "Facile": 1,
-    "Moyen": 3,
-    "Difficile": 5
-}
-
-MISTAKE_PROBS = {
-    1: 0.25,
-    3: 0.10,
-    5: 0.0
-}
-
-# ------------------ Classe principale du jeu ------------------
-class TeekoGame:
-    def __init__(self, root, *,
-                 ai_mode=False,
-                 human_side=PLAYER1,
-                 minimax_depth=3,
-                 show_eval=False,
-                 return_to_menu_cb=None,
-                 pos_nb=0,
-                 pos=None):
-        self.root = root
-        self.ai_mode = ai_mode
-        self.human_side = human_side
-        self.ai_side = PLAYER2 if human_side == PLAYER1 else PLAYER1
-        self.minimax_depth = minimax_depth
-        self.show_eval = show_eval
-        self.return_to_menu_cb = return_to_menu_cb
-        self.pos_nb = pos_nb
-        if pos is None:
-            self.pos = []
-        else:
-            self.pos = pos
-
-        self.board = [[EMPTY for _ in range(SIZE)] for _ in range(SIZE)]
-        self.turn = PLAYER1  # X commence tjrs
-        self.total_pieces = 0
-        self.selected_piece = None
-
-        # dernier txt d'eval pr le garder visible après draw_board
-        self.last_eval_text = ""
-
-        # Interface
-        self.root.title("Teeko")
-        self.frame = tk.Frame(self.root)
-        self.frame.pack()
-        self.canvas = tk.Canvas(self.frame, width=SIZE*CELL_SIZE, height=SIZE*CELL_SIZE, bg="white")
-        self.canvas.grid(row=0, column=0, columnspan=3)
-        self.canvas.bind("<Button-1>", self.on_click)
-
-        self.label_info = tk.Label(self.frame, text=self._info_text(), font=("Arial", 14, "bold"), fg="#333333", bg="#f0f0f0")
-        self.label_info.grid(row=1, column=0, sticky="w", padx=6, pady=6)
-
-        self.label_eval = tk.Label(self.frame, text="", font=("Arial", 12), fg="#555555", bg="#f0f0f0")
-        self.label_eval.grid(row=1, column=1, sticky="e", padx=6, pady=6)
-
-        self.btn_menu = tk.Button(self.frame, text="Retour au menu", command=self._return_to_menu)
-        self.btn_menu.grid(row=1, column=2, sticky="e", padx=6, pady=6)
-        style_button(self.btn_menu)  
-        self.draw_board()
-     
-
-        # Si l'IA doit jouer en 1er (humain a choisi O), lancer IA
-        if self.ai_mode and self.turn == self.ai_side:
-            self.root.after(300, self.ai_play)
-
-    def _info_text(self):
-        return f"Tour: {self.turn}    Joueur humain: {self.human_side}    IA: {self.ai_side}"
-
-    def _update_labels(self, eval_text=None):
-        # si eval_text fourni, màj txt stocké seulement si show_eval activé
-        if eval_text is not None:
-            if self.show_eval:
-                self.last_eval_text = eval_text
-            else:
-                self.last_eval_text = ""
-        # màj label info
-        self.label_info.config(text=self._info_text())
-        # màj label eval selon show_eval et txt stocké
-        if self.show_eval and self.last_eval_text:
-            self.label_eval.config(text=self.last_eval_text)
-        else:
-            self.label_eval.config(text="")
-
-    def _return_to_menu(self):
-        # détruire fenêtre et appeler callback
-        if self.return_to_menu_cb:
-            self.root.destroy()
-            self.return_to_menu_cb()
-        else:
-            self.root.destroy()
-
-    # ---------------- Dessin ----------------
-    def draw_board(self):
-        self.canvas.delete("all")
-        self.canvas.configure(bg="#f0d9b5")
-
-        for r in range(SIZE):
-            for c in range(SIZE):
-                x1 = c * CELL_SIZE
-                y1 = r * CELL_SIZE
-                x2 = x1 + CELL_SIZE
-                y2 = y1 + CELL_SIZE
-                # dessiner grille subtile
-                self.canvas.create_rectangle(x1, y1, x2, y2, outline="#b58863", width=2)
-
-                piece = self.board[r][c]
-                if piece != EMPTY:
-                    color = "#000000" if piece==PLAYER1 else "#fffacd"  # pions noir & crème
-                    self.canvas.create_oval(x1+15, y1+15, x2-15, y2-15, fill=color, outline="#555555", width=2)
-
-        # surligner pion sélectionné
-        if self.selected_piece:
-            r, c = self.selected_piece
-            x1 = c * CELL_SIZE
-            y1 = r * CELL_SIZE
-            x2 = x1 + CELL_SIZE
-            y2 = y1 + CELL_SIZE
-            self.canvas.create_rectangle(x1+2, y1+2, x2-2, y2-2, outline="#00ff00", width=4)    
-
-        # màj labels
-        self._update_labels()
-
-    # ---------------- Gestion des clics ----------------
-    def on_click(self, event):
-        # ignorer clics si c'est le tour de l'IA
-        if self.ai_mode and self.turn == self.ai_side:
-            return
-
-        c = event.x // CELL_SIZE
-        r = event.y // CELL_SIZE
-        if not (0 <= r < SIZE and 0 <= c < SIZE):
-            return
-
-        # Phase placement
-        if self.total_pieces < 8:
-            if self.board[r][c] == EMPTY:
-                self.board[r][c] = self.turn
-                self.total_pieces += 1
-                if self.check_win(self.turn):
-                    self.draw_board()
-                    self.end_game(self.turn)
-                    return
-                self._advance_turn()
-            return
-
-        # Phase mouvement
-        if self.selected_piece is None:
-            if self.board[r][c] == self.turn:
-                self.selected_piece = (r, c)
-                self.draw_board()
-        else:
-            r1, c1 = self.selected_piece
-            if (r, c) == (r1, c1):
-                self.selected_piece = None
-                self.draw_board()
-                return
-            if self.board[r][c] != EMPTY:
-                return
-            if not self.adjacent(r1, c1, r, c):
-                return
-            # déplacer
-            self.board[r1][c1] = EMPTY
-            self.board[r][c] = self.turn
-            self.selected_piece = None
-            self.pos_nb += 1
-            if self.check_win(self.turn):
-                self.draw_board()
-                self.end_game(self.turn)
-                return
-            if self.check_draw(self.turn):
-                self.draw_board()
-                self.end_game_draw()
-                return
-            self._advance_turn()
-
-    def _advance_turn(self):
-        # alterner
-        self.turn = PLAYER1 if self.turn == PLAYER2 else PLAYER2
-        self.draw_board()
-        # si mode IA et tour de l'IA -> planifier jeu IA
-        if self.ai_mode and self.turn == self.ai_side:
-            self.root.after(200, self.ai_play)
-
-    # ---------------- Utilitaires ----------------
-    def adjacent(self, r1, c1, r2, c2):
-        return abs(r1 - r2) <= 1 and abs(c1 - c2) <= 1 and not (r1 == r2 and c1 == c2)
-
-    def count_pieces_board(self, board, player):
-        return sum(row.count(player) for row in board)
-
-    # ---------------- Vérif victoire ----------------
-    def check_win_board(self, board, player):
-        # lignes et colonnes
-        for r in range(SIZE):
-            for c in range(SIZE - 3):
-                if all(board[r][c + i] == player for i in range(4)):
-                    return True
-        for r in range(SIZE - 3):
-            for c in range(SIZE):
-                if all(board[r + i][c] == player for i in range(4)):
-                    return True
-        # diagonales
-        for r in range(SIZE - 3):
-            for c in range(SIZE - 3):
-                if all(board[r + i][c + i] == player for i in range(4)):
-                    return True
-                if all(board[r + 3 - i][c + i] == player for i in range(4)):
-                    return True
-        # carré 2x2
-        for r in range(SIZE - 1):
-            for c in range(SIZE - 1):
-                if all(board[r + i][c + j] == player for i in range(2) for j in range(2)):
-                    return True
-        return False
-
-    def check_win(self, player):
-        return self.check_win_board(self.board, player)
-    
-    def check_draw(self, player):
-        # Nulle après 15 coups
-        if self.pos_nb == 30:
-            return True
-        
-        # Signature du plateau
-        current_signature = tuple(tuple(row) for row in self.board)
-        
-        # Ajout signature actuelle
-        self.pos.append(current_signature)
-        
-        count = self.pos.count(current_signature)
-        
-        if count >= 3:
-            return True
-        
-        if len(self.pos) > 10:
-            self.pos.pop(0)
-        
-        return False
-
-    # ---------------- Fin de partie ----------------
-    def end_game(self, winner):
-        messagebox.showinfo("Victoire", f"🎉 Le joueur {winner} a gagné !")
-        # garder fenêtre ouverte mais unbind clics
-        self.canvas.unbind("<Button-1>")
-    
-    def end_game_draw(self):
-        messagebox.showinfo("Egalité",f"Egalité après 15 coups ou position répétée 3 fois")
-        # garder fenêtre ouverte mais unbind clics
-        self.canvas.unbind("<Button-1>")
-    
-    # ---------------- Entrée IA ----------------
-    def ai_play(self):
-        # d'abord: victoire ou blocage imm (placement ou mvt)
-        immediate = self.find_immediate_win_or_block()
-        if immediate is not None:
-            # appliquer cible imm
-            self.apply_target(immediate, self.ai_side)
-            # afficher eval si activé
-            if self.show_eval:
-                self._update_labels(eval_text=f"Eval IA: immediate")
-            return
-        
-        # joue parfois au hasard en fonction de la difficulté
-        chance_erreur = MISTAKE_PROBS.get(self.get_minimax_depth(), 0.0)
-        if random.random() < chance_erreur:
-            targets = self.get_all_targets(self.board, self.ai_side)
-            if targets:
-                self.apply_target(random.choice(targets), self.ai_side)
-                if self.show_eval:
-                    self._update_labels(eval_text="Eval IA: erreur volontaire")
-                return
-
-        # sinon minimax
-        move, score = self.minimax(self.board, depth=self.get_minimax_depth(), alpha=-math.inf, beta=math.inf, maximizing=True, perspective_player=self.ai_side)
-        if self.show_eval:
-            self._update_labels(eval_text=f"Eval IA: {score:.1f}")
-        if move is not None:
-            self.apply_target(move, self.ai_side)
-        else:
-            # fallback cible légale aléatoire
-            targets = self.get_all_targets(self.board, self.ai_side)
-            if targets:
-                self.apply_target(random.choice(targets), self.ai_side)
-
-    def get_minimax_depth(self):
-        return self.minimax_depth
-
-    # ---------------- Victoire/blocage imm ----------------
-    def find_immediate_win_or_block(self):
-        ai_moves = self.get_all_targets(self.board, self.ai_side)
-        
-        # Vérif victoire immédiate
-        for move in ai_moves:
-            newb = self.simulate_move(self.board, move, self.ai_side)
-            if self.check_win_board(newb, self.ai_side):
-                return move
-        
-        # Vérif blocage
-        opp_moves = self.get_all_targets(self.board, self.human_side)
-        for opp_move in opp_moves:
-            newb = self.simulate_move(self.board, opp_move, self.human_side)
-            if self.check_win_board(newb, self.human_side):
-                # Chercher si l'IA peut occuper cette destination
-                _, opp_dest = opp_move
-                for ai_move in ai_moves:
-                    _, ai_dest = ai_move
-                    if ai_dest == opp_dest:
-                        return ai_move
-        
-        return None
-
-    # ---------------- Générer cibles ----------------
-    def get_all_targets(self, board, player):
-        """Retourne (source, destination) pour tous les coups.
-        En phase placement: source = None"""
-        targets = []
-        player_piece_count = self.count_pieces_board(board, player)
-        
-        if player_piece_count < 4:
-            # Phase placement
-            for r in range(SIZE):
-                for c in range(SIZE):
-                    if board[r][c] == EMPTY:
-                        targets.append((None, (r, c)))
-        else:
-            # Phase mouvement
-            for sr in range(SIZE):
-                for sc in range(SIZE):
-                    if board[sr][sc] != player:
-                        continue
-                    for dr in (-1, 0, 1):
-                        for dc in (-1, 0, 1):
-                            if dr == 0 and dc == 0:
-                                continue
-                            tr, tc = sr + dr, sc + dc
-                            if 0 <= tr < SIZE and 0 <= tc < SIZE and board[tr][tc] == EMPTY:
-                                targets.append(((sr, sc), (tr, tc)))
-        return targets
-
-    def simulate_move(self, board, move, player):
-        """move = (source, dest) où source peut être None"""
-        nb = copy.deepcopy(board)
-        source, dest = move
-        
-        if source is None:
-            # Phase placement
-            r, c = dest
-            nb[r][c] = player
-        else:
-            # Phase mouvement
-            sr, sc = source
-            dr, dc = dest
-            nb[sr][sc] = EMPTY
-            nb[dr][dc] = player
-        
-        return nb
-
-    def apply_target(self, move, player):
-        """move = (source, dest)"""
-        source, dest = move
-        
-        if source is None:
-            # Phase placement
-            r, c = dest
-            self.board[r][c] = player
-            self.total_pieces += 1
-        else:
-            # Phase mouvement
-            sr, sc = source
-            dr, dc = dest
-            self.board[sr][sc] = EMPTY
-            self.board[dr][dc] = player
-        
-        # Vérifications post-coup
-        self.pos_nb += 1
-        if self.check_win_board(self.board, player):
-            self.draw_board()
-            self.end_game(player)
-            return
-        if self.check_draw(self.turn):
-            self.draw_board()
-            self.end_game_draw()
-            return
-        
-        self.turn = PLAYER1 if self.turn == PLAYER2 else PLAYER2
-        self.draw_board()
-        
-        if self.ai_mode and self.turn == self.ai_side:
-            self.root.after(200, self.ai_play)
-
-    # ---------------- Minimax (alpha-beta) ----------------
-# Remplacer uniquement la fonction minimax dans la classe TeekoGame
-
-    def minimax(self, board, depth, alpha, beta, maximizing, perspective_player=None):
-        
-        # Si perspective_player pas fourni, utiliser ai_side
-        if perspective_player is None:
-            perspective_player = self.ai_side
-        
-        opponent = PLAYER2 if perspective_player == PLAYER1 else PLAYER1
-        
-        # Vérifications terminales avec bonus/malus selon profondeur
-        if self.check_win_board(board, perspective_player):
-            # victoire plus proch preferable
-            return None, 100000 + depth
-        
-        if self.check_win_board(board, opponent):
-            # retarder la si inévitable
-            return None, -100000 - depth
-        
-        if depth == 0:
-            return None, self.evaluate_board_for_player(board, perspective_player)
-
-        player = perspective_player if maximizing else opponent
-        targets = self.get_all_targets(board, player)
-        # Trier mvts par heuristique
-        targets.sort(key=lambda t: -self.move_order_heur(board, t, player))
-
-        best_move = None
-        if maximizing:
-            max_eval = -math.inf
-            for t in targets:
-                newb = self.simulate_move(board, t, player)
-                _, eval_score = self.minimax(newb, depth-1, alpha, beta, False, perspective_player)
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_move = t
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-            return best_move, max_eval
-        else:
-            min_eval = math.inf
-            for t in targets:
-                newb = self.simulate_move(board, t, player)
-                _, eval_score = self.minimax(newb, depth-1, alpha, beta, True, perspective_player)
-                if eval_score < min_eval:
-                    min_eval = eval_score
-                    best_move = t
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-            return best_move, min_eval
-
-    def move_order_heur(self, board, move, player):
-        # préférer centre et adjacence aux alliés
-        source, dest = move
-        r, c = dest
-        center = (SIZE-1)/2
-        center_score = - (abs(r-center) + abs(c-center))
-        ally_neighbors = 0
-        for dr in (-1,0,1):
-            for dc in (-1,0,1):
-                if dr==0 and dc==0: continue
-                rr, cc = r+dr, c+dc
-                if 0<=rr<SIZE and 0<=cc<SIZE and board[rr][cc]==player:
-                    ally_neighbors += 1
-        return center_score + ally_neighbors*1.2
-
-    # ---------------- Evaluation ----------------
-    def evaluate_sequences(self, board, player):
-        """Calcule le score des séquences pour un joueur."""
-        score = 0
-        sequences = []
-        
-        # Lignes
-        for r in range(SIZE):
-            for c in range(SIZE-3):
-                sequences.append([board[r][c+i] for i in range(4)])
-        
-        # Colonnes
-        for c in range(SIZE):
-            for r in range(SIZE-3):
-                sequences.append([board[r+i][c] for i in range(4)])
-        
-        # Diagonales
-        for r in range(SIZE-3):
-            for c in range(SIZE-3):
-                sequences.append([board[r+i][c+i] for i in range(4)])
-                sequences.append([board[r+3-i][c+i] for i in range(4)])
-        
-        for seq in sequences:
-            cnt = seq.count(player)
-            empt = seq.count(EMPTY)
-            if cnt == 4:
-                score += 10000
-            elif cnt == 3 and empt == 1:
-                score += 300
-            elif cnt == 2 and empt == 2:
-                score += 60
-            elif cnt == 1 and empt == 3:
-                score += 5
-        
-        return score
-
-    def evaluate_board_for_player(self, board, perspective_player):
-        
-        opponent = PLAYER2 if perspective_player == PLAYER1 else PLAYER1
-        
-        # Vérifications terminales
-        if self.check_win_board(board, perspective_player): 
-            return 100000
-        if self.check_win_board(board, opponent): 
-            return -100000
-        
-        # Score des séquences
-        score = self.evaluate_sequences(board, perspective_player) - \
-                self.evaluate_sequences(board, opponent)
-        
-        # Bonus centre
-        center = (SIZE-1) / 2
-        for r in range(SIZE):
-            for c in range(SIZE):
-                center_bonus = max(0, 3 - (abs(r-center) + abs(c-center)))
-                if board[r][c] == perspective_player:
-                    score += center_bonus
-                elif board[r][c] == opponent:
-                    score -= center_bonus
-        
-        return score
-
-# ------------------ Classe IA vs IA ------------------
-class TeekoGameAIvsAI(TeekoGame):
-    def __init__(self, root, *, ai1_level=3, ai2_level=3, step_mode=False, return_to_menu_cb=None):
-        # IA vs IA: override planif IA parent
-        super().__init__(root, ai_mode=True, human_side=PLAYER1, minimax_depth=3,
-                        show_eval=False, return_to_menu_cb=return_to_menu_cb)
-        self.ai1_level = ai1_level
-        self.ai2_level = ai2_level
-        self.step_mode = step_mode
-        self.turn = PLAYER1
-        self.total_pieces = 0
-
-        # *** AJOUT CRUCIAL : Désactiver les clics humains ***
-        self.canvas.unbind("<Button-1>")
-
-        # Désactiver planif IA parent
-        self.auto_ai_schedule = False
-
-        # Ajout labels sous le board
-        self.label_ai1 = tk.Label(self.frame, text=f"AI 1: Niveau {self.ai1_level}, Couleur {PLAYER1}", font=("Arial", 12))
-        self.label_ai1.grid(row=2, column=0, pady=6)
-
-        self.label_ai2 = tk.Label(self.frame, text=f"AI 2: Niveau {self.ai2_level}, Couleur {PLAYER2}", font=("Arial", 12))
-        self.label_ai2.grid(row=2, column=2, pady=6)
-
-        # Bouton étape pr mode manuel
-        if self.step_mode:
-            self.btn_next = tk.Button(self.frame, text="Tour suivant", command=self.next_turn)
-            self.btn_next.grid(row=2, column=1, pady=6)
-            style_button(self.btn_next)  # *** AJOUT : style le bouton ***
-
-        # Démarrer 1er mvt auto si mode auto
-        if not self.step_mode:
-            self.root.after(300, self.ai_turn)
-
-    # Override pr retirer avancement auto du tour dans parent
-    def apply_target(self, move, player):
-        """Appliquer un mvt sans changer tour automatiquement."""
-        source, dest = move
-        
-        if source is None:
-            # Phase placement
-            r, c = dest
-            self.board[r][c] = player
-            self.total_pieces += 1
-        else:
-            # Phase mouvement
-            sr, sc = source
-            dr, dc = dest
-            self.board[sr][sc] = EMPTY
-            self.board[dr][dc] = player
-
-        self.draw_board()
-        # vérif victoire
-        self.pos_nb += 1
-        if self.check_win(player):
-            messagebox.showinfo("Fin de partie", f"IA {player} gagne!")
-            return True
-        if self.check_draw(self.turn):
-            self.draw_board()
-            self.end_game_draw()
-            return True
-        return False
-
-    def ai_turn(self):
-        current_ai = self.turn
-        depth = self.ai1_level if current_ai==PLAYER1 else self.ai2_level
-        
-        # D'abord: vérif victoire ou blocage imm
-        immediate = self.find_immediate_win_or_block_aivsai(current_ai)
-        if immediate is not None:
-            game_over = self.apply_target(immediate, current_ai)
-            if game_over:
-                return
-        else:
-            # ajout de chance de coup aléatoire
-            chance_erreur = MISTAKE_PROBS.get(depth, 0.0)
-            played_randomly = False
-            if random.random() < chance_erreur:
-                targets = self.get_all_targets(self.board, current_ai)
-                if targets:
-                    random_target = random.choice(targets)
-                    game_over = self.apply_target(random_target, current_ai)
-                    if game_over: return
-                    played_randomly = True
-
-            # Utiliser minimax
-            if not played_randomly:
-                maximizing = True  # Tjrs maximiser pr joueur actuel
-                move, _ = self.minimax(self.board, depth, -math.inf, math.inf, maximizing=maximizing, perspective_player=current_ai)
-                if move:
-                    game_over = self.apply_target(move, current_ai)
-                    if game_over:
-                        return
-
-        # Changer tour manuellement
-        self.turn = PLAYER1 if self.turn==PLAYER2 else PLAYER2
-
-        # Planifier tour suivant seulement en mode auto
-        if not self.step_mode:
-            self.root.after(1000, self.ai_turn)
-    
-    def find_immediate_win_or_block_aivsai(self, current_ai):
-        """Trouver victoire ou blocage imm pr mode IA vs IA."""
-        opponent = PLAYER2 if current_ai==PLAYER1 else PLAYER1
-        
-        # Vérif si IA actuelle peut gagner imm
-        ai_targets = self.get_all_targets(self.board, current_ai)
-        for t in ai_targets:
-            newb = self.simulate_move(self.board, t, current_ai)
-            if self.check_win_board(newb, current_ai):
-                return t
-        
-        # Vérif si adversaire menace de gagner -> bloquer
-        opp_targets = self.get_all_targets(self.board, opponent)
-        for opp_move in opp_targets:
-            newb = self.simulate_move(self.board, opp_move, opponent)
-            if self.check_win_board(newb, opponent):
-                # Chercher si l'IA peut occuper cette destination
-                _, opp_dest = opp_move
-                for ai_move in ai_targets:
-                    _, ai_dest = ai_move
-                    if ai_dest == opp_dest:
-                        return ai_move
-        
-        return None
-
-    def next_turn(self):
-        """Mode étape manuelle: exécuter un seul mvt IA."""
-        self.ai_turn()
-
-    # Override _info_text pr masquer labels humain/IA
-    def _info_text(self):
-        return f"Tour: {self.turn}"
-
-
-# ------------------ Menu / Paramètres UI ------------------
-class TeekoMenu:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Menu Teeko")
-        self.root.state('normal')
-
-        self.ai_difficulty = "Moyen"
-        self.human_color = PLAYER1
-        self.show_eval = False
-
-        tk.Label(self.root, text="Bienvenue dans Teeko !", font=("Arial", 16, "bold"), 
-                 fg="#333333", bg="#f0f0f0").pack(pady=10)
-
-        btn_pvp = tk.Button(self.root, text="Jouer à deux", command=self.start_pvp)
-        btn_pvp.pack(pady=6)
-        style_button(btn_pvp)
-
-        btn_vs_ai = tk.Button(self.root, text="Jouer contre l'IA", command=self.start_vs_ai)
-        btn_vs_ai.pack(pady=6)
-        style_button(btn_vs_ai)
-
-        btn_ai_vs_ai = tk.Button(self.root, text="AI vs AI", command=self.start_ai_vs_ai)
-        btn_ai_vs_ai.pack(pady=6)
-        style_button(btn_ai_vs_ai)
-
-        btn_rules = tk.Button(self.root, text="Règles du jeu", command=self.show_rules)
-        btn_rules.pack(pady=6)
-        style_button(btn_rules)
-
-        btn_quit = tk.Button(self.root, text="Quitter", command=self.quit_app)
-        btn_quit.pack(pady=6)
-        style_button(btn_quit)
-
-        self.root.configure(bg="#f0f0f0")
-
-        self.root.mainloop()
-
-    def quit_app(self):
-        self.root.destroy()
-        sys.exit()
-
-    def start_pvp(self):
-        self.root.destroy()
-        w = tk.Tk()
-        w.state('normal')
-        TeekoGame(w, ai_mode=False, human_side=self.human_color,
-                 minimax_depth=DIFFICULTIES[self.ai_difficulty],
-                 show_eval=self.show_eval,
-                 return_to_menu_cb=self.show_menu)
-        w.mainloop()
-
-    def start_vs_ai(self):
-        # ouvrir settings pr choix
-        self.open_settings(modal=True)
-        self.root.destroy()
-        w = tk.Tk()
-        w.state('normal')
-        TeekoGame(w, ai_mode=True, human_side=self.human_color,
-                 minimax_depth=DIFFICULTIES[self.ai_difficulty],
-                 show_eval=self.show_eval,
-                 return_to_menu_cb=self.show_menu)
-        w.mainloop()
-
-    def start_ai_vs_ai(self):
-        # ouvrir settings pour parametrer partie
-        s = tk.Toplevel(self.root)
-        s.title("Paramètres AI vs AI")
-        s.geometry("600x500")
-        s.configure(bg="#f0f0f0")
-        s.transient(self.root)
-
-        # titre
-        tk.Label(s, text="Paramètres AI vs AI", font=("Arial", 16, "bold"), fg="#333333", bg="#f0f0f0").pack(pady=15)
-
-        # AI niveau 1
-        tk.Label(s, text="Niveau AI 1:", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", padx=20, pady=(10,0))
-        ai1_var = tk.IntVar(value=3)
-        for name, depth in DIFFICULTIES.items():
-            rb = tk.Radiobutton(s, text=name, variable=ai1_var, value=depth, font=("Arial", 11), bg="#f0f0f0", anchor="w")
-            rb.pack(anchor="w", padx=40)
-
-        # AI niveau 2
-        tk.Label(s, text="Niveau AI 2:", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", padx=20, pady=(10,0))
-        ai2_var = tk.IntVar(value=3)
-        for name, depth in DIFFICULTIES.items():
-            rb = tk.Radiobutton(s, text=name, variable=ai2_var, value=depth, font=("Arial", 11), bg="#f0f0f0", anchor="w")
-            rb.pack(anchor="w", padx=40)
-
-
-        tk.Label(s, text="Mode de jeu:", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", padx=20, pady=(10,0))
-        mode_var = tk.StringVar(value="auto")
-        tk.Radiobutton(s, text="Automatique", variable=mode_var, value="auto", font=("Arial", 11), bg="#f0f0f0", anchor="w").pack(anchor="w", padx=40)
-        tk.Radiobutton(s, text="Step by Step", variable=mode_var, value="step", font=("Arial", 11), bg="#f0f0f0", anchor="w").pack(anchor="w", padx=40)
-
-        # bouton start
-        btn_start = tk.Button(s, text="Démarrer AI vs AI", font=("Arial", 12, "bold"), command=lambda: apply_and_start())
-        btn_start.pack(pady=20)
-        style_button(btn_start)
-
-        def apply_and_start():
-            ai1_level = ai1_var.get()
-            ai2_level = ai2_var.get()
-            step_mode = (mode_var.get() == "step")
-            s.destroy()
-            self.root.destroy()
-            w = tk.Tk()
-            w.state('normal')
-            TeekoGameAIvsAI(w, ai1_level=ai1_level, ai2_level=ai2_level, step_mode=step_mode,
-                            return_to_menu_cb=self.show_menu)
-            w.mainloop()
-
-        s.grab_set()
-        s.wait_window()
-
-    def show_rules(self):
-        """Display the rules of Teeko in a styled window."""
-        rules_text = (
-            "RÈGLES DU JEU TEEKO\n\n"
-            "• Le jeu se joue sur une grille 5×5.\n"
-            "• Chaque joueur possède 4 pièces (X et O).\n"
-            "• X commence toujours.\n\n"
-            "Phase 1 – Placement :\n"
-            "Les joueurs placent leurs pièces à tour de rôle sur une case vide.\n"
-            "Après 8 tours, chaque joueur aura placé ses 4 pièces.\n\n"
-            "Phase 2 – Mouvement :\n"
-            "À partir de ce moment, les joueurs déplacent l'une de leurs pièces\n"
-            "vers une case vide adjacente (horizontalement, verticalement ou en diagonale).\n\n"
-            "Objectif :\n"
-            "Former l'un des motifs suivants :\n"
-            "• 4 pièces alignées (ligne, colonne ou diagonale)\n"
-            "• ou un carré 2×2.\n\n"
-            "Le premier joueur à réussir cela gagne la partie !"
-        )
-
-        # creer fenetre
-        w = tk.Toplevel(self.root)
-        w.title("Règles du jeu")
-        w.geometry("600x500")
-        w.configure(bg="#f0f0f0") 
-        w.transient(self.root)
-
-        # Titre
-        tk.Label(w, text="Règles du jeu Teeko", font=("Arial", 16, "bold"), fg="#333333", bg="#f0f0f0").pack(pady=15)
-
-        # text frame
-        text_frame = tk.Frame(w, bg="#f0f0f0")
-        text_frame.pack(fill="both", expand=True, padx=20, pady=10)
-
-        rules_label = tk.Label(text_frame, text=rules_text, font=("Arial", 12), justify="left",
-                            wraplength=550, fg="#333333", bg="#f0f0f0")
-        rules_label.pack(anchor="nw")
-
-        # bouton close
-        btn_close = tk.Button(w, text="Fermer", font=("Arial", 12, "bold"), command=w.destroy)
-        btn_close.pack(pady=15)
-        style_button(btn_close)
-
-        w.grab_set()
-        w.wait_window()
-    
-    def show_menu(self):
-
-        self.__init__()
-
-    def open_settings(self, modal=False):
-        s = tk.Toplevel(self.root)
-        s.title("Paramètres IA")
-        s.geometry("400x380")
-        s.configure(bg="#f0f0f0")
-        s.transient(self.root)
-
-        # Titre
-        tk.Label(s, text="Paramètres du jeu", font=("Arial", 16, "bold"), fg="#333333", bg="#f0f0f0").pack(pady=15)
-
-        content_frame = tk.Frame(s, bg="#f0f0f0")
-        content_frame.pack(fill="both", expand=True, padx=20)
-
-        # Difficultée
-        tk.Label(content_frame, text="Difficulté IA:", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", pady=(0,5))
-        diff_var = tk.StringVar(value=self.ai_difficulty)
-        for name in DIFFICULTIES.keys():
-            tk.Radiobutton(content_frame, text=name, variable=diff_var, value=name, font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", padx=10, pady=2)
-
-        # choix couleur
-        tk.Label(content_frame, text="Couleur du joueur (X commence):", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", pady=(10,5))
-        color_var = tk.StringVar(value=self.human_color)
-        tk.Radiobutton(content_frame, text="Jouer X (commence)", variable=color_var, value=PLAYER1, font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", padx=10, pady=2)
-        tk.Radiobutton(content_frame, text="Jouer O (IA commence)", variable=color_var, value=PLAYER2, font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", padx=10, pady=2)
-
-        # afficher eval
-        show_var = tk.BooleanVar(value=self.show_eval)
-        tk.Checkbutton(content_frame, text="Afficher évaluation Minimax pendant la partie", variable=show_var,
-                    font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", pady=(10,5))
-
-        # bouton appliquer
-        btn_apply = tk.Button(s, text="Appliquer", font=("Arial", 12, "bold"), command=lambda: apply_and_close())
-        btn_apply.pack(pady=15)
-        style_button(btn_apply)
-
-        def apply_and_close():
-            self.ai_difficulty = diff_var.get()
-            self.human_color = color_var.get()
-            self.show_eval = show_var.get()
-            s.destroy()
-
-        if modal:
-            s.grab_set()
-            s.wait_window()
-
-
-# ------------------ Run ------------------
-if __name__ == "__main__":
+# teeko_full_fixed.py
+try:
+    import tkinter as tk
+    from tkinter import messagebox
+except ImportError:  # moteur seul (self-play, outils hors ligne) sans tkinter
+    tk = None
+    messagebox = None
+try:
+    import numpy as np
+except ImportError:  # évaluation par lots (evaluate_batch) indisponible
+    np = None
+import random
+import math
+import copy
+import sys
+import time
+import os
+import mmap
+import struct
+import itertools
+import json
+import multiprocessing
+from collections import deque
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+def style_button(btn):
+    btn.configure(bg="#017cbf", fg="#ffffff", font=("Arial", 12, "bold"), bd=0, relief="flat", padx=10, pady=5)
+    btn.bind("<Enter>", lambda e: btn.configure(bg="#009344"))
+    btn.bind("<Leave>", lambda e: btn.configure(bg="#017cbf"))
+
+
+# ---------------- Constantes ----------------
+SIZE = 5
+CELL_SIZE = 90
+PLAYER1 = "X"   # X commence tjrs
+PLAYER2 = "O"
+EMPTY = "."
+COLORS = {PLAYER1: "black", PLAYER2: "beige", EMPTY: "grey"}
+
+# Niveaux de difficulté
+DIFFICULTIES = {
+    "Facile": 1,
+    "Moyen": 3,
+    "Difficile": 5
+}
+
+MISTAKE_PROBS = {
+    1: 0.25,
+    3: 0.10,
+    5: 0.0
+}
+
+# noeuds max par coup de chaque niveau (cf. level_budget): borne le coût CPU d'un
+# coup, la plupart des recherches finissent avant. Sans limite de temps, une
+# partie à graine fixe (TeekoEngine(seed=...)) rejoue les mêmes coups
+LEVEL_NODES = {
+    1: 500,
+    3: 5000,
+    5: 50000
+}
+
+# intervalle de relève du résultat d'une recherche en arrière-plan (ms)
+AI_POLL_MS = 30
+# IA vs IA: délai par défaut entre deux coups (ms) et nb max de dessins du plateau par seconde
+AI_MOVE_DELAY_MS = 1000
+RENDER_FPS = 30
+
+# Nulle: 30 coups joués, ou 3e occurrence d'une position parmi les 10 précédentes
+MOVE_LIMIT = 30
+REPETITION_WINDOW = 10
+
+# ---------------- Bitboards ----------------
+# case (r, c) -> bit r*SIZE + c, un entier de 25 bits par joueur
+NB_CELLS = SIZE * SIZE
+FULL_MASK = (1 << NB_CELLS) - 1
+CENTER = (SIZE - 1) / 2
+
+def cell_index(r, c):
+    return r * SIZE + c
+
+def cell_coords(i):
+    return divmod(i, SIZE)
+
+def board_from_string(s):
+    """Plateau liste de listes depuis 25 caractères (ligne par ligne)."""
+    return [list(s[r * SIZE:(r + 1) * SIZE]) for r in range(SIZE)]
+
+def _cells_mask(cells):
+    m = 0
+    for r, c in cells:
+        m |= 1 << cell_index(r, c)
+    return m
+
+# alignements de 4, même ordre que evaluate_sequences
+LINE_MASKS = (
+    [_cells_mask([(r, c + i) for i in range(4)]) for r in range(SIZE) for c in range(SIZE - 3)] +
+    [_cells_mask([(r + i, c) for i in range(4)]) for c in range(SIZE) for r in range(SIZE - 3)] +
+    [m for r in range(SIZE - 3) for c in range(SIZE - 3)
+     for m in (_cells_mask([(r + i, c + i) for i in range(4)]),
+               _cells_mask([(r + 3 - i, c + i) for i in range(4)]))]
+)
+SQUARE_MASKS = [_cells_mask([(r + i, c + j) for i in range(2) for j in range(2)])
+                for r in range(SIZE - 1) for c in range(SIZE - 1)]
+WIN_MASKS = LINE_MASKS + SQUARE_MASKS
+# chaque joueur a au plus 4 pions: il gagne ssi ses bits sont exactement un motif
+WIN_SET = frozenset(WIN_MASKS)
+
+# voisins de chaque case (ordre croissant = ordre de get_all_targets):
+# coordonnées par [r][c], indices et masques par index de case
+NEIGHBOR_COORDS = [
+    [tuple((r + dr, c + dc)
+           for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+           if (dr or dc) and 0 <= r + dr < SIZE and 0 <= c + dc < SIZE)
+     for c in range(SIZE)]
+    for r in range(SIZE)
+]
+NEIGHBORS = [tuple(rr * SIZE + cc for rr, cc in NEIGHBOR_COORDS[r][c])
+             for r in range(SIZE) for c in range(SIZE)]
+NEIGHBOR_MASKS = [_cells_mask(NEIGHBOR_COORDS[r][c]) for r in range(SIZE) for c in range(SIZE)]
+
+# poids de evaluate_sequences selon nb de pions sur un alignement sans adversaire
+SEQ_WEIGHTS = (0, 5, 60, 300, 10000)
+# bonus centre de evaluate_board_for_player et score centre de move_order_heur
+CENTER_BONUS = [max(0, 3 - (abs(r - CENTER) + abs(c - CENTER)))
+                for r in range(SIZE) for c in range(SIZE)]
+CENTER_ORDER = [-(abs(r - CENTER) + abs(c - CENTER))
+                for r in range(SIZE) for c in range(SIZE)]
+
+# évaluation incrémentale: occupation de chaque alignement codée nb_X * 5 + nb_O
+LINE_STEP = (5, 1)
+LINE_VALUE = [(SEQ_WEIGHTS[xc] if oc == 0 else 0) - (SEQ_WEIGHTS[oc] if xc == 0 else 0)
+              for xc in range(5) for oc in range(5)]
+# LINE_GAIN[side][code] = variation du score (point de vue X) quand side pose un pion sur l'alignement
+LINE_GAIN = [[LINE_VALUE[code + step] - LINE_VALUE[code] if code + step < len(LINE_VALUE) else 0
+              for code in range(len(LINE_VALUE))]
+             for step in LINE_STEP]
+# alignements passant par chaque case
+CELL_LINES = [[l for l, m in enumerate(LINE_MASKS) if m >> i & 1] for i in range(SIZE * SIZE)]
+# bonus centre signé (point de vue X) par camp
+CENTER_SIGNED = (list(CENTER_BONUS), [-b for b in CENTER_BONUS])
+
+
+def iter_bits(b):
+    """Indices des bits à 1, du plus petit au plus grand."""
+    while b:
+        low = b & -b
+        yield low.bit_length() - 1
+        b ^= low
+
+
+def bits_win(b):
+    if b in WIN_SET:
+        return True
+    if b.bit_count() <= 4:
+        return False
+    # plateau hors règles (>4 pions): test motif par motif
+    return any(b & m == m for m in WIN_MASKS)
+
+
+def bits_moves(own, opp):
+    """Coups (source, dest) en indices de cases, source None en placement."""
+    empty = ~(own | opp) & FULL_MASK
+    if own.bit_count() < 4:
+        return [(None, d) for d in iter_bits(empty)]
+    return [(s, d) for s in iter_bits(own) for d in NEIGHBORS[s] if empty >> d & 1]
+
+
+def bits_apply(own, move):
+    """Bits du joueur après son coup (sans toucher au plateau)."""
+    source, dest = move
+    if source is not None:
+        own ^= 1 << source
+    return own | (1 << dest)
+
+
+def bits_order_key(own, move):
+    # même heuristique que move_order_heur (centre + alliés voisins)
+    d = move[1]
+    return -(CENTER_ORDER[d] + (own & NEIGHBOR_MASKS[d]).bit_count() * 1.2)
+
+
+def bits_evaluate(me, opp):
+    """evaluate_board_for_player sur bitboards (me = joueur de la perspective)."""
+    if bits_win(me):
+        return 100000
+    if bits_win(opp):
+        return -100000
+    score = 0
+    for m in LINE_MASKS:
+        a = me & m
+        b = opp & m
+        if not b:
+            score += SEQ_WEIGHTS[a.bit_count()]
+        elif not a:
+            score -= SEQ_WEIGHTS[b.bit_count()]
+    for i in iter_bits(me):
+        score += CENTER_BONUS[i]
+    for i in iter_bits(opp):
+        score -= CENTER_BONUS[i]
+    return score
+
+
+# ---------------- Menaces (gains en un coup) ----------------
+# 3 pions d'un motif gagnant -> cases qui le complètent (masque)
+WIN_COMPLETIONS = {}
+for _m in WIN_MASKS:
+    for _i in iter_bits(_m):
+        WIN_COMPLETIONS[_m ^ (1 << _i)] = WIN_COMPLETIONS.get(_m ^ (1 << _i), 0) | (1 << _i)
+
+
+def bits_threats(own, opp):
+    """Cases vides où own gagnerait en un coup s'il avait le trait (masque):
+    pose du 4e pion en placement, déplacement d'un pion voisin en mouvement."""
+    empty = ~(own | opp) & FULL_MASK
+    n = own.bit_count()
+    if n == 3:
+        return WIN_COMPLETIONS.get(own, 0) & empty
+    if n != 4:
+        return 0
+    threats = 0
+    for s in iter_bits(own):
+        threats |= WIN_COMPLETIONS.get(own ^ (1 << s), 0) & NEIGHBOR_MASKS[s]
+    return threats & empty
+
+
+def bits_winning_moves(own, opp):
+    """Coups gagnants de own (ordre de bits_moves)."""
+    empty = ~(own | opp) & FULL_MASK
+    n = own.bit_count()
+    if n == 3:
+        return [(None, d) for d in iter_bits(WIN_COMPLETIONS.get(own, 0) & empty)]
+    if n != 4:
+        return []
+    return [(s, d) for s in iter_bits(own)
+            for d in iter_bits(WIN_COMPLETIONS.get(own ^ (1 << s), 0) & NEIGHBOR_MASKS[s] & empty)]
+
+
+def bits_unstoppable(own, opp):
+    """own gagne au coup suivant quoi que joue opp (au trait, sans gain immédiat):
+    double menace, ou menace sur une case qu'aucun pion de opp ne peut occuper.
+    Les menaces créées en libérant une case ne sont pas comptées."""
+    threats = bits_threats(own, opp)
+    if not threats:
+        return False
+    if threats & (threats - 1):
+        return True
+    if opp.bit_count() < 4:
+        return False
+    d = threats.bit_length() - 1
+    return not opp & NEIGHBOR_MASKS[d]
+
+
+def bits_threat_move(own, opp):
+    """Coup forcé de own au trait: gain immédiat, sinon blocage de la 1re case
+    menacée par opp (ordre de ses coups) que own peut occuper, sinon None.
+
+    Face à une menace imparable (bits_unstoppable), le blocage possible est joué
+    quand même: la partie est perdue, la recherche n'y changerait rien."""
+    wins = bits_winning_moves(own, opp)
+    if wins:
+        return wins[0]
+    threats = bits_threats(opp, own)
+    if not threats:
+        return None
+    placement = own.bit_count() < 4
+    for _, d in bits_winning_moves(opp, own):
+        if placement:
+            return None, d
+        sources = own & NEIGHBOR_MASKS[d]
+        if sources:
+            return (sources & -sources).bit_length() - 1, d
+    return None
+
+
+# ---------------- Évaluation par lots (NumPy, optionnel) ----------------
+# motifs gagnants x cases (1 si la case en fait partie): les len(LINE_MASKS)
+# premiers sont les alignements de evaluate_sequences, puis les carrés
+if np is not None:
+    _NP_SHIFTS = np.arange(NB_CELLS, dtype=np.int64)
+    _NP_PATTERN_CELLS = np.array([[m >> i & 1 for i in range(NB_CELLS)] for m in WIN_MASKS],
+                                 dtype=np.int64).T
+    _NP_LINE_VALUE = np.array(LINE_VALUE, dtype=np.int64)
+    _NP_CENTER = np.array(CENTER_BONUS, dtype=np.int64)
+
+
+def evaluate_batch(xs, os_, side=0):
+    """bits_evaluate de side (0 = X, 1 = O) pr un lot de positions, xs / os_ =
+    bits de X et de O de chaque position. Retourne un tableau NumPy de scores,
+    identiques à ceux de l'évaluation scalaire."""
+    if np is None:
+        raise ImportError("evaluate_batch: NumPy n'est pas installé")
+    n = len(xs)
+    # (2n, 25) cases occupées, X puis O
+    cells = (np.asarray(list(xs) + list(os_), dtype=np.int64)[:, None] >> _NP_SHIFTS) & 1
+    counts = cells @ _NP_PATTERN_CELLS
+    cx, co = counts[:n], counts[n:]
+    nb_lines = len(LINE_MASKS)
+    score = _NP_LINE_VALUE[cx[:, :nb_lines] * 5 + co[:, :nb_lines]].sum(axis=1)
+    score += (cells[:n] - cells[n:]) @ _NP_CENTER
+    win_x = (cx == 4).any(axis=1)
+    win_o = (co == 4).any(axis=1)
+    if side:
+        score, win_me, win_opp = -score, win_o, win_x
+    else:
+        win_me, win_opp = win_x, win_o
+    return np.where(win_me, 100000, np.where(win_opp, -100000, score))
+
+
+# index de camp pr BitBoard.bits
+SIDE = {PLAYER1: 0, PLAYER2: 1}
+PLAYERS = (PLAYER1, PLAYER2)
+
+# ---------------- Zobrist / table de transposition ----------------
+_zobrist_rng = random.Random(0x7EE60)  # graine fixe: clés identiques d'une partie à l'autre
+ZOBRIST = [[_zobrist_rng.getrandbits(64) for _ in range(NB_CELLS)] for _ in range(2)]
+# clé de noeud: camp de la perspective x (maximizing ou non) -> qui joue et pr qui on score
+ZOBRIST_NODE = [[_zobrist_rng.getrandbits(64) for _ in range(2)] for _ in range(2)]
+# n° du coup, mêlé à la clé qd la limite MOVE_LIMIT est à portée de la recherche
+ZOBRIST_MOVE = [_zobrist_rng.getrandbits(64) for _ in range(MOVE_LIMIT + 1)]
+
+TT_EXACT = 0
+TT_LOWER = 1   # score >= valeur stockée (coupure beta)
+TT_UPPER = 2   # score <= valeur stockée (aucun coup n'a dépassé alpha)
+
+
+def zobrist_key(x, o):
+    key = 0
+    for side, b in enumerate((x, o)):
+        for i in iter_bits(b):
+            key ^= ZOBRIST[side][i]
+    return key
+
+
+class TranspositionTable:
+    """Table de transposition à taille fixe, indexée par clé Zobrist.
+
+    Une entrée = (clé, profondeur, borne, score, meilleur coup, génération).
+    Remplacement: on écrase une entrée d'une recherche précédente ou moins
+    profonde, sinon on garde la plus profonde."""
+
+    def __init__(self, size=1 << 18):
+        self.size = size
+        self.entries = [None] * size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def probe(self, key):
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        i = key % self.size
+        old = self.entries[i]
+        if old is None or old[0] == key or old[5] != self.generation or depth >= old[1]:
+            self.entries[i] = (key, depth, flag, score, move, self.generation)
+            self.stores += 1
+
+    def new_search(self):
+        # entrées des coups précédents deviennent remplaçables
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.hits = self.misses = self.stores = 0
+
+    def stats_text(self):
+        total = self.hits + self.misses
+        rate = 100.0 * self.hits / total if total else 0.0
+        return f"TT: {self.hits} hits / {self.misses} miss ({rate:.1f}%)"
+
+
+class PositionHistory:
+    """Clés Zobrist des dernières positions de la partie, pr la règle de répétition.
+
+    Garde la position courante + les REPETITION_WINDOW précédentes (comme
+    l'ancienne liste de check_draw), avec un compteur par clé: push, pop et
+    count en O(1). pop() annule le dernier push, ce qui permet à la recherche
+    d'y empiler ses coups."""
+
+    def __init__(self, keys=(), window=REPETITION_WINDOW):
+        self.window = window
+        self.keys = deque()
+        self.counts = {}
+        # clé sortie de la fenêtre par chaque push (None si aucune), pr pop()
+        self._dropped = []
+        for key in keys:
+            self.push(key)
+
+    def push(self, key):
+        """Ajoute la position key, retourne son nb d'occurrences dans la fenêtre."""
+        dropped = None
+        if len(self.keys) > self.window:
+            dropped = self.keys.popleft()
+            self._discount(dropped)
+        self._dropped.append(dropped)
+        self.keys.append(key)
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        return count
+
+    def pop(self):
+        self._discount(self.keys.pop())
+        dropped = self._dropped.pop()
+        if dropped is not None:
+            self.keys.appendleft(dropped)
+            self.counts[dropped] = self.counts.get(dropped, 0) + 1
+
+    def _discount(self, key):
+        count = self.counts[key] - 1
+        if count:
+            self.counts[key] = count
+        else:
+            del self.counts[key]
+
+    def count(self, key):
+        return self.counts.get(key, 0)
+
+    def copy(self):
+        return PositionHistory(self.keys, self.window)
+
+    def __len__(self):
+        return len(self.keys)
+
+
+# ---------------- Budget de recherche ----------------
+class SearchTimeout(Exception):
+    """Levée dans minimax quand le budget (temps ou noeuds) est épuisé."""
+
+
+class SearchHandle:
+    """Recherche lancée dans un thread (cf. TeekoEngine.start_search).
+
+    cancel() l'interrompt à la prochaine vérif de budget (ts les 1024 noeuds);
+    result() vaut alors None."""
+
+    def __init__(self, target, cancel_event):
+        self.cancel_event = cancel_event
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True)
+        self._thread.start()
+
+    def _run(self, target):
+        try:
+            self._result = target()
+        except SearchTimeout:
+            # annulée en cours de route
+            pass
+        except BaseException as e:
+            self._error = e
+
+    def done(self):
+        return not self._thread.is_alive()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+
+    def result(self, partial=False):
+        """Résultat de la recherche (attend la fin), None si annulée, sauf si
+        partial: celui d'une recherche itérative interrompue (dernière itération
+        terminée, cf. start_search_move), None si elle n'en a terminé aucune."""
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return None if self.cancelled() and not partial else self._result
+
+
+class SearchBudget:
+    """Budget de réflexion par coup: profondeur max + temps (ms) et/ou nb de noeuds.
+
+    Sans limite de temps ni de noeuds, équivaut à un minimax à profondeur fixe."""
+
+    def __init__(self, max_depth=5, time_ms=None, nodes=None):
+        self.max_depth = max_depth
+        self.time_ms = time_ms
+        self.nodes = nodes
+
+    def is_limited(self):
+        return self.time_ms is not None or self.nodes is not None
+
+    def key(self):
+        return self.max_depth, self.time_ms, self.nodes
+
+    def __repr__(self):
+        return f"SearchBudget(max_depth={self.max_depth}, time_ms={self.time_ms}, nodes={self.nodes})"
+
+
+def level_budget(depth, time_ms=None, nodes=None, search_engine="minimax"):
+    """Budget d'un niveau (profondeur de DIFFICULTIES): LEVEL_NODES[depth] noeuds par
+    coup (MCTS_PLAYOUTS[depth] playouts pr mcts) ou nodes, + time_ms en option
+    (plafond de temps, non reproductible)."""
+    if nodes is None:
+        nodes = (MCTS_PLAYOUTS if search_engine == "mcts" else LEVEL_NODES).get(depth)
+    return SearchBudget(depth, time_ms=time_ms, nodes=nodes)
+
+
+class SearchStats:
+    """Compteurs d'une recherche (TeekoEngine(collect_stats=True), cf. engine.stats).
+
+    Temps en secondes; max_depth = plus grande distance à la racine atteinte,
+    depth = profondeur nominale de la dernière itération terminée."""
+    __slots__ = ("depth", "nodes", "leaves", "cutoffs", "first_cutoffs", "researches",
+                 "max_depth", "time_movegen", "time_eval", "time_win", "elapsed")
+
+    def __init__(self):
+        self.depth = 0
+        self.nodes = 0
+        self.leaves = 0
+        self.cutoffs = 0
+        self.first_cutoffs = 0
+        # PVS: recherches refaites après un échec de la fenêtre nulle / d'aspiration
+        self.researches = 0
+        self.max_depth = 0
+        self.time_movegen = 0.0
+        self.time_eval = 0.0
+        self.time_win = 0.0
+        self.elapsed = 0.0
+
+    def cutoff(self, first_move):
+        # coupure alpha-beta, first_move = par le 1er coup essayé
+        self.cutoffs += 1
+        if first_move:
+            self.first_cutoffs += 1
+
+    def merge(self, other):
+        """Ajoute les compteurs d'une sous-recherche (processus de la recherche parallèle)."""
+        self.leaves += other.leaves
+        self.cutoffs += other.cutoffs
+        self.first_cutoffs += other.first_cutoffs
+        self.researches += other.researches
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.time_movegen += other.time_movegen
+        self.time_eval += other.time_eval
+        self.time_win += other.time_win
+
+    def first_cutoff_rate(self):
+        return self.first_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def branching_factor(self):
+        # facteur de branchement effectif: noeuds ** (1 / profondeur)
+        if self.depth <= 0 or self.nodes <= 1:
+            return 0.0
+        return self.nodes ** (1.0 / self.depth)
+
+    def as_dict(self):
+        d = {name: getattr(self, name) for name in self.__slots__}
+        d["first_cutoff_rate"] = self.first_cutoff_rate()
+        d["branching_factor"] = self.branching_factor()
+        return d
+
+    def summary(self):
+        return (f"{self.nodes} noeuds, prof {self.depth}/{self.max_depth}, "
+                f"ebf {self.branching_factor():.1f}, 1er coup {self.first_cutoff_rate():.0%}, "
+                f"{self.elapsed * 1000:.0f} ms")
+
+    def __repr__(self):
+        return f"SearchStats({self.summary()})"
+
+
+class BitBoard:
+    """Plateau compact pr la recherche: un entier de 25 bits par joueur.
+
+    Mutable: make() joue un coup en place et retourne l'enregistrement
+    d'annulation que unmake() consomme (pas de copie par noeud).
+    key = hash Zobrist de la position, lines/seq/center = occupation des
+    alignements et score d'évaluation (point de vue X), tenus à jour par
+    make/unmake."""
+    __slots__ = ("bits", "key", "lines", "seq", "center")
+
+    def __init__(self, x=0, o=0):
+        self.bits = [x, o]
+        self.key = zobrist_key(x, o)
+        self.lines = [(x & m).bit_count() * 5 + (o & m).bit_count() for m in LINE_MASKS]
+        self.seq = sum(LINE_VALUE[code] for code in self.lines)
+        center = 0
+        for side, b in enumerate(self.bits):
+            for i in iter_bits(b):
+                center += CENTER_SIGNED[side][i]
+        self.center = center
+
+    @property
+    def x(self):
+        return self.bits[0]
+
+    @property
+    def o(self):
+        return self.bits[1]
+
+    @classmethod
+    def from_board(cls, board):
+        x = o = 0
+        for r in range(SIZE):
+            for c in range(SIZE):
+                if board[r][c] == PLAYER1:
+                    x |= 1 << cell_index(r, c)
+                elif board[r][c] == PLAYER2:
+                    o |= 1 << cell_index(r, c)
+        return cls(x, o)
+
+    def to_board(self):
+        board = [[EMPTY for _ in range(SIZE)] for _ in range(SIZE)]
+        for side, player in enumerate(PLAYERS):
+            for i in iter_bits(self.bits[side]):
+                r, c = cell_coords(i)
+                board[r][c] = player
+        return board
+
+    def get(self, player):
+        return self.bits[SIDE[player]]
+
+    def make(self, move, side):
+        """Joue move (indices) pr side (0 = X, 1 = O), retourne l'annulation."""
+        source, dest = move
+        undo = (side, source, dest, self.key, self.seq, self.center)
+        b = self.bits[side]
+        z = ZOBRIST[side]
+        key = self.key ^ z[dest]
+        lines = self.lines
+        step = LINE_STEP[side]
+        gain = LINE_GAIN[side]
+        seq = self.seq
+        center = self.center + CENTER_SIGNED[side][dest]
+        for l in CELL_LINES[dest]:
+            code = lines[l]
+            seq += gain[code]
+            lines[l] = code + step
+        if source is not None:
+            b ^= 1 << source
+            key ^= z[source]
+            center -= CENTER_SIGNED[side][source]
+            for l in CELL_LINES[source]:
+                code = lines[l] - step
+                seq -= gain[code]
+                lines[l] = code
+        self.bits[side] = b | (1 << dest)
+        self.key = key
+        self.seq = seq
+        self.center = center
+        return undo
+
+    def unmake(self, undo):
+        side, source, dest, self.key, self.seq, self.center = undo
+        lines = self.lines
+        step = LINE_STEP[side]
+        b = self.bits[side] ^ (1 << dest)
+        for l in CELL_LINES[dest]:
+            lines[l] -= step
+        if source is not None:
+            b |= 1 << source
+            for l in CELL_LINES[source]:
+                lines[l] += step
+        self.bits[side] = b
+
+    def evaluate(self, side):
+        """evaluate_board_for_player du point de vue de side, sans parcourir le plateau."""
+        me = self.bits[side]
+        opp = self.bits[1 - side]
+        if bits_win(me):
+            return 100000
+        if bits_win(opp):
+            return -100000
+        score = self.seq + self.center
+        return score if side == 0 else -score
+
+    def copy(self):
+        nb = BitBoard.__new__(BitBoard)
+        nb.bits = self.bits[:]
+        nb.key = self.key
+        nb.lines = self.lines[:]
+        nb.seq = self.seq
+        nb.center = self.center
+        return nb
+
+    def __eq__(self, other):
+        return isinstance(other, BitBoard) and self.bits == other.bits
+
+    def __hash__(self):
+        return hash(tuple(self.bits))
+
+    def __repr__(self):
+        return f"BitBoard(x={self.x:#09x}, o={self.o:#09x})"
+
+
+def move_to_coords(move):
+    """(source, dest) en indices -> (source, dest) en (r, c)."""
+    source, dest = move
+    return (None if source is None else cell_coords(source)), cell_coords(dest)
+
+
+def move_to_indices(move):
+    source, dest = move
+    return (None if source is None else cell_index(*source)), cell_index(*dest)
+
+
+def move_text(move):
+    """Notation texte d'un coup en indices: "22" (pose en (2, 2)) ou "33-22"."""
+    source, dest = move_to_coords(move)
+    if source is None:
+        return f"{dest[0]}{dest[1]}"
+    return f"{source[0]}{source[1]}-{dest[0]}{dest[1]}"
+
+
+def parse_move(text):
+    """Inverse de move_text: "33-22" -> (source, dest) en indices; ValueError si invalide."""
+    cells = text.split("-")
+    if len(cells) > 2 or any(len(c) != 2 or not c.isdigit() or max(c) >= str(SIZE) for c in cells):
+        raise ValueError(f"coup invalide: {text!r}")
+    indices = [cell_index(int(c[0]), int(c[1])) for c in cells]
+    return (None, indices[0]) if len(indices) == 1 else (indices[0], indices[1])
+
+
+# ---------------- Symétries du plateau ----------------
+def _sym_cell(g, r, c):
+    # g = 0..3: rotations d'un quart de tour, 4..7: idem puis miroir
+    for _ in range(g % 4):
+        r, c = c, SIZE - 1 - r
+    if g >= 4:
+        c = SIZE - 1 - c
+    return r, c
+
+# SYM_PERMS[g][i] = image de la case i par la symétrie g
+SYM_PERMS = [[cell_index(*_sym_cell(g, *cell_coords(i))) for i in range(NB_CELLS)] for g in range(8)]
+SYM_INVERSE = [[SYM_PERMS[g].index(i) for i in range(NB_CELLS)] for g in range(8)]
+
+# image d'un masque par ligne de 5 bits: 5 lookups par transformation
+_SYM_ROWS = [[[sum(1 << SYM_PERMS[g][r * SIZE + c] for c in range(SIZE) if bits >> c & 1)
+               for bits in range(1 << SIZE)]
+              for r in range(SIZE)]
+             for g in range(8)]
+
+
+def bits_transform(b, g):
+    t0, t1, t2, t3, t4 = _SYM_ROWS[g]
+    return t0[b & 31] | t1[b >> 5 & 31] | t2[b >> 10 & 31] | t3[b >> 15 & 31] | t4[b >> 20]
+
+
+def canonical_pair(a, b):
+    """Forme canonique de (a, b) sous les 8 symétries: a minimal, puis b minimal.
+
+    Retourne (a', b', g) avec a' = bits_transform(a, g), b' = bits_transform(b, g)."""
+    best_a = best_b = None
+    best_g = 0
+    for g in range(8):
+        ta = bits_transform(a, g)
+        if best_a is None or ta < best_a:
+            best_a, best_b, best_g = ta, bits_transform(b, g), g
+        elif ta == best_a:
+            tb = bits_transform(b, g)
+            if tb < best_b:
+                best_b, best_g = tb, g
+    return best_a, best_b, best_g
+
+
+# ---------------- Base de finales (phase mouvement) ----------------
+# Générée hors ligne par teeko_endgame.py (analyse rétrograde), lue par mmap.
+# Position = (pions du joueur qui doit jouer, pions de l'autre): les couleurs
+# sont interchangeables une fois les 8 pions posés.
+# Index = classe canonique des pions du trait * C(21, 4) + rang des pions adverses
+# parmi les 21 cases restantes. Un octet par position:
+#   0 = nulle, 1 + d = gain en d demi-coups, 128 + d = perte en d demi-coups.
+ENDGAME_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "teeko_endgame.bin")
+ENDGAME_MAGIC = b"TEEKOEG1"
+ENDGAME_HEADER = struct.Struct("<8sII")   # magic, nb de classes, distance max
+EG_DRAW = 0
+EG_WIN = 1
+EG_LOSS = 128
+EG_O_CONFIGS = math.comb(NB_CELLS - 4, 4)
+
+# BINOM[n][k] pr le rang combinatoire des sous-ensembles
+BINOM = [[math.comb(n, k) for k in range(5)] for n in range(NB_CELLS + 1)]
+
+_eg_classes = None
+
+
+def endgame_classes():
+    """(liste triée des ensembles de 4 cases canoniques, dict masque -> classe)."""
+    global _eg_classes
+    if _eg_classes is None:
+        masks = set()
+        for cells in itertools.combinations(range(NB_CELLS), 4):
+            m = sum(1 << i for i in cells)
+            masks.add(min(bits_transform(m, g) for g in range(8)))
+        classes = sorted(masks)
+        _eg_classes = (classes, {m: i for i, m in enumerate(classes)})
+    return _eg_classes
+
+
+def subset_rank(b, taken):
+    """Rang combinatoire des bits de b parmi les cases hors de taken."""
+    r = 0
+    k = 1
+    for i in iter_bits(b):
+        r += BINOM[i - (taken & ((1 << i) - 1)).bit_count()][k]
+        k += 1
+    return r
+
+
+def endgame_index(mover, other):
+    a, b, _ = canonical_pair(mover, other)
+    return endgame_classes()[1][a] * EG_O_CONFIGS + subset_rank(b, a)
+
+
+def endgame_decode(v):
+    """Octet de la base -> (résultat pr le trait: 1 gain, -1 perte, 0 nulle, distance)."""
+    if v == EG_DRAW:
+        return 0, 0
+    if v >= EG_LOSS:
+        return -1, v - EG_LOSS
+    return 1, v - EG_WIN
+
+
+class EndgameDB:
+    """Base de finales mappée en mémoire (cf. teeko_endgame.py)."""
+
+    def __init__(self, path=ENDGAME_DB_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, nb_classes, self.max_distance = ENDGAME_HEADER.unpack_from(self.data, 0)
+        classes = endgame_classes()[0]
+        expected = ENDGAME_HEADER.size + len(classes) * EG_O_CONFIGS
+        if magic != ENDGAME_MAGIC or nb_classes != len(classes) or len(self.data) != expected:
+            self.data.close()
+            raise ValueError(f"{path}: base de finales invalide")
+        self.probes = 0
+
+    @classmethod
+    def load(cls, path=ENDGAME_DB_PATH):
+        """Charge la base si le fichier existe, sinon None."""
+        if not os.path.exists(path):
+            return None
+        return cls(path)
+
+    def covers(self, mover, other):
+        # ttes les pièces posées
+        return mover.bit_count() == 4 and other.bit_count() == 4
+
+    def probe(self, mover, other):
+        """(résultat, distance) du point de vue du joueur qui doit jouer."""
+        self.probes += 1
+        return endgame_decode(self.data[ENDGAME_HEADER.size + endgame_index(mover, other)])
+
+    def best_move(self, mover, other):
+        """Meilleur coup (indices) pr le trait et son (résultat, distance).
+
+        Gain le plus court, sinon nulle, sinon perte la plus longue."""
+        best = None
+        best_key = None
+        best_value = (-1, 0)
+        for move in bits_moves(mover, other):
+            after = bits_apply(mover, move)
+            if bits_win(after):
+                return move, (1, 1)
+            # résultat de l'adversaire -> le nôtre, un demi-coup plus loin
+            result, dist = self.probe(other, after)
+            result = -result
+            dist = dist + 1 if result else 0
+            key = (result, -dist if result == 1 else dist)
+            if best_key is None or key > best_key:
+                best, best_key, best_value = move, key, (result, dist)
+        return best, best_value
+
+    def close(self):
+        self.data.close()
+
+
+_default_endgame_db = None
+
+
+def default_endgame_db():
+    """Base de finales partagée (mappée une seule fois par processus), ou None."""
+    global _default_endgame_db
+    if _default_endgame_db is None:
+        _default_endgame_db = EndgameDB.load()
+    return _default_endgame_db
+
+
+# ---------------- Livre d'ouvertures (phase placement) ----------------
+# Construit hors ligne par teeko_book.py. Clé = position canonique sous les
+# 8 symétries (pions X | pions O << 25), coup stocké dans le repère canonique.
+OPENING_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "teeko_book.bin")
+BOOK_MAGIC = b"TEEKOBK1"
+BOOK_HEADER = struct.Struct("<8sI")   # magic, nb d'entrées
+BOOK_ENTRY = struct.Struct("<QBi")    # position canonique, case jouée, score
+
+
+class OpeningBook:
+    """Livre d'ouvertures: position de placement -> (case à jouer, score)."""
+
+    def __init__(self, entries=None):
+        self.entries = {} if entries is None else entries
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def key(x, o):
+        a, b, g = canonical_pair(x, o)
+        return a | b << NB_CELLS, g
+
+    def add(self, x, o, dest, score):
+        key, g = self.key(x, o)
+        self.entries[key] = (SYM_PERMS[g][dest], int(score))
+
+    def lookup(self, x, o):
+        """(case à jouer dans le repère de la partie, score) ou None."""
+        key, g = self.key(x, o)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.hits += 1
+        return SYM_INVERSE[g][entry[0]], entry[1]
+
+    def save(self, path=OPENING_BOOK_PATH):
+        with open(path, "wb") as f:
+            f.write(BOOK_HEADER.pack(BOOK_MAGIC, len(self.entries)))
+            for key in sorted(self.entries):
+                dest, score = self.entries[key]
+                f.write(BOOK_ENTRY.pack(key, dest, score))
+
+    @classmethod
+    def load(cls, path=OPENING_BOOK_PATH):
+        """Charge le livre si le fichier existe, sinon None."""
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, count = BOOK_HEADER.unpack_from(data, 0)
+        if magic != BOOK_MAGIC or len(data) != BOOK_HEADER.size + count * BOOK_ENTRY.size:
+            raise ValueError(f"{path}: livre d'ouvertures invalide")
+        entries = {key: (dest, score)
+                   for key, dest, score in BOOK_ENTRY.iter_unpack(data[BOOK_HEADER.size:])}
+        return cls(entries)
+
+
+_default_opening_book = None
+
+
+def default_opening_book():
+    """Livre d'ouvertures partagé (chargé une seule fois par processus), ou None."""
+    global _default_opening_book
+    if _default_opening_book is None:
+        _default_opening_book = OpeningBook.load()
+    return _default_opening_book
+
+
+# ---------------- Enregistrement des parties ----------------
+# Fichier de flux: magic puis les parties bout à bout, chacune = en-tête
+# (niveaux X et O, 0 = humain; moteurs X et O; résultat; nb de coups; long. de
+# la graine), graine (utf-8) et 1 octet par coup: case posée (0-24) ou
+# 25 + case source * 8 + n° du voisin de destination (cf. NEIGHBORS).
+# Niveau, moteur et graine de chaque camp suffisent à rejouer une partie d'IA.
+GAME_RECORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "teeko_games.bin")
+RECORD_MAGIC = b"TEEKOGR2"
+# niveau X, niveau O, moteur X, moteur O, résultat, nb de coups, long. graine
+RECORD_HEADER = struct.Struct("<BBBBBHB")
+# code de résultat -> gagnant (None = nulle)
+RECORD_RESULTS = (None, PLAYER1, PLAYER2)
+# code de moteur -> moteur (None = humain), cf. SEARCH_ENGINES; codes fixes, ajouter à la fin
+RECORD_ENGINES = (None, "minimax", "mcts")
+
+# (source, dest) en indices <-> octet
+MOVE_CODES = {(None, d): d for d in range(NB_CELLS)}
+MOVE_CODES.update({(s, d): NB_CELLS + s * 8 + k
+                   for s in range(NB_CELLS) for k, d in enumerate(NEIGHBORS[s])})
+CODE_MOVES = {code: move for move, code in MOVE_CODES.items()}
+
+
+def encode_moves(moves):
+    """Coups (source, dest) en indices -> bytes, 1 octet par coup."""
+    return bytes(MOVE_CODES[m] for m in moves)
+
+
+def decode_moves(data):
+    """Inverse de encode_moves."""
+    return [CODE_MOVES[b] for b in data]
+
+
+class GameRecordWriter:
+    """Ajoute des parties à un fichier de flux (créé avec son magic si besoin).
+
+    Chaque partie est écrite d'un bloc puis vidée sur disque: un fichier
+    interrompu perd au plus la partie en cours d'écriture."""
+
+    def __init__(self, path=GAME_RECORDS_PATH):
+        self.path = path
+        self.file = open(path, "ab+")
+        if self.file.tell() == 0:
+            self.file.write(RECORD_MAGIC)
+        else:
+            # pas d'ajout à un fichier d'un autre format (ancien magic compris)
+            self.file.seek(0)
+            magic = self.file.read(len(RECORD_MAGIC))
+            if magic != RECORD_MAGIC:
+                self.file.close()
+                raise ValueError(f"{path}: fichier de parties invalide ou d'un autre format")
+        self.written = 0
+
+    def write(self, moves, winner, level_x=0, level_o=0, engine_x=None, engine_o=None, seed=""):
+        """moves: coups (source, dest) en indices; winner: PLAYER1, PLAYER2 ou None (nulle);
+        engine_x / engine_o: SEARCH_ENGINES de chaque camp, None = humain."""
+        seed = str(seed).encode("utf-8")
+        if len(seed) > 255:
+            raise ValueError("graine trop longue (255 octets max)")
+        header = RECORD_HEADER.pack(level_x, level_o, RECORD_ENGINES.index(engine_x),
+                                    RECORD_ENGINES.index(engine_o), RECORD_RESULTS.index(winner),
+                                    len(moves), len(seed))
+        self.file.write(header + seed + encode_moves(moves))
+        self.file.flush()
+        self.written += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GameRecordReader:
+    """Lecture d'un fichier de parties mappé en mémoire, partie par partie.
+
+    Itérer donne des tuples (niveau X, niveau O, moteur X, moteur O, graine,
+    gagnant, coups), moteur None = humain, coups = bytes encodés (cf.
+    decode_moves). Une partie tronquée en fin de fichier est ignorée."""
+
+    def __init__(self, path=GAME_RECORDS_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if self.data[:len(RECORD_MAGIC)] != RECORD_MAGIC:
+            self.close()
+            raise ValueError(f"{path}: fichier de parties invalide")
+
+    def __iter__(self):
+        data = self.data
+        end = len(data)
+        offset = len(RECORD_MAGIC)
+        while offset + RECORD_HEADER.size <= end:
+            level_x, level_o, engine_x, engine_o, result, nb_moves, seed_len = \
+                RECORD_HEADER.unpack_from(data, offset)
+            start = offset + RECORD_HEADER.size
+            offset = start + seed_len + nb_moves
+            if offset > end:
+                return
+            seed = data[start:start + seed_len].decode("utf-8")
+            yield (level_x, level_o, RECORD_ENGINES[engine_x], RECORD_ENGINES[engine_o], seed,
+                   RECORD_RESULTS[result], data[start + seed_len:offset])
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------- MCTS (UCT) ----------------
+# Alternative à minimax (cf. TeekoEngine(search_engine="mcts")): arbre UCT,
+# playouts aléatoires sur bitboards (gain immédiat joué s'il existe), gain = 1,
+# nulle (MOVE_LIMIT atteint) = 0.5. Les répétitions ne sont pas suivies.
+SEARCH_ENGINES = ("minimax", "mcts")
+# constante d'exploration de UCT
+MCTS_EXPLORATION = 1.4
+# playouts par coup selon le niveau (SearchBudget.max_depth), sauf budget.nodes
+MCTS_PLAYOUTS = {1: 300, 3: 3000, 5: 15000}
+
+
+class MCTSNode:
+    """Position de l'arbre MCTS: side au trait après count coups de partie.
+
+    wins = points marqués par le camp qui a joué move (celui qui a mené ici)."""
+    __slots__ = ("x", "o", "side", "count", "move", "parent", "children", "untried",
+                 "visits", "wins", "winner")
+
+    def __init__(self, x, o, side, count, move=None, parent=None):
+        self.x = x
+        self.o = o
+        self.side = side
+        self.count = count
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.visits = 0
+        self.wins = 0.0
+        # partie finie: camp gagnant, -1 si nulle; sinon None
+        own, opp = (x, o) if side == 0 else (o, x)
+        if bits_win(opp):
+            self.winner = 1 - side
+        elif count >= MOVE_LIMIT:
+            self.winner = -1
+        else:
+            self.winner = None
+        self.untried = []
+        if self.winner is None:
+            # coups à développer, le meilleur (heuristique) en dernier: développé en 1er
+            self.untried = bits_moves(own, opp)
+            self.untried.sort(key=lambda m: -bits_order_key(own, m))
+            if not self.untried:
+                # bloqué: perdu, comme dans la recherche
+                self.winner = 1 - side
+
+
+class MCTS:
+    """Recherche UCT réutilisant le sous-arbre de la position jouée d'un coup à l'autre."""
+
+    def __init__(self, exploration=MCTS_EXPLORATION, rng=None):
+        self.exploration = exploration
+        self.rng = random.Random() if rng is None else rng
+        self.root = None
+        self.playouts = 0
+        self.max_depth = 0
+
+    def _find_root(self, x, o, side, count):
+        # position cherchée parmi la racine précédente et ses 2 premiers niveaux
+        # (coup joué puis réponse adverse); sinon nouvel arbre
+        key = (x, o, side, count)
+        old = self.root
+        if old is not None:
+            for node in [old] + old.children + [g for c in old.children for g in c.children]:
+                if (node.x, node.o, node.side, node.count) == key:
+                    node.parent = None
+                    return node
+        return MCTSNode(x, o, side, count)
+
+    def search(self, x, o, side, count, playouts, deadline=None, cancel=None):
+        """playouts depuis (x, o), side au trait après count coups (s'arrête aussi à
+        deadline, perf_counter). Lève SearchTimeout si cancel est levé.
+
+        Retourne la racine; ses enfants portent visites et points par coup."""
+        root = self.root = self._find_root(x, o, side, count)
+        self.playouts = 0
+        self.max_depth = 0
+        if root.winner is not None:
+            return root
+        c = self.exploration
+        rng = self.rng
+        log = math.log
+        sqrt = math.sqrt
+        while self.playouts < playouts:
+            if self.playouts & 63 == 0:
+                if cancel is not None and cancel.is_set():
+                    raise SearchTimeout()
+                if deadline is not None and self.playouts and time.perf_counter() >= deadline:
+                    break
+            # sélection (UCT) jusqu'à un noeud à développer ou terminal
+            node = root
+            depth = 0
+            while not node.untried and node.winner is None:
+                log_n = log(node.visits)
+                best, best_value = None, -1.0
+                for child in node.children:
+                    value = child.wins / child.visits + c * sqrt(log_n / child.visits)
+                    if value > best_value:
+                        best, best_value = child, value
+                node = best
+                depth += 1
+            # expansion
+            if node.winner is None:
+                move = node.untried.pop()
+                bits = [node.x, node.o]
+                bits[node.side] = bits_apply(bits[node.side], move)
+                child = MCTSNode(bits[0], bits[1], 1 - node.side, node.count + 1, move, node)
+                node.children.append(child)
+                node = child
+                depth += 1
+            if depth > self.max_depth:
+                self.max_depth = depth
+            # simulation
+            winner = node.winner
+            if winner is None:
+                winner = self._playout(node.x, node.o, node.side, node.count, rng)
+            # rétropropagation: points du camp qui a joué le coup menant à chaque noeud
+            while node is not None:
+                node.visits += 1
+                if winner == 1 - node.side:
+                    node.wins += 1.0
+                elif winner == -1:
+                    node.wins += 0.5
+                node = node.parent
+            self.playouts += 1
+        return root
+
+    @staticmethod
+    def _playout(x, o, side, count, rng):
+        # partie aléatoire jusqu'au gain, au blocage ou à MOVE_LIMIT; camp gagnant ou -1
+        bits = [x, o]
+        while count < MOVE_LIMIT:
+            own = bits[side]
+            moves = bits_moves(own, bits[1 - side])
+            if not moves:
+                return 1 - side
+            # guidage léger: gain immédiat joué s'il existe
+            if bits_threats(own, bits[1 - side]):
+                return side
+            move = rng.choice(moves)
+            bits[side] = bits_apply(own, move)
+            count += 1
+            side = 1 - side
+        return -1
+
+    @staticmethod
+    def root_stats(root):
+        """[(coup, visites, points)] des enfants de la racine."""
+        return [(child.move, child.visits, child.wins) for child in root.children]
+
+
+def mcts_best(stats):
+    """(coup le plus visité, taux de points) depuis des [(coup, visites, points)]
+    (sommés par coup s'ils viennent de plusieurs processus)."""
+    totals = {}
+    for move, visits, wins in stats:
+        v, w = totals.get(move, (0, 0.0))
+        totals[move] = (v + visits, w + wins)
+    if not totals:
+        return None, 0.0
+    move, (visits, wins) = max(totals.items(), key=lambda item: item[1][0])
+    return move, wins / visits if visits else 0.0
+
+
+# tris des coups de _minimax_bits (cf. TeekoEngine(move_ordering=...))
+MOVE_ORDERINGS = ("static", "history")
+# algorithmes de _minimax_bits (cf. TeekoEngine(search_algorithm=...)):
+# alpha-beta classique ou PVS (fenêtre nulle hors 1er coup + aspiration)
+SEARCH_ALGORITHMS = ("alphabeta", "pvs")
+# demi-largeur de la fenêtre d'aspiration autour du score de l'itération précédente
+ASPIRATION_WINDOW = 50
+
+# ---------------- Recherche parallèle à la racine ----------------
+# Les coups racine sont répartis sur un ProcessPoolExecutor. Chaque processus
+# garde son moteur (TT chaude d'un coup à l'autre); alpha est partagé: un coup
+# commencé après la fin d'un autre part de sa borne.
+# en dessous, le coût des échanges entre processus dépasse le gain
+PARALLEL_MIN_DEPTH = 3
+
+_worker_engine = None
+_worker_alpha = None
+
+
+def _search_worker_init(shared_alpha, stop, endgame_path, engine_options):
+    global _worker_engine, _worker_alpha
+    _worker_alpha = shared_alpha
+    db = EndgameDB.load(endgame_path) if endgame_path else None
+    # engine_options: réglages de recherche du moteur principal (TT, tri des coups, stats)
+    _worker_engine = TeekoEngine(endgame_db=db, **engine_options)
+    # stop = annulation de la recherche par le processus principal
+    _worker_engine._cancel = stop
+
+
+def _search_root_move(x, o, side, move, depth, deadline, nodes, history_keys=None, draw_base=0):
+    """Score (point de vue side) du coup racine move, cherché dans un processus.
+
+    deadline: fin absolue de la recherche (time.monotonic, commune à tous les coups
+    racine, qu'ils partent tout de suite ou après attente) ou None.
+    history_keys/draw_base: positions de la partie et nb de coups joués (cf. search_move).
+    Retourne (move, score ou None si budget épuisé, nb de noeuds, SearchStats ou None)."""
+    engine = _worker_engine
+    bb = BitBoard(x, o)
+    bb.make(move, side)
+    if history_keys is not None:
+        engine._history = PositionHistory(history_keys)
+        engine._history.push(bb.key)
+    engine._draw_base = draw_base
+    with _worker_alpha.get_lock():
+        alpha = _worker_alpha.value
+    engine.search_nodes = 0
+    engine._root_depth = depth
+    engine._new_ordering(depth)
+    if engine.collect_stats:
+        engine.stats = SearchStats()
+    if engine.tt is not None:
+        engine.tt.new_search()
+    # ramenée à l'horloge perf_counter de _minimax_bits
+    engine._deadline = None if deadline is None else time.perf_counter() + (deadline - time.monotonic())
+    engine._node_limit = nodes
+    engine._next_check = 0
+    try:
+        _, score = engine._minimax_bits(bb, side, depth - 1, alpha, math.inf, False)
+    except SearchTimeout:
+        return move, None, engine.search_nodes, engine.stats
+    finally:
+        engine._deadline = None
+        engine._node_limit = None
+        engine._next_check = math.inf
+        engine._history = None
+        engine._draw_base = 0
+    with _worker_alpha.get_lock():
+        if score > _worker_alpha.value:
+            _worker_alpha.value = score
+    return move, score, engine.search_nodes, engine.stats
+
+
+def _mcts_root_worker(x, o, side, count, playouts, time_ms, seed):
+    """Playouts MCTS dans un processus (parallélisation à la racine): arbre propre
+    au processus et au camp side, réutilisé d'un coup à l'autre.
+
+    Retourne ([(coup, visites, points)] de la racine, nb de playouts, prof max) ou None si annulé."""
+    engine = _worker_engine
+    mcts = engine._mcts[side]
+    mcts.rng.seed(seed)
+    deadline = None if time_ms is None else time.perf_counter() + time_ms / 1000.0
+    try:
+        root = mcts.search(x, o, side, count, playouts, deadline, engine._cancel)
+    except SearchTimeout:
+        return None
+    return MCTS.root_stats(root), mcts.playouts, mcts.max_depth
+
+
+# ------------------ Moteur: règles + IA, sans interface ------------------
+class TeekoEngine:
+    """État de la partie, règles et recherche IA, sans tkinter.
+
+    TeekoGame y ajoute l'interface; les outils hors ligne (livre
+    d'ouvertures, ...) l'utilisent directement."""
+
+    def __init__(self, *,
+                 ai_side=PLAYER2,
+                 minimax_depth=3,
+                 pos_nb=0,
+                 pos=None,
+                 use_tt=False,
+                 tt_size=1 << 18,
+                 move_budget=None,
+                 endgame_db=None,
+                 opening_book=None,
+                 search_workers=1,
+                 collect_stats=False,
+                 stats_log=None,
+                 move_ordering="history",
+                 search_algorithm="alphabeta",
+                 record_path=None,
+                 search_engine="minimax",
+                 mcts_seed=None,
+                 batch_leaves=False,
+                 threat_extension=False,
+                 seed=None,
+                 deterministic=False,
+                 collect_pv=False):
+        self.ai_side = ai_side
+        self.human_side = PLAYER2 if ai_side == PLAYER1 else PLAYER1
+        self.minimax_depth = minimax_depth
+        # budget par coup (SearchBudget), sinon profondeur fixe minimax_depth
+        self.move_budget = move_budget
+        self.pos_nb = pos_nb
+        # positions récentes de la partie (PositionHistory), cf. check_draw
+        self.pos = PositionHistory() if pos is None else pos
+        # coups joués (indices), ajoutés à record_path en fin de partie (cf. record_game)
+        self.moves = []
+        self.record_path = record_path
+        self._recorder = None
+
+        # table de transposition (optionnelle) + compteur de noeuds de la dernière recherche
+        self.tt = TranspositionTable(tt_size) if use_tt else None
+        self.tt_size = tt_size
+        self.search_nodes = 0
+        # compteurs détaillés de la dernière recherche (SearchStats) si collect_stats,
+        # ajoutés en JSON (une ligne par coup cherché) à stats_log s'il est donné
+        self.collect_stats = collect_stats or stats_log is not None
+        self.stats_log = stats_log
+        self.stats = None
+        # tri des coups: "static" (centre + alliés) ou "history" (+ coups killer par
+        # ply et table d'historique des coupures, cf. _minimax_bits)
+        if move_ordering not in MOVE_ORDERINGS:
+            raise ValueError(f"move_ordering inconnu: {move_ordering!r}")
+        self.move_ordering = move_ordering
+        if search_algorithm not in SEARCH_ALGORITHMS:
+            raise ValueError(f"search_algorithm inconnu: {search_algorithm!r}")
+        self.search_algorithm = search_algorithm
+        self.pvs = search_algorithm == "pvs"
+        # moteur de search_move: "minimax" ou "mcts" (arbre UCT gardé d'un coup à l'autre)
+        if search_engine not in SEARCH_ENGINES:
+            raise ValueError(f"search_engine inconnu: {search_engine!r}")
+        self.search_engine = search_engine
+        # graine de la partie (texte ou entier), None = hasard du module random: erreurs
+        # volontaires et playouts MCTS de chaque décision tirés de la graine et de la
+        # position (cf. decision_rng). Une partie rejouée depuis le début avec le
+        # même moteur neuf refait alors les mêmes coups (sans limite de temps, ponder
+        # ni recherche parallèle)
+        self.seed = seed
+        # en plus, chaque décision indépendante des recherches précédentes (même
+        # position, même coup): TT vidée et arbre MCTS neuf à chaque recherche,
+        # pas de réponses préparées (ponder). Graine 0 si seed est None
+        self.deterministic = deterministic
+        # un arbre UCT par camp: chaque IA ne réutilise que ses propres recherches
+        if mcts_seed is None:
+            mcts_seed = seed
+        self._mcts = [MCTS(rng=random.Random(None if mcts_seed is None else f"{mcts_seed}:{s}"))
+                      for s in (0, 1)]
+        # feuilles du dernier ply évaluées d'un bloc (evaluate_batch, NumPy requis)
+        if batch_leaves and np is None:
+            raise ValueError("batch_leaves: NumPy n'est pas installé")
+        self.batch_leaves = batch_leaves
+        # feuilles: gain en un coup du camp au trait et double menace adverse
+        # scorés comme tels (cf. _threat_score) plutôt qu'évalués
+        self.threat_extension = threat_extension
+        # variante principale relevée pendant la recherche (table triangulaire _pv, une
+        # ligne par ply): self.pv = coups (r, c) de la dernière recherche terminée
+        self.collect_pv = collect_pv
+        self._pv = None
+        self.pv = []
+        self.killers = None
+        self.history = None
+        # profondeur nominale de la racine de la recherche en cours (ply = _root_depth - depth)
+        self._root_depth = 0
+        # nb de processus pr la recherche à la racine (1 = série), pool créé au 1er besoin
+        self.search_workers = search_workers
+        self._pool = None
+        self._shared_alpha = None
+        self._pool_stop = None
+        # annulation de la recherche en arrière-plan (cf. start_search)
+        self._cancel = None
+        self._search_handle = None
+        # réponses préparées pendant le tour adverse: (x, o, camp, n° du coup, historique)
+        # -> (budget.key(), coup, score), cf. _ponder_key
+        self.ponder_results = {}
+        self.ponder_hits = 0
+        # base de finales (EndgameDB) pr la phase mouvement, optionnelle
+        self.endgame_db = endgame_db
+        # livre d'ouvertures (OpeningBook) pr la phase placement, optionnel
+        self.opening_book = opening_book
+        # limites de la recherche en cours (cf. iterative_deepening)
+        self._deadline = None
+        self._node_limit = None
+        self._next_check = math.inf
+        # nulles vues par la recherche en cours (cf. search_move): positions de la
+        # partie (PositionHistory, None = ignorées) et nb de coups joués à la racine
+        self._history = None
+        self._draw_base = 0
+
+        self.board = [[EMPTY for _ in range(SIZE)] for _ in range(SIZE)]
+        self.turn = PLAYER1  # X commence tjrs
+        self.total_pieces = 0
+
+    # ---------------- Utilitaires ----------------
+    def adjacent(self, r1, c1, r2, c2):
+        return bool(NEIGHBOR_MASKS[r1 * SIZE + c1] >> (r2 * SIZE + c2) & 1)
+
+    def count_pieces_board(self, board, player):
+        if isinstance(board, BitBoard):
+            return board.get(player).bit_count()
+        return sum(row.count(player) for row in board)
+
+    # ---------------- Vérif victoire ----------------
+    def check_win_board(self, board, player):
+        if isinstance(board, BitBoard):
+            return bits_win(board.get(player))
+        # lignes et colonnes
+        for r in range(SIZE):
+            for c in range(SIZE - 3):
+                if all(board[r][c + i] == player for i in range(4)):
+                    return True
+        for r in range(SIZE - 3):
+            for c in range(SIZE):
+                if all(board[r + i][c] == player for i in range(4)):
+                    return True
+        # diagonales
+        for r in range(SIZE - 3):
+            for c in range(SIZE - 3):
+                if all(board[r + i][c + i] == player for i in range(4)):
+                    return True
+                if all(board[r + 3 - i][c + i] == player for i in range(4)):
+                    return True
+        # carré 2x2
+        for r in range(SIZE - 1):
+            for c in range(SIZE - 1):
+                if all(board[r + i][c + j] == player for i in range(2) for j in range(2)):
+                    return True
+        return False
+
+    def check_win(self, player):
+        return self.check_win_board(self.board, player)
+    
+    def check_draw(self, player):
+        # Nulle après 15 coups
+        if self.pos_nb == MOVE_LIMIT:
+            return True
+        # 3e occurrence de la position (hash Zobrist) dans l'historique récent
+        return self.pos.push(BitBoard.from_board(self.board).key) >= 3
+
+    # ---------------- Choix du coup ----------------
+    def choose_move(self, player, budget, rng=None):
+        """Décision d'une IA pr player: victoire/blocage imm, erreur volontaire
+        (MISTAKE_PROBS) ou recherche. rng = générateur des erreurs volontaires,
+        par défaut decision_rng.
+
+        Retourne (coup ou None, nature, score), nature = "immediate", "mistake",
+        "ponder" ou "search". Après une recherche, self.stats décrit celle-ci."""
+        self.stats = None
+        immediate = self.find_immediate_win_or_block_aivsai(player)
+        if immediate is not None:
+            return immediate, "immediate", None
+        if rng is None:
+            rng = self.decision_rng(self.board, player)
+
+        # joue parfois au hasard en fonction de la difficulté
+        chance_erreur = MISTAKE_PROBS.get(budget.max_depth, 0.0)
+        if rng.random() < chance_erreur:
+            targets = self.get_all_targets(self.board, player)
+            if targets:
+                return rng.choice(targets), "mistake", None
+
+        # réponse déjà cherchée pendant le tour adverse (cf. start_ponder)
+        found = self._ponder_lookup(player, budget)
+        if found is not None:
+            return found[0], "ponder", found[1]
+
+        # sinon minimax
+        move, score = self.search_move(self.board, player, budget, self.pos, self.pos_nb)
+        if self.stats_log is not None and self.stats is not None:
+            self._log_stats(player, move, score)
+        return move, "search", score
+
+    def decision_rng(self, board, player):
+        """Générateur d'une décision de player: tiré de la graine (cf. self.seed,
+        self.deterministic) et de la position, sinon le module random."""
+        seed = self.seed
+        if seed is None:
+            if not self.deterministic:
+                return random
+            seed = 0
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        x, o = board.bits
+        return random.Random(f"{seed}:{player}:{x}:{o}")
+
+    def _log_stats(self, player, move, score):
+        record = {"player": player, "move": move, "score": score, "pos_nb": self.pos_nb}
+        record.update(self.stats.as_dict())
+        with open(self.stats_log, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def get_minimax_depth(self):
+        return self.minimax_depth
+
+    def get_move_budget(self):
+        if self.move_budget is not None:
+            return self.move_budget
+        return SearchBudget(self.get_minimax_depth())
+
+    def search_move(self, board, player, budget, history=None, move_count=0, iterative=False):
+        """Meilleur coup (move, score) pr player dans la limite de budget.
+
+        history (PositionHistory de la partie, position de board comprise) et
+        move_count (coups déjà joués): la recherche score alors 0 les nulles
+        par répétition ou par la règle des 30 coups et n'y cherche pas plus loin.
+        iterative: approfondissement itératif même sans limite de temps ni de
+        noeuds (une recherche annulée garde sa dernière itération terminée).
+        Avec search_engine="mcts", cf. _mcts_move (ni livre, ni répétitions)."""
+        if self.search_engine == "mcts":
+            return self._mcts_move(board, player, budget, move_count)
+        found = self._book_move(board, player)
+        if found is not None:
+            return found
+        if self.deterministic and self.tt is not None:
+            # le résultat ne dépend pas des recherches précédentes
+            self.tt.clear()
+        self._history = None if history is None else history.copy()
+        self._draw_base = move_count
+        try:
+            if budget.is_limited() or iterative:
+                move, score, _ = self.iterative_deepening(board, player, budget)
+                return move, score
+            return self.minimax(board, budget.max_depth, -math.inf, math.inf, True, player)
+        finally:
+            self._history = None
+            self._draw_base = 0
+
+    def _mcts_move(self, board, player, budget, move_count):
+        """search_move par MCTS: (coup le plus visité, taux de points estimé de 0 à 1).
+
+        Budget: budget.nodes playouts (sinon MCTS_PLAYOUTS du niveau), dans la limite
+        de budget.time_ms."""
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        x, o = board.bits
+        side = SIDE[player]
+        tree = self._mcts[side]
+        if self.deterministic:
+            # arbre neuf: coup indépendant des recherches précédentes
+            tree = self._mcts[side] = MCTS(tree.exploration)
+        if self.seed is not None or self.deterministic:
+            # playouts tirés de la graine de la décision (sous-arbre réutilisé sinon)
+            tree.rng = self.decision_rng(board, player)
+        playouts = budget.nodes
+        if playouts is None:
+            playouts = MCTS_PLAYOUTS.get(budget.max_depth, max(MCTS_PLAYOUTS.values()))
+        self._start_stats()
+        if self.search_workers > 1:
+            stats, done, depth = self._parallel_mcts(x, o, side, move_count, playouts, budget.time_ms)
+        else:
+            deadline = None if budget.time_ms is None else time.perf_counter() + budget.time_ms / 1000.0
+            root = tree.search(x, o, side, move_count, playouts, deadline, self._cancel)
+            stats, done, depth = MCTS.root_stats(root), tree.playouts, tree.max_depth
+        self.search_nodes = done
+        if self.stats is not None:
+            self.stats.max_depth = depth
+        self._finish_stats(depth)
+        move, value = mcts_best(stats)
+        return (None if move is None else move_to_coords(move)), value
+
+    def _parallel_mcts(self, x, o, side, count, playouts, time_ms):
+        # un arbre par processus, playouts répartis, visites sommées par coup racine
+        pool = self._search_pool()
+        self._pool_stop.clear()
+        if self._cancel is not None and self._cancel.is_set():
+            raise SearchTimeout()
+        share = -(-playouts // self.search_workers)
+        futures = [pool.submit(_mcts_root_worker, x, o, side, count, share, time_ms,
+                               self._mcts[side].rng.getrandbits(64))
+                   for _ in range(self.search_workers)]
+        stats, done, depth = [], 0, 0
+        for future in futures:
+            result = future.result()
+            if result is None:
+                raise SearchTimeout()
+            stats += result[0]
+            done += result[1]
+            depth = max(depth, result[2])
+        return stats, done, depth
+
+    # ---------------- Victoire/blocage imm ----------------
+    def find_immediate_win_or_block(self):
+        return self.find_immediate_win_or_block_aivsai(self.ai_side)
+
+    def find_immediate_win_or_block_aivsai(self, current_ai):
+        """Trouver victoire ou blocage imm (cf. bits_threat_move) pr current_ai."""
+        bb = BitBoard.from_board(self.board)
+        # phase mouvement couverte par la base de finales: coup parfait direct
+        db_move = self._endgame_move(bb, current_ai)
+        if db_move is not None:
+            return db_move
+        side = SIDE[current_ai]
+        move = bits_threat_move(bb.bits[side], bb.bits[1 - side])
+        return None if move is None else move_to_coords(move)
+
+    # ---------------- Générer cibles ----------------
+    def get_all_targets(self, board, player):
+        """Retourne (source, destination) pour tous les coups.
+        En phase placement: source = None"""
+        if isinstance(board, BitBoard):
+            opponent = PLAYER2 if player == PLAYER1 else PLAYER1
+            return [move_to_coords(m) for m in bits_moves(board.get(player), board.get(opponent))]
+        targets = []
+        player_piece_count = self.count_pieces_board(board, player)
+        
+        if player_piece_count < 4:
+            # Phase placement
+            for r in range(SIZE):
+                for c in range(SIZE):
+                    if board[r][c] == EMPTY:
+                        targets.append((None, (r, c)))
+        else:
+            # Phase mouvement: voisins précalculés (NEIGHBOR_COORDS)
+            for sr in range(SIZE):
+                for sc in range(SIZE):
+                    if board[sr][sc] != player:
+                        continue
+                    for tr, tc in NEIGHBOR_COORDS[sr][sc]:
+                        if board[tr][tc] == EMPTY:
+                            targets.append(((sr, sc), (tr, tc)))
+        return targets
+
+    def simulate_move(self, board, move, player):
+        """move = (source, dest) où source peut être None"""
+        if isinstance(board, BitBoard):
+            nb = board.copy()
+            nb.make(move_to_indices(move), SIDE[player])
+            return nb
+        nb = copy.deepcopy(board)
+        source, dest = move
+        
+        if source is None:
+            # Phase placement
+            r, c = dest
+            nb[r][c] = player
+        else:
+            # Phase mouvement
+            sr, sc = source
+            dr, dc = dest
+            nb[sr][sc] = EMPTY
+            nb[dr][dc] = player
+        
+        return nb
+
+    def play_move(self, move, player):
+        """Joue move pr player sur la partie en cours.
+
+        Retourne "win" si player gagne, "draw" si nulle (30 coups, répétition), sinon None."""
+        source, dest = move
+        r, c = dest
+        self.board[r][c] = player
+        self.moves.append(move_to_indices(move))
+        if source is None:
+            # Phase placement
+            self.total_pieces += 1
+        else:
+            # Phase mouvement
+            sr, sc = source
+            self.board[sr][sc] = EMPTY
+        self.pos_nb += 1
+        if self.check_win_board(self.board, player):
+            return "win"
+        if self.check_draw(player):
+            return "draw"
+        return None
+
+    def make_move(self, board, move, player):
+        """Joue move en place sur board (liste ou BitBoard), retourne l'annulation."""
+        if isinstance(board, BitBoard):
+            return board.make(move_to_indices(move), SIDE[player])
+        source, dest = move
+        r, c = dest
+        board[r][c] = player
+        if source is not None:
+            sr, sc = source
+            board[sr][sc] = EMPTY
+        return (player, source, dest)
+
+    def unmake_move(self, board, undo):
+        """Annule un coup joué par make_move."""
+        if isinstance(board, BitBoard):
+            board.unmake(undo)
+            return
+        player, source, dest = undo
+        r, c = dest
+        board[r][c] = EMPTY
+        if source is not None:
+            sr, sc = source
+            board[sr][sc] = player
+
+    # ---------------- Minimax (alpha-beta) ----------------
+# Remplacer uniquement la fonction minimax dans la classe TeekoGame
+
+    def minimax(self, board, depth, alpha, beta, maximizing, perspective_player=None):
+        
+        # Si perspective_player pas fourni, utiliser ai_side
+        if perspective_player is None:
+            perspective_player = self.ai_side
+
+        # recherche sur bitboards (make/unmake en place), coups reconvertis en (r, c) à la racine
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        self.search_nodes = 0
+        if self.tt is not None:
+            self.tt.new_search()
+        # recherche annulable: vérif dès le 1er noeud
+        self._next_check = math.inf if self._cancel is None else 0
+        self._root_depth = depth
+        self._new_ordering(depth)
+        self._new_pv(depth)
+        self._start_stats()
+        side = SIDE[perspective_player]
+        found = self._endgame_root(board, side, depth, maximizing)
+        if found is None and maximizing and alpha == -math.inf and beta == math.inf:
+            found = self._root_search(board, side, depth)
+        elif found is None:
+            found = self._minimax_bits(board, side, depth, alpha, beta, maximizing)
+        self._finish_stats(depth)
+        move, score = found
+        if self._pv is not None:
+            self.pv = self._root_pv(move)
+        if move is not None:
+            move = move_to_coords(move)
+        return move, score
+
+    def iterative_deepening(self, board, perspective_player, budget):
+        """Approfondissement itératif de 1 à budget.max_depth tant que le budget le permet.
+
+        Retourne (coup, score, profondeur) de la dernière itération terminée.
+        La profondeur 1 est tjrs terminée pr avoir un coup à jouer."""
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        side = SIDE[perspective_player]
+        self.search_nodes = 0
+        if self.tt is not None:
+            self.tt.new_search()
+        self._deadline = None
+        if budget.time_ms is not None:
+            self._deadline = time.perf_counter() + budget.time_ms / 1000.0
+        self._node_limit = budget.nodes
+        self._new_ordering(budget.max_depth)
+        self._new_pv(budget.max_depth)
+        self._start_stats()
+
+        found = self._endgame_root(board, side, budget.max_depth, True)
+        if found is not None:
+            move, score = found
+            self._finish_stats(budget.max_depth)
+            if self._pv is not None:
+                self.pv = self._root_pv(move)
+            return (None if move is None else move_to_coords(move)), score, budget.max_depth
+
+        move, score, reached = None, 0, 0
+        try:
+            for depth in range(1, budget.max_depth + 1):
+                self._root_depth = depth
+                self._next_check = math.inf if depth == 1 else self.search_nodes
+                # copie: une recherche interrompue laisse son plateau modifié
+                try:
+                    m, sc = self._aspiration_search(board, side, depth, move, score)
+                except SearchTimeout:
+                    break
+                move, score, reached = m, sc, depth
+                if self._pv is not None:
+                    # une itération interrompue écrase la table: copie de la dernière terminée
+                    self.pv = self._root_pv(move)
+                # victoire/défaite forcée trouvée: inutile d'aller plus loin
+                if abs(score) >= 100000:
+                    break
+        finally:
+            self._deadline = None
+            self._node_limit = None
+            self._next_check = math.inf
+        self._finish_stats(reached)
+        if move is not None:
+            move = move_to_coords(move)
+        return move, score, reached
+
+    def _start_stats(self):
+        if not self.collect_stats:
+            self.stats = None
+            return
+        self.stats = SearchStats()
+        self.stats.elapsed = time.perf_counter()
+
+    def _new_ordering(self, max_depth):
+        # killers (2 par ply) et historique (par camp, clé = coup) remis à zéro à chaque recherche
+        if self.move_ordering == "static":
+            self.killers = None
+            return
+        self.killers = [[None, None] for _ in range(max_depth + 1)]
+        self.history = ({}, {})
+
+    def _new_pv(self, max_depth):
+        # table de la variante principale remise à zéro à chaque recherche (si collect_pv)
+        self.pv = []
+        self._pv = [[] for _ in range(max_depth + 1)] if self.collect_pv else None
+
+    def _root_pv(self, move):
+        # variante principale (r, c) de la recherche terminée dont move (indices) est le
+        # meilleur coup; réduite à move si la table ne commence pas par lui (recherche
+        # parallèle, base de finales)
+        pv = self._pv[0]
+        if not pv or pv[0] != move:
+            pv = [] if move is None else [move]
+        return [move_to_coords(m) for m in pv]
+
+    def _record_cutoff(self, move, mover, depth):
+        # coup ayant provoqué une coupure: killer de ce ply + bonus d'historique
+        killers = self.killers[self._root_depth - depth]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        history = self.history[mover]
+        history[move] = history.get(move, 0) + depth * depth
+
+    def _finish_stats(self, depth):
+        st = self.stats
+        if st is not None:
+            st.depth = depth
+            st.nodes = self.search_nodes
+            st.elapsed = time.perf_counter() - st.elapsed
+
+    def _aspiration_search(self, board, side, depth, prev_move, prev_score):
+        # PVS: fenêtre étroite autour du score précédent, refaite en entier si le score en sort
+        if (not self.pvs or prev_move is None or abs(prev_score) >= 100000
+                or self._parallel_depth(depth)):
+            return self._root_search(board.copy(), side, depth, first=prev_move)
+        alpha = prev_score - ASPIRATION_WINDOW
+        beta = prev_score + ASPIRATION_WINDOW
+        m, sc = self._root_search(board.copy(), side, depth, prev_move, alpha, beta)
+        if alpha < sc < beta:
+            return m, sc
+        if self.stats is not None:
+            self.stats.researches += 1
+        # échec haut: le coup trouvé est le meilleur candidat; échec bas: garder l'ancien
+        first = m if sc >= beta else prev_move
+        return self._root_search(board.copy(), side, depth, first=first)
+
+    # ---------------- Recherche parallèle ----------------
+    def _parallel_depth(self, depth):
+        return self.search_workers > 1 and depth >= PARALLEL_MIN_DEPTH
+
+    def _root_search(self, bb, side, depth, first=None, alpha=-math.inf, beta=math.inf):
+        # racine en parallèle (fenêtre infinie seulement) si plusieurs processus et profondeur suffisante
+        if self._parallel_depth(depth) and alpha == -math.inf and beta == math.inf:
+            return self._parallel_root(bb, side, depth, first)
+        return self._minimax_bits(bb, side, depth, alpha, beta, True, first=first)
+
+    def _search_pool(self):
+        if self._pool is None:
+            self._shared_alpha = multiprocessing.Value("d", -math.inf)
+            self._pool_stop = multiprocessing.Event()
+            db_path = self.endgame_db.path if self.endgame_db is not None else None
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.search_workers,
+                initializer=_search_worker_init,
+                initargs=(self._shared_alpha, self._pool_stop, db_path, {
+                    "use_tt": self.tt is not None,
+                    "tt_size": self.tt_size,
+                    "collect_stats": self.collect_stats,
+                    "move_ordering": self.move_ordering,
+                    "search_algorithm": self.search_algorithm,
+                    "batch_leaves": self.batch_leaves,
+                    "threat_extension": self.threat_extension,
+                }),
+            )
+        return self._pool
+
+    def _parallel_root(self, bb, side, depth, first=None):
+        """Comme _minimax_bits à la racine (maximizing, fenêtre infinie), coups
+        répartis sur le pool. Même score qu'en série; à égalité de score le coup
+        choisi peut différer. Lève SearchTimeout si un coup n'a pu être fini."""
+        self.search_nodes += 1
+        me, opp = bb.bits[side], bb.bits[1 - side]
+        if bits_win(me):
+            return None, 100000 + depth
+        if bits_win(opp):
+            return None, -100000 - depth
+        targets = bits_moves(me, opp)
+        targets.sort(key=lambda t: bits_order_key(me, t))
+        if first is not None and first in targets:
+            targets.remove(first)
+            targets.insert(0, first)
+        if not targets:
+            return None, -math.inf
+
+        # temps restant: même échéance pr tous les coups; noeuds restants répartis
+        deadline = nodes = None
+        if self._deadline is not None:
+            deadline = time.monotonic() + max(0.0, self._deadline - time.perf_counter())
+        if self._node_limit is not None:
+            nodes = max(1, (self._node_limit - self.search_nodes) // len(targets))
+
+        pool = self._search_pool()
+        self._pool_stop.clear()
+        if self._cancel is not None and self._cancel.is_set():
+            raise SearchTimeout()
+        with self._shared_alpha.get_lock():
+            self._shared_alpha.value = -math.inf
+        x, o = bb.bits
+        history_keys = None if self._history is None else tuple(self._history.keys)
+        # soumis dans l'ordre: les meilleurs coups (probables) partent en 1er
+        futures = [pool.submit(_search_root_move, x, o, side, t, depth, deadline, nodes,
+                               history_keys, self._draw_base) for t in targets]
+        scores = {}
+        timed_out = False
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            move, score, nodes_searched, stats = future.result()
+            self.search_nodes += nodes_searched
+            if self.stats is not None and stats is not None:
+                self.stats.merge(stats)
+            if score is not None:
+                scores[move] = score
+            elif not timed_out:
+                # budget épuisé: coups en cours arrêtés, coups en attente annulés
+                timed_out = True
+                self._pool_stop.set()
+                for pending in futures:
+                    pending.cancel()
+        if timed_out:
+            raise SearchTimeout()
+        # dans l'ordre des coups: à égalité, le 1er trié
+        best_move, best_score = None, -math.inf
+        for t in targets:
+            if scores[t] > best_score:
+                best_move, best_score = t, scores[t]
+        return best_move, best_score
+
+    # ---------------- Recherche en arrière-plan ----------------
+    def start_search(self, player, budget, rng=None):
+        """Lance choose_move(player, budget, rng) dans un thread, retourne son SearchHandle.
+
+        Le plateau ne doit pas changer avant la fin de la recherche."""
+        return self._start_background(lambda: self.choose_move(player, budget, rng))
+
+    def start_search_move(self, player, budget):
+        """Lance search_move(player, budget) sur la partie en cours dans un thread
+        (sans victoire/blocage imm ni erreur volontaire, cf. start_search), retourne
+        son SearchHandle. Annulée, handle.result(partial=True) donne le coup de la
+        dernière itération terminée."""
+        board = [row[:] for row in self.board]
+        history = self.pos.copy()
+        return self._start_background(
+            lambda: self.search_move(board, player, budget, history, self.pos_nb, iterative=True))
+
+    def start_ponder(self, player, budget):
+        """Pendant le tour adverse: cherche en arrière-plan la réponse de player à
+        chaque coup adverse, du plus probable au moins probable (ordre heuristique).
+
+        choose_move réutilise ces réponses; la TT en sort chaude dans tous les cas.
+        S'arrête à la prochaine recherche (start_search) ou à cancel_search."""
+        bb = BitBoard.from_board(self.board)
+        history = self.pos.copy()
+        move_count = self.pos_nb
+        self.ponder_results = {}
+        return self._start_background(
+            lambda: self._ponder(bb, player, budget, history, move_count))
+
+    def _ponder(self, bb, player, budget, history, move_count):
+        # même budget que la recherche qu'on remplace (noeuds, temps); une recherche
+        # coupée par l'annulation n'est pas gardée
+        cancel = self._cancel
+        side = SIDE[player]
+        other = bb.bits[1 - side]
+        replies = bits_moves(other, bb.bits[side])
+        replies.sort(key=lambda t: bits_order_key(other, t))
+        for reply in replies:
+            undo = bb.make(reply, 1 - side)
+            repeated = history.push(bb.key) >= 3
+            try:
+                # coup adverse gagnant ou nulle: rien à préparer
+                if not (bits_win(bb.bits[1 - side]) or repeated or move_count + 1 == MOVE_LIMIT):
+                    move, score = self.search_move(bb.copy(), player, budget, history, move_count + 1)
+                    if cancel is not None and cancel.is_set():
+                        raise SearchTimeout()
+                    key = self._ponder_key(bb, side, move_count + 1, history)
+                    self.ponder_results[key] = (budget.key(), move, score)
+            finally:
+                history.pop()
+                bb.unmake(undo)
+
+    @staticmethod
+    def _ponder_key(bb, side, move_count, history):
+        # position + n° du coup + historique: la recherche en dépend (nulles par
+        # répétition ou par MOVE_LIMIT)
+        return bb.bits[0], bb.bits[1], side, move_count, tuple(history.keys)
+
+    def _ponder_lookup(self, player, budget):
+        # (coup, score) préparé pr la position actuelle avec le même budget, sinon None
+        # (mode déterministe: préparé ou non selon le temps de réflexion adverse, ignoré)
+        if not self.ponder_results or self.deterministic:
+            return None
+        key = self._ponder_key(BitBoard.from_board(self.board), SIDE[player], self.pos_nb, self.pos)
+        entry = self.ponder_results.get(key)
+        if entry is None or entry[0] != budget.key() or entry[1] is None:
+            return None
+        self.ponder_hits += 1
+        return entry[1], entry[2]
+
+    def _start_background(self, target):
+        # une seule recherche en arrière-plan à la fois: la précédente est arrêtée
+        self.cancel_search(wait=True)
+        cancel = threading.Event()
+        self._cancel = cancel
+
+        def run():
+            try:
+                return target()
+            finally:
+                if self._cancel is cancel:
+                    self._cancel = None
+
+        self._search_handle = SearchHandle(run, cancel)
+        return self._search_handle
+
+    def cancel_search(self, wait=False):
+        """Interrompt la recherche en arrière-plan en cours, s'il y en a une."""
+        handle = self._search_handle
+        if handle is None:
+            return
+        handle.cancel()
+        if self._pool_stop is not None:
+            self._pool_stop.set()
+        if wait:
+            handle.wait()
+        self._search_handle = None
+
+    def close(self):
+        """Arrête la recherche en cours et les processus de la recherche parallèle."""
+        self.cancel_search()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+    def record_game(self, winner, level_x=0, level_o=0, engine_x=None, engine_o=None, seed=None):
+        """Ajoute la partie jouée (self.moves) à record_path s'il est donné.
+
+        winner: PLAYER1, PLAYER2 ou None (nulle); niveaux 0 et moteurs None =
+        humain; seed: par défaut self.seed (vide si None)."""
+        if self.record_path is None:
+            return
+        if seed is None:
+            seed = "" if self.seed is None else str(self.seed)
+        if self._recorder is None:
+            self._recorder = GameRecordWriter(self.record_path)
+        self._recorder.write(self.moves, winner, level_x, level_o, engine_x, engine_o, seed)
+
+    def _book_move(self, board, player):
+        # placement: coup du livre d'ouvertures si la position y est
+        book = self.opening_book
+        if book is None:
+            return None
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        x, o = board.bits
+        nx, no = x.bit_count(), o.bit_count()
+        # trait déduit du nb de pions posés: X si égalité
+        if nx + no >= 8 or player != (PLAYER1 if nx == no else PLAYER2):
+            return None
+        found = book.lookup(x, o)
+        if found is None:
+            return None
+        dest, score = found
+        return (None, cell_coords(dest)), score
+
+    def _endgame_score(self, result, dist, depth, mover_is_perspective):
+        # même échelle que les victoires de minimax: 100000 + profondeur restante au gain
+        if result == 0:
+            return 0
+        score = 100000 + depth - dist
+        return score if (result == 1) == mover_is_perspective else -score
+
+    def _endgame_root(self, bb, side, depth, maximizing):
+        """(coup en indices, score) lus dans la base de finales, ou None si hors base."""
+        db = self.endgame_db
+        mover = side if maximizing else 1 - side
+        own = bb.bits[mover]
+        other = bb.bits[1 - mover]
+        if db is None or not db.covers(own, other) or bits_win(own) or bits_win(other):
+            return None
+        move, (result, dist) = db.best_move(own, other)
+        return move, self._endgame_score(result, dist, depth, mover == side)
+
+    def _endgame_move(self, bb, player):
+        # coup parfait (r, c) si la position est dans la base de finales
+        found = self._endgame_root(bb, SIDE[player], 0, True)
+        if found is None or found[0] is None:
+            return None
+        return move_to_coords(found[0])
+
+    def _check_budget(self):
+        if self._cancel is not None and self._cancel.is_set():
+            raise SearchTimeout()
+        if self._node_limit is not None and self.search_nodes >= self._node_limit:
+            raise SearchTimeout()
+        next_check = math.inf if self._node_limit is None else self._node_limit
+        if self._deadline is not None:
+            if time.perf_counter() >= self._deadline:
+                raise SearchTimeout()
+            # horloge lue ts les 1024 noeuds seulement
+            next_check = min(next_check, self.search_nodes + 1024)
+        elif self._cancel is not None:
+            next_check = min(next_check, self.search_nodes + 1024)
+        self._next_check = next_check
+
+    def _minimax_bits(self, bb, side, depth, alpha, beta, maximizing, first=None):
+        # side = camp de la perspective, bb est rendu intact
+        # first = coup à essayer en premier (meilleur coup de l'itération précédente)
+        self.search_nodes += 1
+        if self.search_nodes >= self._next_check:
+            self._check_budget()
+        # variante principale de ce ply, remplie si un coup améliore le score (cf. collect_pv);
+        # vide aux feuilles, positions terminales et coupures de la TT
+        pv = self._pv
+        if pv is not None:
+            pv[self._root_depth - depth] = []
+        me = bb.bits[side]
+        opp = bb.bits[1 - side]
+        # compteurs de la recherche (cf. SearchStats), None si désactivés
+        st = self.stats
+        if st is not None:
+            ply = self._root_depth - depth
+            if ply > st.max_depth:
+                st.max_depth = ply
+            t0 = time.perf_counter()
+        won = bits_win(me)
+        lost = not won and bits_win(opp)
+        if st is not None:
+            st.time_win += time.perf_counter() - t0
+
+        # Vérifications terminales avec bonus/malus selon profondeur
+        if won:
+            # victoire plus proch preferable
+            return None, 100000 + depth
+        
+        if lost:
+            # retarder la si inévitable
+            return None, -100000 - depth
+
+        # nulle (cf. check_draw): 30e coup ou 3e occurrence de la position
+        hist = self._history
+        if hist is not None and depth < self._root_depth:
+            if (self._draw_base + self._root_depth - depth == MOVE_LIMIT
+                    or hist.count(bb.key) >= 3):
+                return None, 0
+        
+        # phase mouvement: valeur exacte lue dans la base de finales
+        db = self.endgame_db
+        if db is not None and db.covers(me, opp):
+            mover = side if maximizing else 1 - side
+            result, dist = db.probe(bb.bits[mover], bb.bits[1 - mover])
+            return None, self._endgame_score(result, dist, depth, mover == side)
+
+        if depth == 0:
+            if self.threat_extension:
+                mover = side if maximizing else 1 - side
+                score = self._threat_score(bb.bits[mover], bb.bits[1 - mover], mover == side)
+                if score is not None:
+                    return None, score
+            if st is None:
+                return None, bb.evaluate(side)
+            t0 = time.perf_counter()
+            score = bb.evaluate(side)
+            st.leaves += 1
+            st.time_eval += time.perf_counter() - t0
+            return None, score
+
+        # table de transposition: scores tjrs du point de vue de side
+        tt = self.tt
+        tt_move = None
+        if tt is not None:
+            key = bb.key ^ ZOBRIST_NODE[side][maximizing]
+            if hist is not None:
+                # limite des 30 coups à portée: le score dépend du n° du coup
+                # (les répétitions, elles, dépendent du chemin: non distinguées)
+                move_nb = self._draw_base + self._root_depth - depth
+                if move_nb < MOVE_LIMIT <= move_nb + depth:
+                    key ^= ZOBRIST_MOVE[move_nb]
+            entry = tt.probe(key)
+            if entry is not None:
+                _, e_depth, flag, e_score, tt_move, _ = entry
+                if e_depth >= depth:
+                    if flag == TT_EXACT:
+                        return tt_move, e_score
+                    if flag == TT_LOWER:
+                        alpha = max(alpha, e_score)
+                    else:
+                        beta = min(beta, e_score)
+                    if beta <= alpha:
+                        return tt_move, e_score
+            alpha_orig, beta_orig = alpha, beta
+
+        if st is not None:
+            t0 = time.perf_counter()
+        mover = side if maximizing else 1 - side
+        own = bb.bits[mover]
+        targets = bits_moves(own, bb.bits[1 - mover])
+        # Trier mvts par heuristique, coup de la TT en tête
+        killers = self.killers
+        if killers is None:
+            targets.sort(key=lambda t: bits_order_key(own, t))
+            hints = (tt_move, first)
+        else:
+            # historique des coupures d'abord (x16: passe devant tout l'écart statique), puis
+            # killers du ply, coup de la TT et first en tête
+            history = self.history[mover]
+            targets.sort(key=lambda t: bits_order_key(own, t) - history.get(t, 0) * 16)
+            ply_killers = killers[self._root_depth - depth]
+            hints = (ply_killers[1], ply_killers[0], tt_move, first)
+        for hint in hints:
+            if hint is not None and hint in targets:
+                targets.remove(hint)
+                targets.insert(0, hint)
+        if st is not None:
+            st.time_movegen += time.perf_counter() - t0
+
+        # PVS: coups après le 1er cherchés en fenêtre nulle (scores entiers), refaits
+        # en fenêtre complète s'ils la dépassent
+        pvs = self.pvs
+        best_move = None
+        if depth == 1 and self.batch_leaves and db is None:
+            best_move, best_score = self._batch_frontier(bb, side, maximizing, targets, alpha, beta)
+            if pv is not None and best_move is not None:
+                pv[self._root_depth - 1] = [best_move]
+        elif maximizing:
+            best_score = -math.inf
+            for t in targets:
+                undo = bb.make(t, side)
+                if hist is not None:
+                    hist.push(bb.key)
+                if pvs and t is not targets[0] and alpha != -math.inf:
+                    _, eval_score = self._minimax_bits(bb, side, depth-1, alpha, alpha + 1, False)
+                    if alpha < eval_score < beta:
+                        if st is not None:
+                            st.researches += 1
+                        _, eval_score = self._minimax_bits(bb, side, depth-1, alpha, beta, False)
+                else:
+                    _, eval_score = self._minimax_bits(bb, side, depth-1, alpha, beta, False)
+                if hist is not None:
+                    hist.pop()
+                bb.unmake(undo)
+                if eval_score > best_score:
+                    best_score = eval_score
+                    best_move = t
+                    if pv is not None:
+                        ply = self._root_depth - depth
+                        pv[ply] = [t] + pv[ply + 1]
+                alpha = max(alpha, eval_score)
+                if beta <= alpha:
+                    if st is not None:
+                        st.cutoff(t is targets[0])
+                    if killers is not None:
+                        self._record_cutoff(t, mover, depth)
+                    break
+        else:
+            best_score = math.inf
+            for t in targets:
+                undo = bb.make(t, 1 - side)
+                if hist is not None:
+                    hist.push(bb.key)
+                if pvs and t is not targets[0] and beta != math.inf:
+                    _, eval_score = self._minimax_bits(bb, side, depth-1, beta - 1, beta, True)
+                    if alpha < eval_score < beta:
+                        if st is not None:
+                            st.researches += 1
+                        _, eval_score = self._minimax_bits(bb, side, depth-1, alpha, beta, True)
+                else:
+                    _, eval_score = self._minimax_bits(bb, side, depth-1, alpha, beta, True)
+                if hist is not None:
+                    hist.pop()
+                bb.unmake(undo)
+                if eval_score < best_score:
+                    best_score = eval_score
+                    best_move = t
+                    if pv is not None:
+                        ply = self._root_depth - depth
+                        pv[ply] = [t] + pv[ply + 1]
+                beta = min(beta, eval_score)
+                if beta <= alpha:
+                    if st is not None:
+                        st.cutoff(t is targets[0])
+                    if killers is not None:
+                        self._record_cutoff(t, mover, depth)
+                    break
+
+        if tt is not None:
+            if best_score <= alpha_orig:
+                flag = TT_UPPER
+            elif best_score >= beta_orig:
+                flag = TT_LOWER
+            else:
+                flag = TT_EXACT
+            tt.store(key, depth, flag, best_score, best_move)
+        return best_move, best_score
+
+    def _threat_score(self, to_move, other, for_side):
+        """Score d'une feuille d'après les menaces (bits_threats), None si aucune:
+        gain au coup suivant du camp au trait (to_move), ou sa perte 2 demi-coups
+        plus loin si other a une menace imparable (bits_unstoppable). for_side:
+        to_move est le camp de la perspective. La menace imparable n'est retenue
+        que sans nulles (history), le coup joué avant pouvant répéter la position."""
+        if bits_threats(to_move, other):
+            return 100000 - 1 if for_side else -100000 + 1
+        if self._history is None and bits_unstoppable(other, to_move):
+            return -100000 + 2 if for_side else 100000 - 2
+        return None
+
+    def _batch_frontier(self, bb, side, maximizing, targets, alpha, beta):
+        """Fils (feuilles) d'un noeud à profondeur 1 de _minimax_bits: évalués d'un
+        bloc par evaluate_batch puis parcourus dans l'ordre de targets, avec les
+        mêmes scores, coupures et nulles qu'en série. Retourne (coup, score)."""
+        mover = side if maximizing else 1 - side
+        own = bb.bits[mover]
+        opp = bb.bits[1 - mover]
+        st = self.stats
+        if st is not None:
+            t0 = time.perf_counter()
+        children = [bits_apply(own, t) for t in targets]
+        if mover == 0:
+            scores = evaluate_batch(children, [opp] * len(children), side)
+        else:
+            scores = evaluate_batch([opp] * len(children), children, side)
+        scores = scores.tolist()
+        hist = self._history
+        draws = set()
+        if hist is not None:
+            # nulle (cf. _minimax_bits) sauf si le fils est gagné
+            at_limit = self._draw_base + self._root_depth == MOVE_LIMIT
+            z = ZOBRIST[mover]
+            # clé qui sortirait de la fenêtre au push du fils
+            dropped = hist.keys[0] if len(hist) > hist.window else None
+            for i, (source, dest) in enumerate(targets):
+                if abs(scores[i]) == 100000:
+                    continue
+                key = bb.key ^ z[dest]
+                if source is not None:
+                    key ^= z[source]
+                if at_limit or hist.count(key) + (key != dropped) >= 3:
+                    scores[i] = 0
+                    draws.add(i)
+        if self.threat_extension:
+            # au trait dans les feuilles: l'adversaire de mover
+            for i, child in enumerate(children):
+                if i not in draws and abs(scores[i]) != 100000:
+                    score = self._threat_score(opp, child, mover != side)
+                    if score is not None:
+                        scores[i] = score
+        if st is not None:
+            st.time_eval += time.perf_counter() - t0
+            if self._root_depth > st.max_depth:
+                st.max_depth = self._root_depth
+        best_move = None
+        best_score = -math.inf if maximizing else math.inf
+        visited = 0
+        for t, eval_score in zip(targets, scores):
+            visited += 1
+            if maximizing:
+                if eval_score > best_score:
+                    best_score = eval_score
+                    best_move = t
+                alpha = max(alpha, eval_score)
+            else:
+                if eval_score < best_score:
+                    best_score = eval_score
+                    best_move = t
+                beta = min(beta, eval_score)
+            if beta <= alpha:
+                if st is not None:
+                    st.cutoff(t is targets[0])
+                if self.killers is not None:
+                    self._record_cutoff(t, mover, 1)
+                break
+        # noeuds comptés comme en série: un par fils parcouru
+        self.search_nodes += visited
+        if st is not None:
+            st.leaves += visited
+        if self.search_nodes >= self._next_check:
+            self._check_budget()
+        return best_move, best_score
+
+    def move_order_heur(self, board, move, player):
+        # préférer centre et adjacence aux alliés
+        source, dest = move
+        r, c = dest
+        if isinstance(board, BitBoard):
+            return -bits_order_key(board.get(player), (None, r * SIZE + c))
+        center_score = CENTER_ORDER[r * SIZE + c]
+        ally_neighbors = 0
+        for rr, cc in NEIGHBOR_COORDS[r][c]:
+            if board[rr][cc] == player:
+                ally_neighbors += 1
+        return center_score + ally_neighbors*1.2
+
+    # ---------------- Evaluation ----------------
+    def evaluate_sequences(self, board, player):
+        """Calcule le score des séquences pour un joueur."""
+        score = 0
+        sequences = []
+        
+        # Lignes
+        for r in range(SIZE):
+            for c in range(SIZE-3):
+                sequences.append([board[r][c+i] for i in range(4)])
+        
+        # Colonnes
+        for c in range(SIZE):
+            for r in range(SIZE-3):
+                sequences.append([board[r+i][c] for i in range(4)])
+        
+        # Diagonales
+        for r in range(SIZE-3):
+            for c in range(SIZE-3):
+                sequences.append([board[r+i][c+i] for i in range(4)])
+                sequences.append([board[r+3-i][c+i] for i in range(4)])
+        
+        for seq in sequences:
+            cnt = seq.count(player)
+            empt = seq.count(EMPTY)
+            if cnt == 4:
+                score += 10000
+            elif cnt == 3 and empt == 1:
+                score += 300
+            elif cnt == 2 and empt == 2:
+                score += 60
+            elif cnt == 1 and empt == 3:
+                score += 5
+        
+        return score
+
+    def evaluate_board_for_player(self, board, perspective_player):
+        
+        opponent = PLAYER2 if perspective_player == PLAYER1 else PLAYER1
+
+        if isinstance(board, BitBoard):
+            return board.evaluate(SIDE[perspective_player])
+        
+        # Vérifications terminales
+        if self.check_win_board(board, perspective_player): 
+            return 100000
+        if self.check_win_board(board, opponent): 
+            return -100000
+        
+        # Score des séquences
+        score = self.evaluate_sequences(board, perspective_player) - \
+                self.evaluate_sequences(board, opponent)
+        
+        # Bonus centre
+        center = (SIZE-1) / 2
+        for r in range(SIZE):
+            for c in range(SIZE):
+                center_bonus = max(0, 3 - (abs(r-center) + abs(c-center)))
+                if board[r][c] == perspective_player:
+                    score += center_bonus
+                elif board[r][c] == opponent:
+                    score -= center_bonus
+        
+        return score
+
+
+# ------------------ Classe principale du jeu ------------------
+class TeekoGame(TeekoEngine):
+    def __init__(self, root, *,
+                 ai_mode=False,
+                 human_side=PLAYER1,
+                 minimax_depth=3,
+                 show_eval=False,
+                 return_to_menu_cb=None,
+                 pos_nb=0,
+                 pos=None,
+                 use_tt=False,
+                 tt_size=1 << 18,
+                 move_budget=None,
+                 endgame_db=None,
+                 opening_book=None,
+                 search_workers=1,
+                 ponder=False,
+                 show_stats=False,
+                 stats_log=None,
+                 record_path=None,
+                 search_engine="minimax",
+                 engine_client=None,
+                 seed=None,
+                 deterministic=False):
+        super().__init__(ai_side=PLAYER2 if human_side == PLAYER1 else PLAYER1,
+                         minimax_depth=minimax_depth, pos_nb=pos_nb, pos=pos,
+                         use_tt=use_tt, tt_size=tt_size, move_budget=move_budget,
+                         endgame_db=endgame_db, opening_book=opening_book,
+                         search_workers=search_workers, collect_stats=show_stats,
+                         stats_log=stats_log, record_path=record_path,
+                         search_engine=search_engine, seed=seed,
+                         deterministic=deterministic)
+        self.root = root
+        self.ai_mode = ai_mode
+        self.show_eval = show_eval
+        # compteurs de recherche ajoutés à l'eval (cf. SearchStats)
+        self.show_stats = show_stats
+        self.return_to_menu_cb = return_to_menu_cb
+        # réfléchir pendant le tour de l'humain (cf. start_ponder)
+        self.ponder = ponder
+        # moteur dans un processus persistant (teeko_engine.EngineClient), sinon None:
+        # les coups de l'IA y sont cherchés, ses caches restent chauds entre les parties
+        self.engine_client = engine_client
+        if engine_client is not None:
+            engine_client.new_game(seed)
+            engine_client.set_option("deterministic", deterministic)
+            engine_client.set_option("engine", search_engine)
+            engine_client.set_option("tables", endgame_db is not None)
+
+        self.selected_piece = None
+
+        # dernier txt d'eval pr le garder visible après draw_board
+        self.last_eval_text = ""
+
+        # Interface (graine affichée: une partie signalée peut être rejouée à l'identique)
+        self.root.title("Teeko" if seed is None else f"Teeko - graine {seed}")
+        self.frame = tk.Frame(self.root)
+        self.frame.pack()
+        self.canvas = tk.Canvas(self.frame, width=SIZE*CELL_SIZE, height=SIZE*CELL_SIZE, bg="white")
+        self.canvas.grid(row=0, column=0, columnspan=3)
+        self.canvas.bind("<Button-1>", self.on_click)
+        # items du plateau réutilisés d'un dessin à l'autre (cf. draw_board)
+        self._piece_items = None
+
+        self.label_info = tk.Label(self.frame, text=self._info_text(), font=("Arial", 14, "bold"), fg="#333333", bg="#f0f0f0")
+        self.label_info.grid(row=1, column=0, sticky="w", padx=6, pady=6)
+
+        self.label_eval = tk.Label(self.frame, text="", font=("Arial", 12), fg="#555555", bg="#f0f0f0")
+        self.label_eval.grid(row=1, column=1, sticky="e", padx=6, pady=6)
+
+        # recherche IA en arrière-plan + relève par after (cf. _poll_search)
+        self._search = None
+        self._poll_id = None
+        self.poll_ms = AI_POLL_MS
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        self.btn_menu = tk.Button(self.frame, text="Retour au menu", command=self._return_to_menu)
+        self.btn_menu.grid(row=1, column=2, sticky="e", padx=6, pady=6)
+        style_button(self.btn_menu)  
+        self.draw_board()
+     
+
+        # Si l'IA doit jouer en 1er (humain a choisi O), lancer IA
+        if self.ai_mode and self.turn == self.ai_side:
+            self.root.after(300, self.ai_play)
+        else:
+            self._start_pondering()
+
+    def _info_text(self):
+        return f"Tour: {self.turn}    Joueur humain: {self.human_side}    IA: {self.ai_side}"
+
+    def _update_labels(self, eval_text=None):
+        # si eval_text fourni, màj txt stocké seulement si show_eval (ou show_stats) activé
+        shown = self.show_eval or self.show_stats
+        if eval_text is not None:
+            if shown:
+                self.last_eval_text = eval_text
+            else:
+                self.last_eval_text = ""
+        # màj label info
+        self.label_info.config(text=self._info_text())
+        # màj label eval selon show_eval et txt stocké
+        if shown and self.last_eval_text:
+            self.label_eval.config(text=self.last_eval_text)
+        else:
+            self.label_eval.config(text="")
+
+    def _abort_search(self):
+        # abandonner la recherche IA en cours et sa relève
+        self._search = None
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.close()
+
+    def _on_close(self):
+        self._abort_search()
+        self.root.destroy()
+
+    def _return_to_menu(self):
+        # arrêter la recherche, détruire fenêtre et appeler callback
+        self._abort_search()
+        if self.return_to_menu_cb:
+            self.root.destroy()
+            self.return_to_menu_cb()
+        else:
+            self.root.destroy()
+
+    # ---------------- Dessin ----------------
+    def _create_board_items(self):
+        # grille, un pion (caché si case vide) par case et cadre de sélection, créés une fois
+        self.canvas.configure(bg="#f0d9b5")
+        self._piece_items = [[None] * SIZE for _ in range(SIZE)]
+        for r in range(SIZE):
+            for c in range(SIZE):
+                x1 = c * CELL_SIZE
+                y1 = r * CELL_SIZE
+                x2 = x1 + CELL_SIZE
+                y2 = y1 + CELL_SIZE
+                # dessiner grille subtile
+                self.canvas.create_rectangle(x1, y1, x2, y2, outline="#b58863", width=2)
+                self._piece_items[r][c] = self.canvas.create_oval(
+                    x1+15, y1+15, x2-15, y2-15, outline="#555555", width=2, state="hidden")
+        self._selection_item = self.canvas.create_rectangle(
+            0, 0, 0, 0, outline="#00ff00", width=4, state="hidden")
+        # contenu affiché de chaque case et sélection affichée
+        self._drawn = [[EMPTY] * SIZE for _ in range(SIZE)]
+        self._drawn_selection = None
+
+    def draw_board(self):
+        # màj seulement des cases dont le contenu a changé et de la sélection
+        if self._piece_items is None:
+            self._create_board_items()
+        for r in range(SIZE):
+            row = self.board[r]
+            drawn = self._drawn[r]
+            for c in range(SIZE):
+                piece = row[c]
+                if piece == drawn[c]:
+                    continue
+                drawn[c] = piece
+                item = self._piece_items[r][c]
+                if piece == EMPTY:
+                    self.canvas.itemconfigure(item, state="hidden")
+                else:
+                    color = "#000000" if piece==PLAYER1 else "#fffacd"  # pions noir & crème
+                    self.canvas.itemconfigure(item, fill=color, state="normal")
+
+        # surligner pion sélectionné
+        if self.selected_piece != self._drawn_selection:
+            self._drawn_selection = self.selected_piece
+            if self.selected_piece is None:
+                self.canvas.itemconfigure(self._selection_item, state="hidden")
+            else:
+                r, c = self.selected_piece
+                x1 = c * CELL_SIZE
+                y1 = r * CELL_SIZE
+                self.canvas.coords(self._selection_item, x1+2, y1+2, x1+CELL_SIZE-2, y1+CELL_SIZE-2)
+                self.canvas.itemconfigure(self._selection_item, state="normal")
+
+        # màj labels
+        self._update_labels()
+
+    # ---------------- Gestion des clics ----------------
+    def on_click(self, event):
+        # ignorer clics si c'est le tour de l'IA
+        if self.ai_mode and self.turn == self.ai_side:
+            return
+
+        c = event.x // CELL_SIZE
+        r = event.y // CELL_SIZE
+        if not (0 <= r < SIZE and 0 <= c < SIZE):
+            return
+
+        # Phase placement
+        if self.total_pieces < 8:
+            if self.board[r][c] == EMPTY:
+                self.board[r][c] = self.turn
+                self.total_pieces += 1
+                self.moves.append((None, cell_index(r, c)))
+                if self.check_win(self.turn):
+                    self.draw_board()
+                    self.end_game(self.turn)
+                    return
+                self._advance_turn()
+            return
+
+        # Phase mouvement
+        if self.selected_piece is None:
+            if self.board[r][c] == self.turn:
+                self.selected_piece = (r, c)
+                self.draw_board()
+        else:
+            r1, c1 = self.selected_piece
+            if (r, c) == (r1, c1):
+                self.selected_piece = None
+                self.draw_board()
+                return
+            if self.board[r][c] != EMPTY:
+                return
+            if not self.adjacent(r1, c1, r, c):
+                return
+            # déplacer
+            self.board[r1][c1] = EMPTY
+            self.board[r][c] = self.turn
+            self.selected_piece = None
+            self.moves.append((cell_index(r1, c1), cell_index(r, c)))
+            self.pos_nb += 1
+            if self.check_win(self.turn):
+                self.draw_board()
+                self.end_game(self.turn)
+                return
+            if self.check_draw(self.turn):
+                self.draw_board()
+                self.end_game_draw()
+                return
+            self._advance_turn()
+
+    def _advance_turn(self):
+        # alterner
+        self.turn = PLAYER1 if self.turn == PLAYER2 else PLAYER2
+        self.draw_board()
+        # si mode IA et tour de l'IA -> planifier jeu IA
+        if self.ai_mode and self.turn == self.ai_side:
+            self.root.after(200, self.ai_play)
+
+    def start_search(self, player, budget, rng=None):
+        if self.engine_client is None:
+            return super().start_search(player, budget, rng)
+        # moteur externe: partie rejouée depuis ses coups, décision comme choose_move
+        self.cancel_search(wait=True)
+        self.engine_client.set_position(self.moves)
+        self._search_handle = self.engine_client.go(budget, play=True)
+        return self._search_handle
+
+    def _start_pondering(self):
+        # tour de l'humain contre l'IA: préparer les réponses de l'IA (moteur local)
+        # (inutile en mode déterministe, cf. _ponder_lookup)
+        if (self.ponder and self.ai_mode and self.turn == self.human_side
+                and self.engine_client is None and not self.deterministic):
+            self.start_ponder(self.ai_side, self.get_move_budget())
+
+    # ---------------- Fin de partie ----------------
+    def _record_players(self):
+        # niveaux et moteurs de X et O pr l'enregistrement, 0 / None = humain
+        if not self.ai_mode:
+            return 0, 0, None, None
+        if self.ai_side == PLAYER1:
+            return self.minimax_depth, 0, self.search_engine, None
+        return 0, self.minimax_depth, None, self.search_engine
+
+    def end_game(self, winner):
+        self.cancel_search()
+        self.record_game(winner, *self._record_players())
+        messagebox.showinfo("Victoire", f"🎉 Le joueur {winner} a gagné !")
+        # garder fenêtre ouverte mais unbind clics
+        self.canvas.unbind("<Button-1>")
+    
+    def end_game_draw(self):
+        self.cancel_search()
+        self.record_game(None, *self._record_players())
+        messagebox.showinfo("Egalité",f"Egalité après 15 coups ou position répétée 3 fois")
+        # garder fenêtre ouverte mais unbind clics
+        self.canvas.unbind("<Button-1>")
+    
+    # ---------------- Entrée IA ----------------
+    def _start_ai_search(self, player, budget, callback):
+        # recherche dans un thread, callback(move, kind, score) appelé depuis la boucle Tk
+        self._search = self.start_search(player, budget)
+        self._poll_search(self._search, callback)
+
+    def _poll_search(self, handle, callback):
+        # tkinter n'est pas thread-safe: le résultat est relevé par after
+        if handle is not self._search:
+            return
+        if not handle.done():
+            self._poll_id = self.root.after(self.poll_ms, self._poll_search, handle, callback)
+            return
+        self._poll_id = None
+        self._search = None
+        result = handle.result()
+        if result is not None:
+            callback(*result)
+
+    def ai_play(self, budget=None):
+        if budget is None:
+            budget = self.get_move_budget()
+        # victoire/blocage imm, erreur volontaire ou minimax (cf. choose_move), hors boucle Tk
+        self._start_ai_search(self.ai_side, budget, self._ai_play_done)
+
+    def _ai_play_done(self, move, kind, score):
+        if kind == "immediate":
+            eval_text = "Eval IA: immediate"
+        elif kind == "mistake":
+            eval_text = "Eval IA: erreur volontaire"
+        else:
+            # MCTS: taux de points estimé
+            shown = f"{score:.0%}" if self.search_engine == "mcts" else f"{score:.1f}"
+            eval_text = f"Eval IA: {shown} (préparé)" if kind == "ponder" else f"Eval IA: {shown}"
+        if self.show_stats and self.stats is not None:
+            eval_text += f" | {self.stats.summary()}"
+        if self.show_eval or self.show_stats:
+            self._update_labels(eval_text=eval_text)
+        if move is None:
+            # fallback cible légale aléatoire
+            targets = self.get_all_targets(self.board, self.ai_side)
+            if targets:
+                move = random.choice(targets)
+        if move is not None:
+            self.apply_target(move, self.ai_side)
+
+    def apply_target(self, move, player):
+        """move = (source, dest)"""
+        # jouer + vérifications post-coup
+        outcome = self.play_move(move, player)
+        if outcome == "win":
+            self.draw_board()
+            self.end_game(player)
+            return
+        if outcome == "draw":
+            self.draw_board()
+            self.end_game_draw()
+            return
+        
+        self.turn = PLAYER1 if self.turn == PLAYER2 else PLAYER2
+        self.draw_board()
+        
+        if self.ai_mode and self.turn == self.ai_side:
+            self.root.after(200, self.ai_play)
+        else:
+            self._start_pondering()
+
+
+# ------------------ Classe IA vs IA ------------------
+class TeekoGameAIvsAI(TeekoGame):
+    def __init__(self, root, *, ai1_level=3, ai2_level=3, step_mode=False, return_to_menu_cb=None,
+                 use_tt=False, tt_size=1 << 18, ai1_budget=None, ai2_budget=None, endgame_db=None,
+                 opening_book=None, search_workers=1, stats_log=None, move_delay_ms=AI_MOVE_DELAY_MS,
+                 fps=RENDER_FPS, games=1, record_path=None, ai1_engine="minimax", ai2_engine="minimax",
+                 seed=None, deterministic=False):
+        # délai entre coups / parties et dessin limité à fps images/s (None = à chaque coup),
+        # fixés avant le 1er dessin du parent
+        self.move_delay_ms = move_delay_ms
+        self.fps = fps
+        self._draw_id = None
+        self._last_draw = 0.0
+        # IA vs IA: override planif IA parent
+        super().__init__(root, ai_mode=True, human_side=PLAYER1, minimax_depth=3,
+                        show_eval=False, return_to_menu_cb=return_to_menu_cb,
+                        use_tt=use_tt, tt_size=tt_size, endgame_db=endgame_db,
+                        opening_book=opening_book, search_workers=search_workers,
+                        stats_log=stats_log, record_path=record_path,
+                        seed=seed if seed is None or games == 1 else f"{seed}-1",
+                        deterministic=deterministic)
+        # série: graine de la partie n = "<seed>-n"
+        self.series_seed = seed
+        self.ai1_level = ai1_level
+        self.ai2_level = ai2_level
+        # moteur de chaque IA (SEARCH_ENGINES), appliqué à self.search_engine à son tour
+        for engine in (ai1_engine, ai2_engine):
+            if engine not in SEARCH_ENGINES:
+                raise ValueError(f"search_engine inconnu: {engine!r}")
+        self.ai1_engine = ai1_engine
+        self.ai2_engine = ai2_engine
+        # budgets par coup (SearchBudget), sinon profondeur fixe = niveau
+        self.ai1_budget = ai1_budget
+        self.ai2_budget = ai2_budget
+        self.step_mode = step_mode
+        self.turn = PLAYER1
+        self.total_pieces = 0
+        # série de games parties à la suite, score cumulé par couleur (None = nulles)
+        self.games = games
+        self.game_nb = 1
+        self.score = {PLAYER1: 0, PLAYER2: 0, None: 0}
+        self.game_over = False
+        # sans délai, le résultat de la recherche est relevé au plus vite
+        if move_delay_ms < AI_POLL_MS:
+            self.poll_ms = 1
+
+        # *** AJOUT CRUCIAL : Désactiver les clics humains ***
+        self.canvas.unbind("<Button-1>")
+
+        # Désactiver planif IA parent
+        self.auto_ai_schedule = False
+
+        # Ajout labels sous le board
+        self.label_ai1 = tk.Label(self.frame, text=f"AI 1: Niveau {self.ai1_level}, {self.ai1_engine}, Couleur {PLAYER1}", font=("Arial", 12))
+        self.label_ai1.grid(row=2, column=0, pady=6)
+
+        self.label_ai2 = tk.Label(self.frame, text=f"AI 2: Niveau {self.ai2_level}, {self.ai2_engine}, Couleur {PLAYER2}", font=("Arial", 12))
+        self.label_ai2.grid(row=2, column=2, pady=6)
+
+        # Bouton étape pr mode manuel
+        if self.step_mode:
+            self.btn_next = tk.Button(self.frame, text="Tour suivant", command=self.next_turn)
+            self.btn_next.grid(row=2, column=1, pady=6)
+            style_button(self.btn_next)  # *** AJOUT : style le bouton ***
+
+        # score de la série
+        if self.games > 1:
+            self.label_score = tk.Label(self.frame, text=self._score_text(), font=("Arial", 12, "bold"))
+            self.label_score.grid(row=3, column=0, columnspan=3, pady=6)
+
+        # Démarrer 1er mvt auto si mode auto
+        if not self.step_mode:
+            self.root.after(300, self.ai_turn)
+
+    def _score_text(self):
+        return (f"Partie {self.game_nb}/{self.games}    {PLAYER1}: {self.score[PLAYER1]}    "
+                f"nulles: {self.score[None]}    {PLAYER2}: {self.score[PLAYER2]}")
+
+    # ---------------- Dessin limité en fréquence ----------------
+    def _request_draw(self):
+        # au plus fps dessins par seconde; le dernier état est tjrs dessiné (différé si besoin)
+        if self.fps is None:
+            self.draw_board()
+            return
+        if self._draw_id is not None:
+            return
+        wait = self._last_draw + 1.0 / self.fps - time.perf_counter()
+        if wait <= 0:
+            self._draw_now()
+        else:
+            self._draw_id = self.root.after(int(wait * 1000) + 1, self._draw_now)
+
+    def _draw_now(self):
+        if self._draw_id is not None:
+            self.root.after_cancel(self._draw_id)
+            self._draw_id = None
+        self._last_draw = time.perf_counter()
+        self.draw_board()
+
+    def _abort_search(self):
+        if self._draw_id is not None:
+            self.root.after_cancel(self._draw_id)
+            self._draw_id = None
+        super()._abort_search()
+
+    # Override pr retirer avancement auto du tour dans parent
+    def apply_target(self, move, player):
+        """Appliquer un mvt sans changer tour automatiquement."""
+        outcome = self.play_move(move, player)
+        # vérif victoire
+        if outcome == "win":
+            self._end_of_game(player)
+            return True
+        if outcome == "draw":
+            self._end_of_game(None)
+            return True
+        self._request_draw()
+        return False
+
+    def _end_of_game(self, winner):
+        # partie finie (winner None = nulle): score, puis partie suivante de la série
+        self._draw_now()
+        self.game_over = True
+        self.score[winner] += 1
+        if self.games == 1:
+            if winner is None:
+                self.end_game_draw()
+            else:
+                self.record_game(winner, *self._record_players())
+                messagebox.showinfo("Fin de partie", f"IA {winner} gagne!")
+            return
+        self.record_game(winner, *self._record_players())
+        self.label_score.config(text=self._score_text())
+        if self.game_nb < self.games:
+            if not self.step_mode:
+                self.root.after(self.move_delay_ms, self._next_game)
+            return
+        self.cancel_search()
+        messagebox.showinfo("Fin de la série",
+                            f"{self.games} parties: {PLAYER1} {self.score[PLAYER1]}, "
+                            f"nulles {self.score[None]}, {PLAYER2} {self.score[PLAYER2]}")
+
+    def _next_game(self):
+        # plateau et historique remis à zéro; TT et pool de processus gardés
+        self.cancel_search()
+        self.board = [[EMPTY for _ in range(SIZE)] for _ in range(SIZE)]
+        self.total_pieces = 0
+        self.pos_nb = 0
+        self.pos = PositionHistory()
+        self.moves = []
+        self.turn = PLAYER1
+        self.selected_piece = None
+        self.game_over = False
+        self.game_nb += 1
+        if self.series_seed is not None:
+            self.seed = f"{self.series_seed}-{self.game_nb}"
+            self.root.title(f"Teeko - graine {self.seed}")
+        self.label_score.config(text=self._score_text())
+        self._draw_now()
+        if not self.step_mode:
+            self.root.after(self.move_delay_ms, self.ai_turn)
+
+    def ai_turn(self, budget=None):
+        current_ai = self.turn
+        if budget is None:
+            budget = self.get_ai_budget(current_ai)
+        self.search_engine = self.ai1_engine if current_ai == PLAYER1 else self.ai2_engine
+        
+        # victoire/blocage imm, coup aléatoire selon niveau, sinon minimax (thread)
+        self._start_ai_search(current_ai, budget,
+                              lambda move, kind, score: self._ai_turn_done(current_ai, move))
+
+    def _ai_turn_done(self, current_ai, move):
+        if move is not None:
+            game_over = self.apply_target(move, current_ai)
+            if game_over:
+                return
+
+        # Changer tour manuellement
+        self.turn = PLAYER1 if self.turn==PLAYER2 else PLAYER2
+
+        # Planifier tour suivant seulement en mode auto
+        if not self.step_mode:
+            self.root.after(self.move_delay_ms, self.ai_turn)
+    
+    def get_ai_budget(self, player):
+        budget = self.ai1_budget if player == PLAYER1 else self.ai2_budget
+        if budget is not None:
+            return budget
+        return SearchBudget(self.ai1_level if player == PLAYER1 else self.ai2_level)
+
+    def next_turn(self):
+        """Mode étape manuelle: exécuter un seul mvt IA."""
+        # recherche déjà en cours: ignorer
+        if self._search is not None:
+            return
+        if self.game_over:
+            # série: la partie suivante commence au clic suivant
+            if self.game_nb < self.games:
+                self._next_game()
+            return
+        self.ai_turn()
+
+    def _record_players(self):
+        return self.ai1_level, self.ai2_level, self.ai1_engine, self.ai2_engine
+
+    # Override _info_text pr masquer labels humain/IA
+    def _info_text(self):
+        return f"Tour: {self.turn}"
+
+
+# ------------------ Menu / Paramètres UI ------------------
+class TeekoMenu:
+    # moteur en processus persistant (cf. _engine_client), partagé par ttes les parties
+    engine_client = None
+
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.title("Menu Teeko")
+        self.root.state('normal')
+
+        self.ai_difficulty = "Moyen"
+        self.human_color = PLAYER1
+        self.show_eval = False
+        self.parallel_search = False
+        self.ponder = False
+        self.show_stats = False
+        # parties ajoutées à GAME_RECORDS_PATH (sur demande)
+        self.record_games = False
+        # moteur de l'IA en Joueur vs IA (SEARCH_ENGINES)
+        self.search_engine = "minimax"
+        # IA de Joueur vs IA dans un processus séparé (teeko_engine.py)
+        self.engine_process = TeekoMenu.engine_client is not None
+        # graine des parties contre l'IA (vide = aucune, cf. _game_seed) et mode
+        # déterministe (TeekoEngine(deterministic=True)), choisis explicitement
+        self.game_seed = ""
+        self.deterministic = False
+
+        tk.Label(self.root, text="Bienvenue dans Teeko !", font=("Arial", 16, "bold"), 
+                 fg="#333333", bg="#f0f0f0").pack(pady=10)
+
+        btn_pvp = tk.Button(self.root, text="Jouer à deux", command=self.start_pvp)
+        btn_pvp.pack(pady=6)
+        style_button(btn_pvp)
+
+        btn_vs_ai = tk.Button(self.root, text="Jouer contre l'IA", command=self.start_vs_ai)
+        btn_vs_ai.pack(pady=6)
+        style_button(btn_vs_ai)
+
+        btn_ai_vs_ai = tk.Button(self.root, text="AI vs AI", command=self.start_ai_vs_ai)
+        btn_ai_vs_ai.pack(pady=6)
+        style_button(btn_ai_vs_ai)
+
+        btn_rules = tk.Button(self.root, text="Règles du jeu", command=self.show_rules)
+        btn_rules.pack(pady=6)
+        style_button(btn_rules)
+
+        btn_quit = tk.Button(self.root, text="Quitter", command=self.quit_app)
+        btn_quit.pack(pady=6)
+        style_button(btn_quit)
+
+        self.root.configure(bg="#f0f0f0")
+
+        self.root.mainloop()
+
+    def quit_app(self):
+        self.root.destroy()
+        if TeekoMenu.engine_client is not None:
+            TeekoMenu.engine_client.close()
+        sys.exit()
+
+    def start_pvp(self):
+        self.root.destroy()
+        w = tk.Tk()
+        w.state('normal')
+        TeekoGame(w, ai_mode=False, human_side=self.human_color,
+                 minimax_depth=DIFFICULTIES[self.ai_difficulty],
+                 show_eval=self.show_eval,
+                 return_to_menu_cb=self.show_menu,
+                 record_path=self._record_path())
+        w.mainloop()
+
+    def start_vs_ai(self):
+        # ouvrir settings pr choix
+        self.open_settings(modal=True)
+        self.root.destroy()
+        w = tk.Tk()
+        w.state('normal')
+        depth = DIFFICULTIES[self.ai_difficulty]
+        TeekoGame(w, ai_mode=True, human_side=self.human_color,
+                 minimax_depth=depth,
+                 show_eval=self.show_eval,
+                 return_to_menu_cb=self.show_menu,
+                 move_budget=level_budget(depth, search_engine=self.search_engine),
+                 endgame_db=default_endgame_db() if self._plays_perfect(depth) else None,
+                 opening_book=default_opening_book() if self._plays_perfect(depth) else None,
+                 search_workers=self._search_workers(),
+                 ponder=self.ponder,
+                 show_stats=self.show_stats,
+                 record_path=self._record_path(),
+                 search_engine=self.search_engine,
+                 engine_client=self._engine_client(),
+                 seed=self._game_seed(),
+                 deterministic=self.deterministic)
+        w.mainloop()
+
+    def start_ai_vs_ai(self):
+        # ouvrir settings pour parametrer partie
+        s = tk.Toplevel(self.root)
+        s.title("Paramètres AI vs AI")
+        s.geometry("600x850")
+        s.configure(bg="#f0f0f0")
+        s.transient(self.root)
+
+        # titre
+        tk.Label(s, text="Paramètres AI vs AI", font=("Arial", 16, "bold"), fg="#333333", bg="#f0f0f0").pack(pady=15)
+
+        # AI niveau 1
+        tk.Label(s, text="Niveau AI 1:", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", padx=20, pady=(10,0))
+        ai1_var = tk.IntVar(value=3)
+        for name, depth in DIFFICULTIES.items():
+            rb = tk.Radiobutton(s, text=name, variable=ai1_var, value=depth, font=("Arial", 11), bg="#f0f0f0", anchor="w")
+            rb.pack(anchor="w", padx=40)
+        engine1_var = self._engine_choice(s, padx=40)
+
+        # AI niveau 2
+        tk.Label(s, text="Niveau AI 2:", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", padx=20, pady=(10,0))
+        ai2_var = tk.IntVar(value=3)
+        for name, depth in DIFFICULTIES.items():
+            rb = tk.Radiobutton(s, text=name, variable=ai2_var, value=depth, font=("Arial", 11), bg="#f0f0f0", anchor="w")
+            rb.pack(anchor="w", padx=40)
+        engine2_var = self._engine_choice(s, padx=40)
+
+
+        tk.Label(s, text="Mode de jeu:", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", padx=20, pady=(10,0))
+        mode_var = tk.StringVar(value="auto")
+        tk.Radiobutton(s, text="Automatique", variable=mode_var, value="auto", font=("Arial", 11), bg="#f0f0f0", anchor="w").pack(anchor="w", padx=40)
+        tk.Radiobutton(s, text="Step by Step", variable=mode_var, value="step", font=("Arial", 11), bg="#f0f0f0", anchor="w").pack(anchor="w", padx=40)
+
+        # délai entre coups: 0 = turbo (coups enchaînés, dessin limité à RENDER_FPS img/s)
+        tk.Label(s, text="Délai entre coups (ms, 0 = turbo):", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", padx=20, pady=(10,0))
+        delay_var = tk.IntVar(value=AI_MOVE_DELAY_MS)
+        tk.Scale(s, variable=delay_var, from_=0, to=2000, resolution=50, orient="horizontal",
+                 length=300, bg="#f0f0f0").pack(anchor="w", padx=40)
+
+        # série de parties avec score cumulé
+        tk.Label(s, text="Nombre de parties:", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", padx=20, pady=(10,0))
+        games_var = tk.IntVar(value=1)
+        tk.Spinbox(s, from_=1, to=1000, textvariable=games_var, width=6, font=("Arial", 11)).pack(anchor="w", padx=40)
+
+        parallel_var = tk.BooleanVar(value=self.parallel_search)
+        tk.Checkbutton(s, text="Recherche parallèle (tous les coeurs)", variable=parallel_var,
+                       font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", padx=20, pady=(10,0))
+        record_var = tk.BooleanVar(value=self.record_games)
+        tk.Checkbutton(s, text="Enregistrer les parties", variable=record_var,
+                       font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", padx=20)
+        seed_var, det_var = self._seed_entry(s, padx=20)
+
+        # bouton start
+        btn_start = tk.Button(s, text="Démarrer AI vs AI", font=("Arial", 12, "bold"), command=lambda: apply_and_start())
+        btn_start.pack(pady=20)
+        style_button(btn_start)
+
+        def apply_and_start():
+            ai1_level = ai1_var.get()
+            ai2_level = ai2_var.get()
+            step_mode = (mode_var.get() == "step")
+            move_delay_ms = delay_var.get()
+            try:
+                games = max(1, games_var.get())
+            except tk.TclError:  # saisie non numérique
+                games = 1
+            self.parallel_search = parallel_var.get()
+            self.record_games = record_var.get()
+            self.game_seed = seed_var.get()
+            self.deterministic = det_var.get()
+            s.destroy()
+            self.root.destroy()
+            w = tk.Tk()
+            w.state('normal')
+            TeekoGameAIvsAI(w, ai1_level=ai1_level, ai2_level=ai2_level, step_mode=step_mode,
+                            return_to_menu_cb=self.show_menu,
+                            ai1_budget=level_budget(ai1_level, search_engine=engine1_var.get()),
+                            ai2_budget=level_budget(ai2_level, search_engine=engine2_var.get()),
+                            endgame_db=default_endgame_db() if self._plays_perfect(ai1_level, ai2_level) else None,
+                            opening_book=default_opening_book() if self._plays_perfect(ai1_level, ai2_level) else None,
+                            search_workers=self._search_workers(),
+                            move_delay_ms=move_delay_ms, games=games,
+                            record_path=self._record_path(),
+                            ai1_engine=engine1_var.get(), ai2_engine=engine2_var.get(),
+                            seed=self._game_seed(), deterministic=self.deterministic)
+            w.mainloop()
+
+        s.grab_set()
+        s.wait_window()
+
+    def show_rules(self):
+        """Display the rules of Teeko in a styled window."""
+        rules_text = (
+            "RÈGLES DU JEU TEEKO\n\n"
+            "• Le jeu se joue sur une grille 5×5.\n"
+            "• Chaque joueur possède 4 pièces (X et O).\n"
+            "• X commence toujours.\n\n"
+            "Phase 1 – Placement :\n"
+            "Les joueurs placent leurs pièces à tour de rôle sur une case vide.\n"
+            "Après 8 tours, chaque joueur aura placé ses 4 pièces.\n\n"
+            "Phase 2 – Mouvement :\n"
+            "À partir de ce moment, les joueurs déplacent l'une de leurs pièces\n"
+            "vers une case vide adjacente (horizontalement, verticalement ou en diagonale).\n\n"
+            "Objectif :\n"
+            "Former l'un des motifs suivants :\n"
+            "• 4 pièces alignées (ligne, colonne ou diagonale)\n"
+            "• ou un carré 2×2.\n\n"
+            "Le premier joueur à réussir cela gagne la partie !"
+        )
+
+        # creer fenetre
+        w = tk.Toplevel(self.root)
+        w.title("Règles du jeu")
+        w.geometry("600x500")
+        w.configure(bg="#f0f0f0") 
+        w.transient(self.root)
+
+        # Titre
+        tk.Label(w, text="Règles du jeu Teeko", font=("Arial", 16, "bold"), fg="#333333", bg="#f0f0f0").pack(pady=15)
+
+        # text frame
+        text_frame = tk.Frame(w, bg="#f0f0f0")
+        text_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+        rules_label = tk.Label(text_frame, text=rules_text, font=("Arial", 12), justify="left",
+                            wraplength=550, fg="#333333", bg="#f0f0f0")
+        rules_label.pack(anchor="nw")
+
+        # bouton close
+        btn_close = tk.Button(w, text="Fermer", font=("Arial", 12, "bold"), command=w.destroy)
+        btn_close.pack(pady=15)
+        style_button(btn_close)
+
+        w.grab_set()
+        w.wait_window()
+    
+    def _plays_perfect(self, *levels):
+        # livre et base de finales réservés aux niveaux sans erreur volontaire
+        return all(MISTAKE_PROBS.get(level, 0.0) == 0 for level in levels)
+
+    def _search_workers(self):
+        # un processus par coeur si la recherche parallèle est cochée
+        return (os.cpu_count() or 1) if self.parallel_search else 1
+
+    def _record_path(self):
+        return GAME_RECORDS_PATH if self.record_games else None
+
+    def _engine_client(self):
+        # processus moteur lancé au 1er besoin puis gardé (caches chauds) jusqu'à quit_app
+        if not self.engine_process:
+            return None
+        if TeekoMenu.engine_client is None:
+            from teeko_engine import EngineClient
+            TeekoMenu.engine_client = EngineClient(["--workers", str(self._search_workers())])
+        return TeekoMenu.engine_client
+
+    def _engine_choice(self, parent, value="minimax", **pack):
+        # boutons Minimax / MCTS sur une ligne, retourne la variable
+        var = tk.StringVar(value=value)
+        row = tk.Frame(parent, bg="#f0f0f0")
+        row.pack(anchor="w", **pack)
+        tk.Label(row, text="Moteur:", font=("Arial", 11), bg="#f0f0f0").pack(side="left")
+        for engine, text in (("minimax", "Minimax"), ("mcts", "MCTS")):
+            tk.Radiobutton(row, text=text, variable=var, value=engine,
+                           font=("Arial", 11), bg="#f0f0f0").pack(side="left")
+        return var
+
+    def _seed_entry(self, parent, **pack):
+        # champ "Graine" + case "Coups reproductibles", retourne leurs variables
+        var = tk.StringVar(value=self.game_seed)
+        row = tk.Frame(parent, bg="#f0f0f0")
+        row.pack(anchor="w", **pack)
+        tk.Label(row, text="Graine (vide = aucune):", font=("Arial", 11), bg="#f0f0f0").pack(side="left")
+        tk.Entry(row, textvariable=var, width=12, font=("Arial", 11)).pack(side="left", padx=5)
+        det_var = tk.BooleanVar(value=self.deterministic)
+        tk.Checkbutton(parent, text="Coups reproductibles (mode déterministe)",
+                       variable=det_var, font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", **pack)
+        return var, det_var
+
+    def _game_seed(self):
+        # graine saisie (sans espaces, cf. teeko_engine "newgame seed S"), tirée au hasard
+        # en mode déterministe, sinon None; affichée dans le titre et enregistrée
+        seed = "".join(self.game_seed.split())
+        if not seed and self.deterministic:
+            seed = str(random.randrange(1 << 32))
+        return seed or None
+
+    def show_menu(self):
+
+        self.__init__()
+
+    def open_settings(self, modal=False):
+        s = tk.Toplevel(self.root)
+        s.title("Paramètres IA")
+        s.geometry("400x630")
+        s.configure(bg="#f0f0f0")
+        s.transient(self.root)
+
+        # Titre
+        tk.Label(s, text="Paramètres du jeu", font=("Arial", 16, "bold"), fg="#333333", bg="#f0f0f0").pack(pady=15)
+
+        content_frame = tk.Frame(s, bg="#f0f0f0")
+        content_frame.pack(fill="both", expand=True, padx=20)
+
+        # Difficultée
+        tk.Label(content_frame, text="Difficulté IA:", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", pady=(0,5))
+        diff_var = tk.StringVar(value=self.ai_difficulty)
+        for name in DIFFICULTIES.keys():
+            tk.Radiobutton(content_frame, text=name, variable=diff_var, value=name, font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", padx=10, pady=2)
+        engine_var = self._engine_choice(content_frame, self.search_engine, padx=10)
+
+        # choix couleur
+        tk.Label(content_frame, text="Couleur du joueur (X commence):", font=("Arial", 12, "bold"), fg="#333333", bg="#f0f0f0").pack(anchor="w", pady=(10,5))
+        color_var = tk.StringVar(value=self.human_color)
+        tk.Radiobutton(content_frame, text="Jouer X (commence)", variable=color_var, value=PLAYER1, font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", padx=10, pady=2)
+        tk.Radiobutton(content_frame, text="Jouer O (IA commence)", variable=color_var, value=PLAYER2, font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", padx=10, pady=2)
+
+        # afficher eval
+        show_var = tk.BooleanVar(value=self.show_eval)
+        tk.Checkbutton(content_frame, text="Afficher évaluation Minimax pendant la partie", variable=show_var,
+                    font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", pady=(10,5))
+
+        stats_var = tk.BooleanVar(value=self.show_stats)
+        tk.Checkbutton(content_frame, text="Afficher statistiques de recherche", variable=stats_var,
+                    font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", pady=(0,5))
+
+        # recherche parallèle
+        parallel_var = tk.BooleanVar(value=self.parallel_search)
+        tk.Checkbutton(content_frame, text="Recherche parallèle (tous les coeurs)", variable=parallel_var,
+                    font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", pady=(0,5))
+
+        # réflexion pendant le tour du joueur
+        ponder_var = tk.BooleanVar(value=self.ponder)
+        tk.Checkbutton(content_frame, text="L'IA réfléchit pendant votre tour", variable=ponder_var,
+                    font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", pady=(0,5))
+
+        # parties enregistrées (cf. GameRecordWriter)
+        record_var = tk.BooleanVar(value=self.record_games)
+        tk.Checkbutton(content_frame, text="Enregistrer les parties", variable=record_var,
+                    font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", pady=(0,5))
+
+        # IA dans un processus moteur gardé d'une partie à l'autre
+        process_var = tk.BooleanVar(value=self.engine_process)
+        tk.Checkbutton(content_frame, text="Moteur IA dans un processus séparé", variable=process_var,
+                    font=("Arial", 11), bg="#f0f0f0").pack(anchor="w", pady=(0,5))
+
+        # graine fixe: rejouer une partie à l'identique
+        seed_var, det_var = self._seed_entry(content_frame)
+
+        # bouton appliquer
+        btn_apply = tk.Button(s, text="Appliquer", font=("Arial", 12, "bold"), command=lambda: apply_and_close())
+        btn_apply.pack(pady=15)
+        style_button(btn_apply)
+
+        def apply_and_close():
+            self.ai_difficulty = diff_var.get()
+            self.human_color = color_var.get()
+            self.show_eval = show_var.get()
+            self.parallel_search = parallel_var.get()
+            self.ponder = ponder_var.get()
+            self.show_stats = stats_var.get()
+            self.record_games = record_var.get()
+            self.search_engine = engine_var.get()
+            self.engine_process = process_var.get()
+            self.game_seed = seed_var.get()
+            self.deterministic = det_var.get()
+            s.destroy()
+
+        if modal:
+            s.grab_set()
+            s.wait_window()
+
+
+# ------------------ Run ------------------
+if __name__ == "__main__":
+    default_endgame_db()
+    default_opening_book()
     TeekoMenu()
\ No newline at end of file
@@ -0,0 +1,181 @@
+# teeko_analyze.py
+"""Analyse hors ligne d'un fichier de positions: meilleur coup, score, variante
+principale et nb de noeuds de chaque position, en JSON lines et dans l'ordre
+du fichier, calculés sur plusieurs processus.
+
+    python teeko_analyze.py [positions.txt | -] [--depth 5] [--time-ms MS] [--nodes N]
+                            [--jobs 4] [--tt] [--output analyses.jsonl]
+
+Une position par ligne: 25 caractères X/O/. ligne par ligne (des "/" peuvent
+séparer les rangées), le joueur au trait, puis en option la phase
+("placement" ou "movement", vérifiée). Lignes vides et commentaires (#) ignorés:
+
+    ......X......O.........XO X
+    ..X.O/.X.../....X/..O../O.OX. X movement
+
+Chaque ligne de sortie reprend le n° de ligne, la position, le joueur et la
+phase, puis eval (evaluate_board_for_player du joueur au trait), move, score,
+depth (dernière profondeur terminée), pv et nodes; les coups sont des
+[source, dest] en (r, c), source null en placement. La variante principale est
+celle de la recherche elle-même (TeekoEngine(collect_pv=True)), arrêtée aux
+coupures de la TT et aux positions de la base de finales. --depth 0: eval seule.
+Une ligne invalide donne {"line", "error"} sans arrêter l'analyse.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from Teeko_ia import (
+    EMPTY, PLAYER1, PLAYER2, SIZE,
+    SearchBudget, TeekoEngine, board_from_string,
+)
+
+PHASES = ("placement", "movement")
+# positions par tâche envoyée au pool
+CHUNK = 16
+
+# moteur de chaque processus (cf. _worker_init)
+_engine = None
+_budget = None
+
+
+def parse_position(line):
+    """"<plateau> <joueur> [phase]" -> (plateau 25 caractères, joueur, phase);
+    lève ValueError si la ligne est invalide."""
+    fields = line.split()
+    if len(fields) not in (2, 3):
+        raise ValueError("attendu: plateau joueur [phase]")
+    board = fields[0].replace("/", "")
+    if len(board) != SIZE * SIZE or set(board) - {PLAYER1, PLAYER2, EMPTY}:
+        raise ValueError(f"plateau invalide: {fields[0]!r}")
+    player = fields[1]
+    if player not in (PLAYER1, PLAYER2):
+        raise ValueError(f"joueur invalide: {player!r}")
+    for p in (PLAYER1, PLAYER2):
+        if board.count(p) > 4:
+            raise ValueError(f"plus de 4 pions {p}")
+    phase = PHASES[board.count(player) >= 4]
+    if len(fields) == 3 and fields[2] != phase:
+        raise ValueError(f"phase {fields[2]!r} incohérente avec le plateau ({phase})")
+    return board, player, phase
+
+
+def read_positions(lines):
+    """(n° de ligne, texte) des lignes à analyser."""
+    for n, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].strip()
+        if line:
+            yield n, line
+
+
+def analyze(engine, budget, n, line):
+    """Analyse d'une ligne de positions, retourne le dict écrit en JSON."""
+    try:
+        position, player, phase = parse_position(line)
+    except ValueError as e:
+        return {"line": n, "error": str(e)}
+    board = board_from_string(position)
+    result = {
+        "line": n,
+        "position": position,
+        "player": player,
+        "phase": phase,
+        "eval": engine.evaluate_board_for_player(board, player),
+    }
+    if budget.max_depth <= 0:
+        return result
+    start = time.perf_counter()
+    if budget.is_limited():
+        move, score, depth = engine.iterative_deepening(board, player, budget)
+    else:
+        move, score = engine.minimax(board, budget.max_depth, -math.inf, math.inf, True, player)
+        depth = budget.max_depth
+    nodes = engine.search_nodes
+    seconds = time.perf_counter() - start
+    result.update({
+        "move": move,
+        "score": score,
+        "depth": depth,
+        "pv": engine.pv,
+        "nodes": nodes,
+        "seconds": round(seconds, 4),
+    })
+    return result
+
+
+def _worker_init(budget, engine_options):
+    global _engine, _budget
+    _engine = TeekoEngine(**engine_options)
+    _budget = budget
+
+
+def _analyze_chunk(chunk):
+    return [analyze(_engine, _budget, n, line) for n, line in chunk]
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(lines, budget, jobs=1, use_tt=False):
+    """Résultats de l'analyse des lignes, dans leur ordre, au fil de l'eau: au plus
+    4 tâches en attente par processus, le fichier n'est pas chargé en entier."""
+    items = read_positions(lines)
+    if jobs == 1:
+        _worker_init(budget, {"use_tt": use_tt, "collect_pv": True})
+        for n, line in items:
+            yield analyze(_engine, _budget, n, line)
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_worker_init,
+                             initargs=(budget, {"use_tt": use_tt, "collect_pv": True})) as pool:
+        pending = deque()
+        for chunk in _chunks(items, CHUNK):
+            pending.append(pool.submit(_analyze_chunk, chunk))
+            if len(pending) >= 4 * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse d'un fichier de positions Teeko (JSON lines).")
+    parser.add_argument("path", nargs="?", default="-", help="fichier de positions (- = entrée standard)")
+    parser.add_argument("--depth", type=int, default=5, help="profondeur max (0 = évaluation seule)")
+    parser.add_argument("--time-ms", type=int, default=None, help="temps max par position")
+    parser.add_argument("--nodes", type=int, default=None, help="nb max de noeuds par position")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="nb de processus")
+    parser.add_argument("--tt", action="store_true", help="table de transposition")
+    parser.add_argument("--output", default=None, help="fichier de sortie (défaut: sortie standard)")
+    args = parser.parse_args(argv)
+
+    budget = SearchBudget(args.depth, time_ms=args.time_ms, nodes=args.nodes)
+    source = sys.stdin if args.path == "-" else open(args.path)
+    out = sys.stdout if args.output is None else open(args.output, "w")
+    errors = 0
+    try:
+        for result in run(source, budget, args.jobs, args.tt):
+            errors += "error" in result
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+# teeko_bench.py
+"""Mesures de la recherche de Teeko_ia sur une suite fixe de positions.
+
+    python teeko_bench.py parallel [--depth 5] [--workers N] [--tt]
+    python teeko_bench.py ordering [--depth 5] [--tt]
+    python teeko_bench.py algorithm [--depth 5] [--tt]
+    python teeko_bench.py evaluation [--depth 5] [--tt] [--positions 100000]
+
+parallel: recherche en série puis à la racine sur N processus, temps,
+noeuds et accélération par position (les scores doivent être identiques).
+ordering: noeuds, taux de coupure au 1er coup et temps de chaque tri des
+coups (MOVE_ORDERINGS) sur la suite.
+algorithm: idem pour alpha-beta et PVS (SEARCH_ALGORITHMS), en profondeur
+fixe puis en approfondissement itératif (fenêtres d'aspiration).
+evaluation: évaluations/s de bits_evaluate contre evaluate_batch (NumPy) selon
+la taille du lot, puis recherche avec et sans batch_leaves.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+from Teeko_ia import (
+    MOVE_ORDERINGS, NB_CELLS, PLAYER1, PLAYER2, SEARCH_ALGORITHMS,
+    SearchBudget, TeekoEngine, bits_evaluate, bits_win, board_from_string, evaluate_batch, np,
+)
+
+# positions sans gain immédiat: 6 en placement, 4 en mouvement (trait indiqué)
+SUITE = [
+    (".....O.........X.........", PLAYER1),
+    (".........O........X....X.", PLAYER2),
+    ("......X......O.........XO", PLAYER1),
+    (".......OX........O....X.X", PLAYER2),
+    ("...........O.O.XO...X..X.", PLAYER1),
+    ("......X..XO.....OO.X...X.", PLAYER2),
+    ("..X.O.X.......X..O..O.OX.", PLAYER1),
+    (".X.OO......X.XO.....X...O", PLAYER2),
+    ("......O...XOXO.......O.XX", PLAYER1),
+    (".O....XO..X..X....X..O..O", PLAYER2),
+]
+
+
+def _timed_search(engine, board, player, depth):
+    start = time.perf_counter()
+    move, score = engine.minimax(board, depth, -math.inf, math.inf, True, player)
+    return move, score, engine.search_nodes, time.perf_counter() - start
+
+
+def bench_parallel(depth=5, workers=None, use_tt=False, log=print):
+    workers = workers or os.cpu_count() or 1
+    serial = TeekoEngine(use_tt=use_tt)
+    parallel = TeekoEngine(use_tt=use_tt, search_workers=workers)
+    total_serial = total_parallel = 0.0
+    try:
+        # démarrage des processus hors mesure
+        parallel.minimax(board_from_string(SUITE[0][0]), 3, -math.inf, math.inf, True, SUITE[0][1])
+        log(f"profondeur {depth}, {workers} processus")
+        for s, player in SUITE:
+            _, score_s, nodes_s, t_s = _timed_search(serial, board_from_string(s), player, depth)
+            _, score_p, nodes_p, t_p = _timed_search(parallel, board_from_string(s), player, depth)
+            total_serial += t_s
+            total_parallel += t_p
+            check = "" if score_s == score_p else "  SCORE DIFFÉRENT"
+            log(f"{s} {player}  série {t_s:7.2f}s {nodes_s:>8}n  parallèle {t_p:7.2f}s {nodes_p:>8}n"
+                f"  x{t_s / max(t_p, 1e-9):.2f}{check}")
+    finally:
+        parallel.close()
+    log(f"total: série {total_serial:.2f}s, parallèle {total_parallel:.2f}s, "
+        f"accélération x{total_serial / max(total_parallel, 1e-9):.2f}")
+    return total_serial / max(total_parallel, 1e-9)
+
+
+def _run_suite(engine, depth, iterative=False):
+    """Cherche toute la suite; retourne (scores, totaux des compteurs SearchStats, secondes)."""
+    scores = []
+    totals = {"nodes": 0, "cutoffs": 0, "first_cutoffs": 0, "researches": 0}
+    elapsed = 0.0
+    for s, player in SUITE:
+        board = board_from_string(s)
+        if iterative:
+            start = time.perf_counter()
+            _, score, _ = engine.iterative_deepening(board, player, SearchBudget(depth, nodes=10 ** 9))
+            t = time.perf_counter() - start
+        else:
+            _, score, _, t = _timed_search(engine, board, player, depth)
+        scores.append(score)
+        elapsed += t
+        for name in totals:
+            totals[name] += getattr(engine.stats, name)
+    return scores, totals, elapsed
+
+
+def _compare(label, variants, depth, use_tt, iterative=False, log=print):
+    # variants: {nom: options de TeekoEngine}; retourne {nom: nb total de noeuds}
+    results = {}
+    scores = set()
+    log(f"{label}, profondeur {depth}, TT {'oui' if use_tt else 'non'}")
+    for name, options in variants.items():
+        engine = TeekoEngine(use_tt=use_tt, collect_stats=True, **options)
+        sc, totals, elapsed = _run_suite(engine, depth, iterative)
+        scores.add(tuple(sc))
+        rate = totals["first_cutoffs"] / totals["cutoffs"] if totals["cutoffs"] else 0.0
+        log(f"{name:>10}: {totals['nodes']:>9} noeuds, coupures au 1er coup {rate:.1%}, "
+            f"{totals['researches']} re-recherches, {elapsed:.2f}s")
+        results[name] = totals["nodes"]
+    if len(scores) > 1:
+        log("SCORES DIFFÉRENTS")
+    return results
+
+
+def bench_ordering(depth=5, use_tt=False, log=print):
+    """Compare les tris des coups; retourne {tri: nb total de noeuds}."""
+    return _compare("tri des coups", {o: {"move_ordering": o} for o in MOVE_ORDERINGS},
+                    depth, use_tt, log=log)
+
+
+def bench_algorithm(depth=5, use_tt=False, log=print):
+    """Compare alpha-beta et PVS, profondeur fixe puis itérative."""
+    variants = {a: {"search_algorithm": a} for a in SEARCH_ALGORITHMS}
+    fixed = _compare("profondeur fixe", variants, depth, use_tt, log=log)
+    iterative = _compare("approfondissement itératif", variants, depth, use_tt, iterative=True, log=log)
+    return fixed, iterative
+
+
+def random_positions(n, seed=0):
+    """n positions (bits X, bits O) tirées au hasard, sans motif gagnant."""
+    rng = random.Random(seed)
+    xs, os_ = [], []
+    while len(xs) < n:
+        pieces = rng.randint(1, 4)
+        cells = rng.sample(range(NB_CELLS), 2 * pieces - rng.randint(0, 1))
+        x = sum(1 << c for c in cells[0::2])
+        o = sum(1 << c for c in cells[1::2])
+        if not (bits_win(x) or bits_win(o)):
+            xs.append(x)
+            os_.append(o)
+    return xs, os_
+
+
+def bench_evaluation(depth=5, use_tt=False, positions=100000, log=print):
+    """Débit de l'évaluation scalaire et par lots, puis recherche avec batch_leaves;
+    retourne {taille du lot (0 = scalaire): évaluations/s}."""
+    if np is None:
+        log("NumPy n'est pas installé: evaluate_batch indisponible")
+        return {}
+    xs, os_ = random_positions(positions)
+    start = time.perf_counter()
+    expected = [bits_evaluate(x, o) for x, o in zip(xs, os_)]
+    rates = {0: positions / max(time.perf_counter() - start, 1e-9)}
+    log(f"{positions} positions, scalaire: {rates[0]:>10.0f} évaluations/s")
+    # ~ nb de fils d'un noeud (placement: jusqu'à 24, mouvement: ~8), puis gros lots
+    for size in (8, 24, 256, 4096, positions):
+        scores = []
+        start = time.perf_counter()
+        for i in range(0, positions, size):
+            scores.extend(evaluate_batch(xs[i:i + size], os_[i:i + size]).tolist())
+        rates[size] = positions / max(time.perf_counter() - start, 1e-9)
+        check = "" if scores == expected else "  SCORES DIFFÉRENTS"
+        log(f"lots de {size:>6}: {rates[size]:>10.0f} évaluations/s  x{rates[size] / rates[0]:.2f}{check}")
+    _compare("recherche", {"scalaire": {}, "lots": {"batch_leaves": True}}, depth, use_tt, log=log)
+    return rates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesures de la recherche Teeko.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("parallel", help="accélération de la recherche parallèle à la racine")
+    p.add_argument("--depth", type=int, default=5)
+    p.add_argument("--workers", type=int, default=None, help="nb de processus (défaut: nb de coeurs)")
+    p.add_argument("--tt", action="store_true", help="table de transposition")
+    p = sub.add_parser("ordering", help="noeuds selon le tri des coups")
+    p.add_argument("--depth", type=int, default=5)
+    p.add_argument("--tt", action="store_true", help="table de transposition")
+    p = sub.add_parser("algorithm", help="alpha-beta contre PVS")
+    p.add_argument("--depth", type=int, default=5)
+    p.add_argument("--tt", action="store_true", help="table de transposition")
+    p = sub.add_parser("evaluation", help="évaluation scalaire contre par lots (NumPy)")
+    p.add_argument("--depth", type=int, default=5)
+    p.add_argument("--tt", action="store_true", help="table de transposition")
+    p.add_argument("--positions", type=int, default=100000, help="nb de positions évaluées")
+    args = parser.parse_args(argv)
+    if args.command == "parallel":
+        bench_parallel(args.depth, args.workers, args.tt)
+    elif args.command == "ordering":
+        bench_ordering(args.depth, args.tt)
+    elif args.command == "algorithm":
+        bench_algorithm(args.depth, args.tt)
+    elif args.command == "evaluation":
+        bench_evaluation(args.depth, args.tt, args.positions)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
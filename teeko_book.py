@@ -0,0 +1,66 @@
+# teeko_book.py
+"""Construit le livre d'ouvertures de Teeko (phase placement).
+
+Toutes les positions des premiers demi-coups sont réduites à leur forme
+canonique sous les 8 symétries du plateau, cherchées en profondeur puis
+écrites dans teeko_book.bin, que Teeko_ia consulte avant minimax.
+
+    python teeko_book.py [--plies 4] [--depth 6] [-o teeko_book.bin]
+"""
+import argparse
+import math
+import sys
+import time
+
+from Teeko_ia import (
+    PLAYER1, PLAYER2, OPENING_BOOK_PATH,
+    BitBoard, OpeningBook, TeekoEngine,
+    bits_moves, bits_apply, bits_win, canonical_pair, cell_index,
+)
+
+
+def build(plies=4, depth=6, path=OPENING_BOOK_PATH, log=print):
+    """Cherche chaque position canonique des `plies` premiers demi-coups à `depth`."""
+    if not 1 <= plies <= 8:
+        raise ValueError("plies doit être entre 1 et 8 (phase placement)")
+    engine = TeekoEngine(use_tt=True, tt_size=1 << 20)
+    book = OpeningBook()
+    level = {(0, 0)}
+    start = time.perf_counter()
+    for ply in range(plies):
+        player = PLAYER1 if ply % 2 == 0 else PLAYER2
+        nxt = set()
+        for x, o in sorted(level):
+            move, score = engine.minimax(BitBoard(x, o), depth, -math.inf, math.inf, True, player)
+            if move is None:
+                continue
+            book.add(x, o, cell_index(*move[1]), score)
+            if ply + 1 == plies:
+                continue
+            own, other = (x, o) if player == PLAYER1 else (o, x)
+            for m in bits_moves(own, other):
+                after = bits_apply(own, m)
+                # partie finie: rien à jouer ensuite
+                if bits_win(after):
+                    continue
+                cx, co = (after, other) if player == PLAYER1 else (other, after)
+                a, b, _ = canonical_pair(cx, co)
+                nxt.add((a, b))
+        log(f"demi-coup {ply}: {len(level)} positions, {time.perf_counter() - start:.0f}s")
+        level = nxt
+    book.save(path)
+    log(f"{path}: {len(book)} positions")
+    return book
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Construit le livre d'ouvertures Teeko.")
+    parser.add_argument("--plies", type=int, default=4, help="nb de demi-coups couverts (1 à 8)")
+    parser.add_argument("--depth", type=int, default=6, help="profondeur minimax par position")
+    parser.add_argument("-o", "--output", default=OPENING_BOOK_PATH, help="fichier de sortie")
+    args = parser.parse_args(argv)
+    build(args.plies, args.depth, args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+# teeko_endgame.py
+"""Génère la base de finales de Teeko (phase mouvement) par analyse rétrograde.
+
+Chaque position avec les 8 pions posés est résolue (gain / perte / nulle +
+distance en demi-coups) puis écrite dans teeko_endgame.bin, que Teeko_ia
+mappe en mémoire au démarrage (cf. EndgameDB).
+
+    python teeko_endgame.py [-o teeko_endgame.bin]
+
+Les règles de nulle de la partie (30 coups, répétition) sont ignorées: la
+base donne la valeur théorique de la position.
+"""
+import argparse
+import itertools
+import sys
+import time
+from array import array
+
+from Teeko_ia import (
+    NB_CELLS, FULL_MASK, NEIGHBOR_MASKS, EG_O_CONFIGS, EG_WIN, EG_LOSS,
+    ENDGAME_DB_PATH, ENDGAME_MAGIC, ENDGAME_HEADER,
+    iter_bits, bits_win, bits_moves, bits_apply, bits_transform,
+    canonical_pair, subset_rank, endgame_classes,
+)
+
+# distance max codable sur un octet (gains: 1 + d < 128, pertes: 128 + d < 256)
+MAX_DISTANCE = 126
+
+
+def _canonical_index(mover, other, class_index):
+    a, b, _ = canonical_pair(mover, other)
+    return class_index[a] * EG_O_CONFIGS + subset_rank(b, a), a, b
+
+
+def _predecessors(a, b, class_index):
+    """Positions (canoniques, distinctes) dont un coup de l'adversaire mène à (a, b).
+
+    a = pions du trait, b = pions qui viennent de bouger."""
+    preds = {}
+    if bits_win(a):
+        return preds
+    empty = ~(a | b) & FULL_MASK
+    for s in iter_bits(b):
+        for t in iter_bits(NEIGHBOR_MASKS[s] & empty):
+            prev = b ^ (1 << s) ^ (1 << t)
+            # position de départ finie: pas de prédécesseur
+            if bits_win(prev):
+                continue
+            idx, pa, pb = _canonical_index(prev, a, class_index)
+            preds[idx] = (pa, pb)
+    return preds
+
+
+def generate(path=ENDGAME_DB_PATH, log=print):
+    classes, class_index = endgame_classes()
+    size = len(classes) * EG_O_CONFIGS
+    values = bytearray(size)     # 0 = nulle (ou non résolue)
+    pending = bytearray(size)    # nb de classes filles pas encore gagnantes pr l'adversaire
+    frontier = array("Q")        # positions résolues à la distance courante, a | b << 25
+    start = time.perf_counter()
+
+    # 1) positions finales + nb de coups distincts (à symétrie près) des autres
+    for c, a in enumerate(classes):
+        stab = [g for g in range(1, 8) if bits_transform(a, g) == a]
+        free = [i for i in range(NB_CELLS) if not a >> i & 1]
+        a_wins = bits_win(a)
+        for cells in itertools.combinations(free, 4):
+            b = sum(1 << i for i in cells)
+            # une seule représentante par classe de symétrie
+            if any(bits_transform(b, g) < b for g in stab):
+                continue
+            idx = c * EG_O_CONFIGS + subset_rank(b, a)
+            if bits_win(b):
+                values[idx] = EG_LOSS
+                frontier.append(a | b << NB_CELLS)
+                continue
+            if a_wins:
+                # le trait a déjà un motif: position inatteignable
+                continue
+            children = {_canonical_index(b, bits_apply(a, m), class_index)[0] for m in bits_moves(a, b)}
+            if not children:
+                # bloqué: compté perdu, comme minimax (-inf)
+                values[idx] = EG_LOSS
+                frontier.append(a | b << NB_CELLS)
+            else:
+                pending[idx] = len(children)
+        if c % 100 == 0:
+            log(f"init {c}/{len(classes)} classes, {time.perf_counter() - start:.0f}s")
+
+    # 2) propagation en largeur: distance d paire = pertes, impaire = gains
+    dist = 0
+    mask = FULL_MASK
+    while frontier:
+        if dist >= MAX_DISTANCE:
+            raise ValueError(f"distance > {MAX_DISTANCE}, non codable")
+        log(f"distance {dist}: {len(frontier)} positions, {time.perf_counter() - start:.0f}s")
+        nxt = array("Q")
+        losing = dist % 2 == 0
+        for packed in frontier:
+            a = packed & mask
+            b = packed >> NB_CELLS
+            for idx, (pa, pb) in _predecessors(a, b, class_index).items():
+                if values[idx]:
+                    continue
+                if losing:
+                    # un coup vers une position perdue pr l'adversaire suffit
+                    values[idx] = EG_WIN + dist + 1
+                    nxt.append(pa | pb << NB_CELLS)
+                else:
+                    pending[idx] -= 1
+                    if pending[idx] == 0:
+                        # tous les coups mènent à un gain adverse
+                        values[idx] = EG_LOSS + dist + 1
+                        nxt.append(pa | pb << NB_CELLS)
+        frontier = nxt
+        dist += 1
+
+    with open(path, "wb") as f:
+        f.write(ENDGAME_HEADER.pack(ENDGAME_MAGIC, len(classes), max(dist - 1, 0)))
+        f.write(values)
+    log(f"{path}: {size} positions, distance max {max(dist - 1, 0)}, {time.perf_counter() - start:.0f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère la base de finales Teeko (analyse rétrograde).")
+    parser.add_argument("-o", "--output", default=ENDGAME_DB_PATH, help="fichier de sortie")
+    args = parser.parse_args(argv)
+    generate(args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,451 @@
+# teeko_engine.py
+"""Moteur Teeko en processus persistant, piloté par un protocole texte sur
+stdin/stdout (inspiré d'UCI). Le moteur (TT, arbre MCTS, tables) est créé une
+fois et reste chaud d'une recherche et d'une partie à l'autre.
+
+    python teeko_engine.py [--no-tt] [--tt-size N] [--workers N]
+
+Commandes (une par ligne), réponses du moteur après "->":
+
+    teeko                                -> id name Teeko_ia, teekook
+    isready                              -> readyok
+    newgame [seed S]                     nouvelle partie (caches gardés), graine S
+                                         des décisions (cf. TeekoEngine(seed=...))
+    position startpos [moves 22 13 ...]
+    position board <25 car.> <X|O> [moves ...]
+    moves 33-22 ...                      coups joués sur la position courante
+    go [depth N] [movetime MS] [nodes N] [infinite] [play]
+                                         -> info depth .. score .. nodes .. time .. kind ..
+                                         -> bestmove <coup | none>
+                                         partie terminée: -> result <win X | win O | draw>
+                                         puis -> bestmove none
+    stop                                 arrête la recherche (-> bestmove)
+    stats                                -> stats {JSON}
+    setoption name engine value minimax|mcts
+    setoption name tables value true|false
+    setoption name deterministic value true|false
+    quit
+
+Coups en notation move_text: "22" (pose), "33-22" (déplacement). go cherche
+le meilleur coup (search_move, dernière itération terminée si stop); avec
+play, il décide comme l'IA d'une partie (choose_move: gain/blocage imm,
+erreurs volontaires du niveau = depth). Avec deterministic (TT vidée à
+chaque recherche, cf. TeekoEngine(deterministic=True)) et sans movetime:
+même graine et même position, même coup. Erreurs: "info string ...".
+
+EngineClient lance ce processus et le pilote (cf. TeekoGame(engine_client=...)).
+"""
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+from Teeko_ia import (
+    DIFFICULTIES, EMPTY, MOVE_LIMIT, PLAYER1, PLAYER2, SEARCH_ENGINES, SIZE,
+    PositionHistory, SearchBudget, TeekoEngine,
+    default_endgame_db, default_opening_book, move_text, move_to_coords, move_to_indices, parse_move,
+)
+
+# profondeur de go sans depth: celle du niveau le plus fort, ou MOVE_LIMIT
+# (sans fin pratique) avec movetime, nodes ou infinite
+DEFAULT_DEPTH = max(DIFFICULTIES.values())
+ENGINE_SCRIPT = os.path.abspath(__file__)
+
+
+class EngineServer:
+    """Boucle de commandes: lit in_, écrit les réponses dans out (une par ligne)."""
+
+    def __init__(self, out=sys.stdout, use_tt=True, tt_size=1 << 18, search_workers=1):
+        self.out = out
+        self._out_lock = threading.Lock()
+        self.engine = TeekoEngine(use_tt=use_tt, tt_size=tt_size, search_workers=search_workers,
+                                  collect_stats=True)
+        self.player = PLAYER1
+        # "win X", "draw" quand la position courante termine la partie
+        self.result = None
+        self._search = None
+        self._reporter = None
+        self.started = time.perf_counter()
+        self.searches = 0
+        self.total_nodes = 0
+        self.games = 0
+        self.last_stats = None
+        self.new_game()
+
+    def send(self, line):
+        with self._out_lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def run(self, in_=sys.stdin):
+        for line in in_:
+            if not self.handle_line(line):
+                break
+        self.stop()
+        self.engine.close()
+
+    def handle_line(self, line):
+        """Exécute une commande; retourne False sur quit."""
+        fields = line.split()
+        if not fields:
+            return True
+        command, args = fields[0], fields[1:]
+        try:
+            if command == "quit":
+                return False
+            if command == "teeko":
+                self.send("id name Teeko_ia")
+                self.send("teekook")
+            elif command == "isready":
+                self.send("readyok")
+            elif command == "newgame":
+                self.stop()
+                self.new_game(args)
+            elif command == "position":
+                self.stop()
+                self.set_position(args)
+            elif command == "moves":
+                self.stop()
+                self.play(args)
+            elif command == "go":
+                self.stop()
+                self.go(args)
+            elif command == "stop":
+                self.stop()
+            elif command == "stats":
+                self.send("stats " + json.dumps(self.stats()))
+            elif command == "setoption":
+                self.stop()
+                self.set_option(args)
+            else:
+                self.send(f"info string commande inconnue: {command}")
+        except ValueError as e:
+            self.send(f"info string erreur: {e}")
+        return True
+
+    # ---------------- Position ----------------
+    def new_game(self, args=()):
+        if args and (len(args) != 2 or args[0] != "seed"):
+            raise ValueError("newgame: attendu [seed S]")
+        self.games += 1
+        self.engine.seed = args[1] if args else None
+        self._reset()
+        self.engine.ponder_results = {}
+
+    def _reset(self, board=None, player=PLAYER1):
+        engine = self.engine
+        engine.board = board or [[EMPTY] * SIZE for _ in range(SIZE)]
+        # plateau donné: coups joués comptés d'après les pions posés
+        engine.pos_nb = sum(row.count(PLAYER1) + row.count(PLAYER2) for row in engine.board)
+        engine.total_pieces = engine.pos_nb
+        engine.pos = PositionHistory()
+        engine.moves = []
+        self.player = player
+        self.result = None
+
+    def set_position(self, args):
+        if args[:1] == ["startpos"]:
+            rest = args[1:]
+            self._reset()
+        elif args[:1] == ["board"] and len(args) >= 3:
+            text, player, rest = args[1], args[2], args[3:]
+            if len(text) != SIZE * SIZE or set(text) - {PLAYER1, PLAYER2, EMPTY}:
+                raise ValueError(f"plateau invalide: {text!r}")
+            if player not in (PLAYER1, PLAYER2):
+                raise ValueError(f"joueur invalide: {player!r}")
+            self._reset([list(text[r * SIZE:(r + 1) * SIZE]) for r in range(SIZE)], player)
+            # plateau déjà gagné: partie terminée, go n'y cherche rien
+            winners = [p for p in (PLAYER1, PLAYER2) if self.engine.check_win_board(self.engine.board, p)]
+            if len(winners) == 2:
+                raise ValueError(f"plateau invalide (deux gagnants): {text!r}")
+            if winners:
+                self.result = f"win {winners[0]}"
+        else:
+            raise ValueError("position startpos | board <plateau> <joueur> [moves ...]")
+        if rest:
+            if rest[0] != "moves":
+                raise ValueError(f"attendu: moves, pas {rest[0]!r}")
+            self.play(rest[1:])
+
+    def play(self, texts):
+        """Joue les coups (notation move_text) sur la position courante."""
+        engine = self.engine
+        for text in texts:
+            if self.result is not None:
+                raise ValueError(f"partie terminée ({self.result}): {text}")
+            move = move_to_coords(parse_move(text))
+            if move not in engine.get_all_targets(engine.board, self.player):
+                raise ValueError(f"coup illégal pr {self.player}: {text}")
+            outcome = engine.play_move(move, self.player)
+            if outcome == "win":
+                self.result = f"win {self.player}"
+            elif outcome == "draw":
+                self.result = "draw"
+            self.player = PLAYER2 if self.player == PLAYER1 else PLAYER1
+
+    def set_option(self, args):
+        if len(args) != 4 or args[0] != "name" or args[2] != "value":
+            raise ValueError("setoption name <nom> value <valeur>")
+        name, value = args[1], args[3]
+        if name == "engine":
+            if value not in SEARCH_ENGINES:
+                raise ValueError(f"moteur inconnu: {value!r}")
+            self.engine.search_engine = value
+        elif name == "tables":
+            # base de finales + livre d'ouvertures, chargés une fois pr tout le processus
+            on = value.lower() in ("true", "1", "on")
+            self.engine.endgame_db = default_endgame_db() if on else None
+            self.engine.opening_book = default_opening_book() if on else None
+        elif name == "deterministic":
+            self.engine.deterministic = value.lower() in ("true", "1", "on")
+        else:
+            raise ValueError(f"option inconnue: {name!r}")
+
+    # ---------------- Recherche ----------------
+    def go(self, args):
+        depth = time_ms = nodes = None
+        play = infinite = False
+        i = 0
+        while i < len(args):
+            word = args[i]
+            if word in ("depth", "movetime", "nodes") and i + 1 < len(args):
+                value = int(args[i + 1])
+                if word == "depth":
+                    depth = value
+                elif word == "movetime":
+                    time_ms = value
+                else:
+                    nodes = value
+                i += 2
+                continue
+            if word == "play":
+                play = True
+            elif word == "infinite":
+                infinite = True
+            else:
+                raise ValueError(f"go: argument inconnu {word!r}")
+            i += 1
+        if depth is None:
+            depth = MOVE_LIMIT if (infinite or time_ms is not None or nodes is not None) else DEFAULT_DEPTH
+        if self.result is not None:
+            self.send(f"info string partie terminée ({self.result})")
+            self.send(f"result {self.result}")
+            self.send("bestmove none")
+            return
+        budget = SearchBudget(depth, time_ms=time_ms, nodes=nodes)
+        if play:
+            handle = self.engine.start_search(self.player, budget)
+        else:
+            handle = self.engine.start_search_move(self.player, budget)
+        self._search = handle
+        self._reporter = threading.Thread(target=self._report, args=(handle, play, time.perf_counter()),
+                                          daemon=True)
+        self._reporter.start()
+
+    def _report(self, handle, play, start):
+        # attend la fin de la recherche (ou stop) et envoie info + bestmove
+        try:
+            result = handle.result(partial=True)
+        except Exception as e:
+            self.send(f"info string erreur de recherche: {e!r}")
+            result = None
+        elapsed_ms = round((time.perf_counter() - start) * 1000)
+        if result is None:
+            self.send("bestmove none")
+            return
+        move, kind, score = result if play else (result[0], "search", result[1])
+        st = self.engine.stats if kind in ("search", "ponder") else None
+        info = [f"kind {kind}", f"time {elapsed_ms}"]
+        if score is not None:
+            info.append(f"score {score}")
+        if st is not None:
+            info += [f"depth {st.depth}", f"nodes {st.nodes}"]
+            self.searches += 1
+            self.total_nodes += st.nodes
+            self.last_stats = st.as_dict()
+        self.send("info " + " ".join(info))
+        self.send("bestmove " + ("none" if move is None else move_text(move_to_indices(move))))
+
+    def stop(self):
+        """Arrête la recherche en cours; son bestmove est envoyé avant le retour."""
+        if self._search is None:
+            return
+        self.engine.cancel_search(wait=True)
+        self._reporter.join()
+        self._search = None
+        self._reporter = None
+
+    def stats(self):
+        engine = self.engine
+        stats = {
+            "uptime": round(time.perf_counter() - self.started, 3),
+            "games": self.games,
+            "searches": self.searches,
+            "nodes": self.total_nodes,
+            "ponder_hits": engine.ponder_hits,
+            "position": {"player": self.player, "moves": engine.pos_nb, "result": self.result},
+            "last": self.last_stats,
+        }
+        if engine.tt is not None:
+            stats["tt"] = {"hits": engine.tt.hits, "misses": engine.tt.misses, "stores": engine.tt.stores}
+        return stats
+
+
+# ---------------- Client ----------------
+class ClientSearch:
+    """Recherche d'un EngineClient (go), même interface que SearchHandle:
+    result() -> (coup en (r, c) ou None, nature, score), None si annulée."""
+
+    def __init__(self, client):
+        self.client = client
+        self.info = {}
+        self.move = None
+        self._done = threading.Event()
+        self._cancelled = False
+
+    def _finish(self, text):
+        self.move = None if text == "none" else move_to_coords(parse_move(text))
+        self._done.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def cancel(self):
+        if not self._done.is_set():
+            self._cancelled = True
+            self.client.stop()
+
+    def cancelled(self):
+        return self._cancelled
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+
+    def result(self, partial=False):
+        self._done.wait()
+        if self._cancelled and not partial:
+            return None
+        score = self.info.get("score")
+        return self.move, self.info.get("kind", "search"), None if score is None else float(score)
+
+
+class EngineClient:
+    """Lance teeko_engine.py dans un sous-processus et le pilote: une instance
+    (donc un moteur chaud) peut servir toutes les parties d'une session."""
+
+    def __init__(self, args=(), python=None, timeout=30.0):
+        self.timeout = timeout
+        self.proc = subprocess.Popen([python or sys.executable, ENGINE_SCRIPT, *args],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     text=True, bufsize=1)
+        self._lines = queue.Queue()
+        self._search = None
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+        self.send("teeko")
+        self._expect("teekook")
+
+    def _read(self):
+        # info / bestmove -> recherche en cours, le reste -> file de réponses
+        for line in self.proc.stdout:
+            line = line.strip()
+            search = self._search
+            if search is not None and line.startswith("bestmove "):
+                self._search = None
+                search._finish(line.split()[1])
+            elif search is not None and line.startswith("result "):
+                # partie terminée, pas de recherche (bestmove none suit)
+                search.info["result"] = line[len("result "):]
+            elif search is not None and line.startswith("info ") and not line.startswith("info string"):
+                words = line.split()[1:]
+                search.info.update(zip(words[0::2], words[1::2]))
+            else:
+                self._lines.put(line)
+        # processus terminé: débloquer une recherche en attente
+        if self._search is not None:
+            self._search._finish("none")
+
+    def _expect(self, prefix):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise TimeoutError(f"moteur: pas de réponse {prefix!r}") from None
+            if line.startswith(prefix):
+                return line
+
+    def send(self, line):
+        self.proc.stdin.write(line + "\n")
+        self.proc.stdin.flush()
+
+    def is_ready(self):
+        self.send("isready")
+        self._expect("readyok")
+
+    def new_game(self, seed=None):
+        self.send("newgame" if seed is None else f"newgame seed {seed}")
+
+    def set_option(self, name, value):
+        self.send(f"setoption name {name} value {value}")
+
+    def set_position(self, moves=(), board=None, player=PLAYER1):
+        """moves en indices (comme TeekoEngine.moves), joués depuis le plateau vide
+        ou depuis board (liste de listes, player au trait)."""
+        if board is None:
+            head = "position startpos"
+        else:
+            head = f"position board {''.join(''.join(row) for row in board)} {player}"
+        self.send(head + ("" if not moves else " moves " + " ".join(move_text(m) for m in moves)))
+
+    def go(self, budget, play=False):
+        """Lance la recherche (SearchBudget) sur la position courante, retourne un ClientSearch."""
+        if self._search is not None:
+            self.stop()
+        search = ClientSearch(self)
+        self._search = search
+        words = ["go", "depth", str(budget.max_depth)]
+        if budget.time_ms is not None:
+            words += ["movetime", str(budget.time_ms)]
+        if budget.nodes is not None:
+            words += ["nodes", str(budget.nodes)]
+        if play:
+            words.append("play")
+        self.send(" ".join(words))
+        return search
+
+    def stop(self):
+        search = self._search
+        self.send("stop")
+        if search is not None:
+            search.wait(self.timeout)
+
+    def stats(self):
+        self.send("stats")
+        return json.loads(self._expect("stats ")[len("stats "):])
+
+    def close(self):
+        if self.proc.poll() is None:
+            try:
+                self.send("quit")
+                self.proc.wait(self.timeout)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Moteur Teeko persistant (protocole texte sur stdin/stdout).")
+    parser.add_argument("--no-tt", dest="tt", action="store_false", help="sans table de transposition")
+    parser.add_argument("--tt-size", type=int, default=1 << 18, help="nb d'entrées de la TT")
+    parser.add_argument("--workers", type=int, default=1, help="nb de processus de la recherche à la racine")
+    args = parser.parse_args(argv)
+    EngineServer(use_tt=args.tt, tt_size=args.tt_size, search_workers=args.workers).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
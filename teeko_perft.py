@@ -0,0 +1,124 @@
+# teeko_perft.py
+"""Perft: nb de positions feuilles à profondeur N, pour vérifier le générateur
+de coups (bits_moves, get_all_targets) et mesurer sa vitesse.
+
+Une position gagnée n'est pas développée: perft(N) = nb de suites de N
+demi-coups légales, la partie s'arrêtant au premier motif gagnant.
+
+    python teeko_perft.py [--depth 4] [--position X...O...] [--player X] [--divide] [--lists]
+    python teeko_perft.py --check     # compare aux comptes de référence
+"""
+import argparse
+import sys
+import time
+
+from Teeko_ia import (
+    PLAYER1, PLAYER2, SIDE, SIZE,
+    BitBoard, TeekoEngine, board_from_string, bits_moves, bits_win, move_to_coords,
+)
+
+# (position, trait, profondeur, nb de feuilles), calculés avec les deux générateurs
+REFERENCE = [
+    ("." * 25, PLAYER1, 1, 25),
+    ("." * 25, PLAYER1, 2, 600),
+    ("." * 25, PLAYER1, 3, 13800),
+    ("." * 25, PLAYER1, 4, 303600),
+    ("." * 25, PLAYER1, 5, 6375600),
+    ("...........O.O.XO...X..X.", PLAYER1, 3, 3808),
+    ("...........O.O.XO...X..X.", PLAYER1, 4, 78030),
+    ("..X.O.X.......X..O..O.OX.", PLAYER1, 3, 5264),
+    ("..X.O.X.......X..O..O.OX.", PLAYER1, 5, 1458037),
+    (".O....XO..X..X....X..O..O", PLAYER2, 4, 96768),
+    (".O....XO..X..X....X..O..O", PLAYER2, 5, 1518596),
+]
+
+
+def perft(bb, side, depth):
+    """Feuilles à depth demi-coups de bb, side au trait (make/unmake sur BitBoard)."""
+    own, opp = bb.bits[side], bb.bits[1 - side]
+    if bits_win(own) or bits_win(opp):
+        return 0
+    moves = bits_moves(own, opp)
+    if depth == 1:
+        return len(moves)
+    total = 0
+    for m in moves:
+        undo = bb.make(m, side)
+        total += perft(bb, 1 - side, depth - 1)
+        bb.unmake(undo)
+    return total
+
+
+def perft_lists(engine, board, player, depth):
+    """Même compte sur plateau liste de listes (get_all_targets, make_move)."""
+    opponent = PLAYER2 if player == PLAYER1 else PLAYER1
+    if engine.check_win_board(board, player) or engine.check_win_board(board, opponent):
+        return 0
+    moves = engine.get_all_targets(board, player)
+    if depth == 1:
+        return len(moves)
+    total = 0
+    for m in moves:
+        undo = engine.make_move(board, m, player)
+        total += perft_lists(engine, board, opponent, depth - 1)
+        engine.unmake_move(board, undo)
+    return total
+
+
+def run(position, player, depth, lists=False, divide=False, log=print):
+    """Perft d'une position, retourne (feuilles, secondes)."""
+    start = time.perf_counter()
+    if depth == 0:
+        return 1, 0.0
+    if lists:
+        engine = TeekoEngine()
+        board = board_from_string(position)
+        count = perft_lists(engine, board, player, depth)
+    else:
+        bb = BitBoard.from_board(board_from_string(position))
+        side = SIDE[player]
+        if divide:
+            count = 0
+            for m in bits_moves(bb.bits[side], bb.bits[1 - side]):
+                undo = bb.make(m, side)
+                n = perft(bb, 1 - side, depth - 1) if depth > 1 else 1
+                bb.unmake(undo)
+                log(f"  {move_to_coords(m)}: {n}")
+                count += n
+        else:
+            count = perft(bb, side, depth)
+    return count, time.perf_counter() - start
+
+
+def check(lists=False, log=print):
+    """Compare aux comptes REFERENCE, retourne True si tous identiques."""
+    ok = True
+    for position, player, depth, expected in REFERENCE:
+        count, elapsed = run(position, player, depth, lists)
+        status = "ok" if count == expected else f"ERREUR (attendu {expected})"
+        ok &= count == expected
+        log(f"{position} {player} d{depth}: {count:>9} {elapsed:6.2f}s "
+            f"{count / max(elapsed, 1e-9):>10.0f} feuilles/s  {status}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft du générateur de coups Teeko.")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--position", default="." * 25, help="25 caractères X/O/. ligne par ligne")
+    parser.add_argument("--player", default=PLAYER1, choices=[PLAYER1, PLAYER2], help="joueur au trait")
+    parser.add_argument("--divide", action="store_true", help="détail par coup racine")
+    parser.add_argument("--lists", action="store_true", help="générateur sur listes (get_all_targets)")
+    parser.add_argument("--check", action="store_true", help="vérifie les comptes de référence")
+    args = parser.parse_args(argv)
+    if args.check:
+        return 0 if check(args.lists) else 1
+    if len(args.position) != SIZE * SIZE:
+        parser.error("--position: 25 caractères attendus")
+    count, elapsed = run(args.position, args.player, args.depth, args.lists, args.divide)
+    print(f"perft({args.depth}) = {count} en {elapsed:.2f}s, {count / max(elapsed, 1e-9):.0f} feuilles/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
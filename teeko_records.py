@@ -0,0 +1,99 @@
+# teeko_records.py
+"""Lecture d'un fichier de parties (cf. GameRecordWriter): bilan par paire de
+joueurs (niveau et moteur), affichage de parties, vérification en rejouant
+chaque coup.
+
+    python teeko_records.py [parties.bin] [--show 5] [--check]
+
+Le fichier est mappé en mémoire et parcouru partie par partie (cf.
+GameRecordReader), sans le charger en entier.
+"""
+import argparse
+import sys
+import time
+
+from Teeko_ia import (
+    GAME_RECORDS_PATH, MOVE_LIMIT, PLAYER1, PLAYER2,
+    GameRecordReader, TeekoEngine, decode_moves, move_text, move_to_coords,
+)
+
+
+def replay(moves):
+    """Rejoue moves depuis le plateau vide; retourne le gagnant (None si nulle ou
+    partie inachevée) ou lève ValueError sur un coup illégal ou après un gain.
+
+    Les nulles ne sont pas vérifiées: seul le gain termine la partie rejouée."""
+    engine = TeekoEngine()
+    player = PLAYER1
+    for i, move in enumerate(moves):
+        move = move_to_coords(move)
+        if move not in engine.get_all_targets(engine.board, player):
+            raise ValueError(f"coup {i + 1} illégal: {move}")
+        if engine.play_move(move, player) == "win":
+            if i + 1 < len(moves):
+                raise ValueError(f"coup {i + 2} après la fin de la partie")
+            return player
+        player = PLAYER2 if player == PLAYER1 else PLAYER1
+    # camp bloqué (aucun coup): perdu, comme dans teeko_selfplay
+    if not engine.get_all_targets(engine.board, player):
+        return PLAYER2 if player == PLAYER1 else PLAYER1
+    return None
+
+
+def player_text(level, engine):
+    """Joueur d'un camp: "H" (humain), "3" (minimax niveau 3), "3/mcts"."""
+    if engine is None:
+        return "H"
+    return str(level) if engine == "minimax" else f"{level}/{engine}"
+
+
+def summarize(path, show=0, check=False, log=print):
+    """Bilan du fichier; retourne le nb de parties (et d'erreurs si check)."""
+    pairs = {}
+    games = plies = errors = 0
+    start = time.perf_counter()
+    with GameRecordReader(path) as reader:
+        for level_x, level_o, engine_x, engine_o, seed, winner, data in reader:
+            games += 1
+            plies += len(data)
+            x, o = player_text(level_x, engine_x), player_text(level_o, engine_o)
+            # par paire: [X gagne, nulles, O gagne]
+            counts = pairs.setdefault((x, o), [0, 0, 0])
+            counts[0 if winner == PLAYER1 else 2 if winner == PLAYER2 else 1] += 1
+            if games <= show:
+                moves = " ".join(move_text(m) for m in decode_moves(data))
+                log(f"#{games} X={x} O={o} graine={seed!r} gagnant={winner}: {moves}")
+            if check:
+                try:
+                    replayed = replay(decode_moves(data))
+                except ValueError as e:
+                    errors += 1
+                    log(f"#{games}: {e}")
+                    continue
+                # une partie sans gagnant s'arrête sur une nulle (ou a été interrompue)
+                if winner is not None and replayed != winner:
+                    errors += 1
+                    log(f"#{games}: gagnant {replayed} au lieu de {winner}")
+    elapsed = time.perf_counter() - start
+    log(f"{'X':>6} {'O':>6} {'X gagne':>8} {'nulles':>7} {'O gagne':>8}   (H = humain)")
+    for (x, o), (wx, d, wo) in sorted(pairs.items()):
+        log(f"{x:>6} {o:>6} {wx:>8} {d:>7} {wo:>8}")
+    log(f"{games} parties, {plies} coups ({plies / max(games, 1):.1f} par partie, "
+        f"limite {MOVE_LIMIT}) lues en {elapsed:.2f}s")
+    if check:
+        log(f"vérification: {errors} erreur(s)")
+    return games, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bilan d'un fichier de parties Teeko.")
+    parser.add_argument("path", nargs="?", default=GAME_RECORDS_PATH)
+    parser.add_argument("--show", type=int, default=0, help="affiche les N premières parties")
+    parser.add_argument("--check", action="store_true", help="rejoue chaque partie pr la vérifier")
+    args = parser.parse_args(argv)
+    _, errors = summarize(args.path, args.show, args.check)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# teeko_selfplay.py
+"""Parties IA contre IA sans interface, réparties sur plusieurs processus.
+
+Chaque paire (ordonnée) de joueurs joue --games parties. Un joueur = un
+niveau de DIFFICULTIES et un moteur (--engines: minimax, mcts), noté
+"Moyen" pr minimax et "Moyen/mcts" sinon. Chaque coup est limité au budget
+du niveau (level_budget: LEVEL_NODES noeuds, MCTS_PLAYOUTS pr mcts, sinon
+--nodes) et chaque partie a sa graine dérivée de --seed (TeekoEngine(seed=...):
+erreurs volontaires, playouts MCTS), donc deux lancements identiques donnent
+les mêmes résultats (sauf avec --time-ms, qui dépend de la machine).
+
+    python teeko_selfplay.py [--games 20] [--jobs 4] [--seed 0] [--tt]
+                             [--nodes N | --time-ms MS] [--levels Facile Moyen]
+                             [--engines minimax mcts]
+                             [--json resultats.jsonl] [--stats recherches.jsonl]
+                             [--record parties.bin]
+
+--record ajoute chaque partie (coups, niveaux, graine, résultat) à un fichier
+de parties (cf. GameRecordWriter, teeko_records.py).
+
+Le bilan donne aussi le temps CPU moyen par coup de chaque camp, pr comparer
+la force des moteurs à temps de calcul égal (--time-ms, ou --nodes = nb de
+playouts pr MCTS).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Teeko_ia import (
+    PLAYER1, PLAYER2, DIFFICULTIES, MISTAKE_PROBS, SEARCH_ENGINES,
+    GameRecordWriter, TeekoEngine, default_endgame_db, default_opening_book, level_budget,
+)
+
+# au-delà: partie interrompue (la règle des 30 coups la termine bien avant)
+MAX_PLIES = 200
+
+
+def parse_player(name):
+    """"Moyen" -> ("Moyen", "minimax"), "Moyen/mcts" -> ("Moyen", "mcts")."""
+    level, _, search_engine = name.partition("/")
+    return level, search_engine or "minimax"
+
+
+def play_game(level_x, level_o, seed, time_ms=None, nodes=None, use_tt=False, tables=False,
+              stats_log=None, record=False):
+    """Joue une partie level_x (X) contre level_o (O), joueurs notés comme parse_player.
+
+    stats_log: fichier JSON lines où ajouter les compteurs de chaque recherche.
+
+    Retourne un dict: winner (PLAYER1, PLAYER2 ou None si nulle), plies, seconds,
+    cpu_x / cpu_o (secondes CPU de chaque camp), + moves (coups en indices) si record."""
+    players = {PLAYER1: parse_player(level_x), PLAYER2: parse_player(level_o)}
+    depths = {p: DIFFICULTIES[level] for p, (level, _) in players.items()}
+    budgets = {p: level_budget(depths[p], time_ms, nodes, e) for p, (_, e) in players.items()}
+    perfect = tables and all(MISTAKE_PROBS.get(d, 0.0) == 0.0 for d in depths.values())
+    seed_text = f"{seed}:{level_x}:{level_o}"
+    engine = TeekoEngine(
+        use_tt=use_tt,
+        endgame_db=default_endgame_db() if perfect else None,
+        opening_book=default_opening_book() if perfect else None,
+        stats_log=stats_log,
+        seed=seed_text,
+    )
+    player = PLAYER1
+    winner = None
+    cpu = {PLAYER1: 0.0, PLAYER2: 0.0}
+    start = time.perf_counter()
+    while engine.pos_nb < MAX_PLIES:
+        engine.search_engine = players[player][1]
+        cpu_start = time.process_time()
+        move, _, _ = engine.choose_move(player, budgets[player])
+        cpu[player] += time.process_time() - cpu_start
+        opponent = PLAYER2 if player == PLAYER1 else PLAYER1
+        if move is None:
+            # bloqué: perdu, comme dans la recherche
+            winner = opponent
+            break
+        outcome = engine.play_move(move, player)
+        if outcome == "win":
+            winner = player
+            break
+        if outcome == "draw":
+            break
+        player = opponent
+    result = {
+        "x": level_x,
+        "o": level_o,
+        "seed": seed,
+        "winner": winner,
+        "plies": engine.pos_nb,
+        "seconds": time.perf_counter() - start,
+        "cpu_x": cpu[PLAYER1],
+        "cpu_o": cpu[PLAYER2],
+    }
+    if record:
+        result["moves"] = engine.moves
+    return result
+
+
+def _play_task(args):
+    return play_game(*args)
+
+
+def run(levels, games, jobs, seed=0, time_ms=None, nodes=None, use_tt=False, tables=False,
+        stats_log=None, record=False):
+    """Joue toutes les parties, retourne la liste des résultats (ordre des tâches)."""
+    tasks = [
+        (lx, lo, f"{seed}-{i}", time_ms, nodes, use_tt, tables, stats_log, record)
+        for lx in levels for lo in levels for i in range(games)
+    ]
+    if jobs == 1:
+        return [_play_task(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_play_task, tasks, chunksize=max(1, len(tasks) // (4 * jobs))))
+
+
+def summarize(results, levels, elapsed, log=print):
+    log(f"{'X':>15} {'O':>15} {'X gagne':>8} {'nulles':>7} {'O gagne':>8} {'coups moy':>10} "
+        f"{'ms CPU/coup X':>14} {'O':>6}")
+    for lx in levels:
+        for lo in levels:
+            games = [r for r in results if r["x"] == lx and r["o"] == lo]
+            if not games:
+                continue
+            wx = sum(r["winner"] == PLAYER1 for r in games)
+            wo = sum(r["winner"] == PLAYER2 for r in games)
+            plies = sum(r["plies"] for r in games)
+            # X joue un coup de plus que O si le nb de coups est impair
+            moves_x = max(1, (plies + len(games)) // 2)
+            moves_o = max(1, plies - moves_x)
+            cpu_x = sum(r["cpu_x"] for r in games) * 1000 / moves_x
+            cpu_o = sum(r["cpu_o"] for r in games) * 1000 / moves_o
+            log(f"{lx:>15} {lo:>15} {wx:>8} {len(games) - wx - wo:>7} {wo:>8} {plies / len(games):>10.1f} "
+                f"{cpu_x:>14.1f} {cpu_o:>6.1f}")
+    total = sum(r["plies"] for r in results)
+    log(f"{len(results)} parties, {total} coups en {elapsed:.1f}s: {total / max(elapsed, 1e-9):.1f} coups/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Self-play Teeko IA contre IA, sans interface.")
+    parser.add_argument("--games", type=int, default=20, help="nb de parties par paire de niveaux")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="nb de processus")
+    parser.add_argument("--seed", default="0", help="graine des erreurs volontaires")
+    parser.add_argument("--levels", nargs="+", default=list(DIFFICULTIES), choices=list(DIFFICULTIES))
+    parser.add_argument("--engines", nargs="+", default=["minimax"], choices=SEARCH_ENGINES,
+                        help="moteurs joués à chaque niveau")
+    parser.add_argument("--time-ms", type=int, default=None, help="temps max par coup (non reproductible)")
+    parser.add_argument("--nodes", type=int, default=None, help="nb max de noeuds par coup (défaut: cf. level_budget)")
+    parser.add_argument("--tt", action="store_true", help="table de transposition")
+    parser.add_argument("--tables", action="store_true",
+                        help="base de finales + livre d'ouvertures pr les niveaux sans erreur")
+    parser.add_argument("--json", default=None, help="écrit chaque partie en JSON (une par ligne)")
+    parser.add_argument("--stats", default=None, help="ajoute les compteurs de chaque recherche (JSON lines)")
+    parser.add_argument("--record", default=None, help="ajoute les parties à ce fichier de parties")
+    args = parser.parse_args(argv)
+
+    players = [level if e == "minimax" else f"{level}/{e}" for e in args.engines for level in args.levels]
+    start = time.perf_counter()
+    results = run(players, args.games, args.jobs, args.seed,
+                  args.time_ms, args.nodes, args.tt, args.tables, args.stats, args.record is not None)
+    elapsed = time.perf_counter() - start
+    if args.record:
+        # écrit par le processus principal, dans l'ordre des tâches
+        with GameRecordWriter(args.record) as writer:
+            for r in results:
+                (level_x, engine_x), (level_o, engine_o) = parse_player(r["x"]), parse_player(r["o"])
+                # graine du moteur de la partie (cf. play_game): rejouable telle quelle
+                writer.write(r.pop("moves"), r["winner"], DIFFICULTIES[level_x], DIFFICULTIES[level_o],
+                             engine_x, engine_o, seed=f"{r['seed']}:{r['x']}:{r['o']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            for r in results:
+                f.write(json.dumps(r) + "\n")
+    summarize(results, players, elapsed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# Teeko_ia et les outils teeko_*.py sont à la racine du dépôt
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
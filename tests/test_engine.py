@@ -0,0 +1,133 @@
+# tests/test_engine.py
+"""Protocole texte du moteur persistant, piloté dans le processus (EngineServer.handle_line)."""
+import io
+import json
+
+import pytest
+
+from Teeko_ia import (
+    PLAYER1, PLAYER2, SearchBudget, TeekoEngine, move_text, move_to_coords, move_to_indices, parse_move,
+)
+from teeko_engine import EngineServer
+
+
+@pytest.fixture
+def server():
+    server = EngineServer(out=io.StringIO(), use_tt=False)
+    yield server
+    server.stop()
+    server.engine.close()
+
+
+def output(server):
+    # lignes envoyées depuis le dernier appel
+    lines = server.out.getvalue().splitlines()
+    server.out.seek(0)
+    server.out.truncate()
+    return lines
+
+
+def finish(server):
+    # attend la fin de la recherche lancée par go (bestmove envoyé)
+    server._search.wait()
+    server._reporter.join()
+
+
+def test_handshake(server):
+    assert server.handle_line("teeko")
+    assert server.handle_line("isready")
+    assert server.handle_line("   ")
+    assert output(server) == ["id name Teeko_ia", "teekook", "readyok"]
+
+
+def test_position_and_moves(server):
+    server.handle_line("position startpos moves 22 12")
+    server.handle_line("moves 02")
+    assert output(server) == []
+    assert server.player == PLAYER2
+    assert server.engine.pos_nb == 3
+    assert server.engine.board[2][2] == server.engine.board[0][2] == PLAYER1
+    assert server.engine.board[1][2] == PLAYER2
+    server.handle_line("stats")
+    stats = json.loads(output(server)[0][len("stats "):])
+    assert stats["position"] == {"player": PLAYER2, "moves": 3, "result": None}
+
+
+def test_go_sends_info_then_legal_bestmove(server):
+    server.handle_line("position startpos moves 22 12")
+    server.handle_line("go depth 2")
+    finish(server)
+    info, best = output(server)
+    assert info.startswith("info kind search ") and " depth 2 " in info + " "
+    move = move_to_coords(parse_move(best.split()[1]))
+    engine = server.engine
+    assert move in engine.get_all_targets(engine.board, PLAYER1)
+
+
+def test_stop_returns_last_completed_iteration(server):
+    server.handle_line("position startpos")
+    server.handle_line("go infinite")
+    assert server.handle_line("stop")
+    lines = output(server)
+    assert lines[-1].startswith("bestmove ") and lines[-1] != "bestmove none"
+    assert server._search is None
+
+
+def test_go_on_won_board_reports_result(server):
+    server.handle_line("position board XXXX.OOO................. O")
+    server.handle_line("go")
+    assert output(server) == ["info string partie terminée (win X)", "result win X", "bestmove none"]
+    server.handle_line("moves 44")
+    assert output(server)[0].startswith("info string erreur: partie terminée")
+
+
+def test_go_after_winning_move_reports_result(server):
+    server.handle_line("position startpos moves 00 44 01 43 02 42 03")
+    server.handle_line("go play")
+    assert output(server)[1:] == ["result win X", "bestmove none"]
+
+
+@pytest.mark.parametrize("line", [
+    "position",
+    "position board XX O",
+    "position board XXXX.OOOO................ Z",
+    "position board XXXXXOOOO................ O",
+    "position startpos moves 99",
+    "position startpos moves 22 22",
+    "position startpos 22",
+    "go depth",
+    "go depth x",
+    "go sideways",
+    "newgame seed",
+    "setoption name engine value alphazero",
+    "setoption name colour value red",
+])
+def test_bad_input_reports_error(server, line):
+    assert server.handle_line(line)
+    lines = output(server)
+    assert len(lines) == 1 and lines[0].startswith("info string erreur: ")
+
+
+def test_unknown_command(server):
+    assert server.handle_line("castle kingside")
+    assert output(server) == ["info string commande inconnue: castle"]
+
+
+def test_quit_stops_run(server):
+    assert server.handle_line("quit") is False
+    server.run(io.StringIO("isready\nquit\nisready\n"))
+    assert output(server) == ["readyok"]
+
+
+def test_engine_matches_local_search(server):
+    # même position, même profondeur: même coup que TeekoEngine.search_move
+    server.handle_line("position startpos moves 22 12 21")
+    server.handle_line("go depth 3")
+    finish(server)
+    best = output(server)[-1].split()[1]
+    engine = TeekoEngine(use_tt=False)
+    for text, player in (("22", PLAYER1), ("12", PLAYER2), ("21", PLAYER1)):
+        engine.play_move(move_to_coords(parse_move(text)), player)
+    move, _ = engine.search_move(engine.board, PLAYER2, SearchBudget(3), engine.pos, engine.pos_nb, iterative=True)
+    assert best == move_text(move_to_indices(move))
+
@@ -0,0 +1,69 @@
+# tests/test_evaluation.py
+"""Évaluation incrémentale (BitBoard.evaluate, tenue à jour par make/unmake) et
+par lots (evaluate_batch) identiques à evaluate_board_for_player sur le plateau
+liste correspondant, pour les deux camps."""
+import random
+
+import pytest
+
+from Teeko_ia import (
+    PLAYERS, SIDE,
+    BitBoard, TeekoEngine, bits_evaluate, bits_moves, evaluate_batch, move_to_coords, np,
+)
+
+
+def random_walks(n, seed=7):
+    """n positions atteintes par des suites aléatoires de make/unmake, jouées en
+    parallèle sur un BitBoard et sur un plateau liste: (BitBoard, liste)."""
+    rng = random.Random(seed)
+    engine = TeekoEngine()
+    bb = BitBoard()
+    board = bb.to_board()
+    undos = []
+    side = 0
+    positions = []
+    while len(positions) < n:
+        moves = bits_moves(bb.bits[side], bb.bits[1 - side])
+        # recule parfois (et tjrs si le camp au trait est bloqué)
+        if undos and (not moves or rng.random() < 0.3 or len(undos) >= 30):
+            undo_bb, undo_list = undos.pop()
+            bb.unmake(undo_bb)
+            engine.unmake_move(board, undo_list)
+            side = 1 - side
+        else:
+            move = rng.choice(moves)
+            undo_list = engine.make_move(board, move_to_coords(move), PLAYERS[side])
+            undos.append((bb.make(move, side), undo_list))
+            side = 1 - side
+        positions.append((bb.copy(), [row[:] for row in board]))
+    return positions
+
+
+def test_incremental_evaluation_matches_list_board():
+    engine = TeekoEngine()
+    for bb, board in random_walks(3000):
+        assert BitBoard.from_board(board) == bb
+        for player in PLAYERS:
+            expected = engine.evaluate_board_for_player(board, player)
+            assert bb.evaluate(SIDE[player]) == expected
+            side = SIDE[player]
+            assert bits_evaluate(bb.bits[side], bb.bits[1 - side]) == expected
+
+
+def test_incremental_state_matches_fresh_bitboard():
+    # lines / seq / center après make/unmake = ceux d'un BitBoard recalculé
+    for bb, _ in random_walks(1000, seed=8):
+        fresh = BitBoard(*bb.bits)
+        assert (bb.key, bb.lines, bb.seq, bb.center) == (fresh.key, fresh.lines, fresh.seq, fresh.center)
+
+
+@pytest.mark.skipif(np is None, reason="NumPy absent")
+def test_batch_evaluation_matches_list_board():
+    engine = TeekoEngine()
+    positions = random_walks(3000, seed=9)
+    xs = [bb.bits[0] for bb, _ in positions]
+    os_ = [bb.bits[1] for bb, _ in positions]
+    for player in PLAYERS:
+        scores = evaluate_batch(xs, os_, SIDE[player])
+        expected = [engine.evaluate_board_for_player(board, player) for _, board in positions]
+        assert [int(s) for s in scores] == expected
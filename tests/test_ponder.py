@@ -0,0 +1,37 @@
+# tests/test_ponder.py
+"""Réponses préparées pendant le tour adverse (start_ponder): réutilisées pr la
+même position, le même historique et le même budget seulement."""
+import random
+
+from Teeko_ia import PLAYER1, PLAYER2, SearchBudget, TeekoEngine, level_budget
+
+
+def pondered_game(budget):
+    """Partie après X en c3, réponses de X préparées, puis une réponse couverte de O jouée."""
+    engine = TeekoEngine()
+    engine.play_move((None, (2, 2)), PLAYER1)
+    engine.start_ponder(PLAYER1, budget).wait()
+    # pièces de O dans la 1re position préparée: son coup de placement
+    o = next(iter(engine.ponder_results))[1]
+    engine.play_move((None, divmod(o.bit_length() - 1, 5)), PLAYER2)
+    return engine
+
+
+def test_ponder_hit_with_same_budget():
+    budget = level_budget(3)
+    engine = pondered_game(budget)
+    assert all(entry[0] == budget.key() for entry in engine.ponder_results.values())
+    # Random(0): pas d'erreur volontaire au 1er tirage
+    move, kind, _ = engine.choose_move(PLAYER1, budget, random.Random(0))
+    assert kind == "ponder" and move is not None
+    assert engine.ponder_hits == 1
+
+
+def test_ponder_miss_on_other_budget_or_history():
+    engine = pondered_game(level_budget(3))
+    assert engine._ponder_lookup(PLAYER1, level_budget(3)) is not None
+    # budget sans limite de noeuds: autre recherche
+    assert engine._ponder_lookup(PLAYER1, SearchBudget(3)) is None
+    # même position à un autre n° de coup: règle des 30 coups différente
+    engine.pos_nb += 2
+    assert engine._ponder_lookup(PLAYER1, level_budget(3)) is None
@@ -0,0 +1,99 @@
+# tests/test_records.py
+"""Fichier de parties: codes des coups, aller-retour GameRecordWriter ->
+GameRecordReader, fichier tronqué, partie rejouée depuis son en-tête."""
+import pytest
+
+import teeko_selfplay
+from Teeko_ia import (
+    CODE_MOVES, MOVE_CODES, NB_CELLS, NEIGHBORS, PLAYER1, PLAYER2, RECORD_HEADER, RECORD_MAGIC,
+    GameRecordReader, GameRecordWriter, TeekoEngine, decode_moves, encode_moves, level_budget,
+    move_to_indices,
+)
+from teeko_records import replay
+
+# partie en indices: 8 poses, puis X 19-14, O 0-1, X 14-18 (carré 12 13 17 18)
+PLACEMENT = [(None, 12), (None, 0), (None, 13), (None, 4), (None, 17), (None, 20), (None, 19), (None, 24)]
+MOVEMENT = [(19, 14), (0, 1), (14, 18)]
+
+
+def test_move_codes_fit_one_byte_and_invert():
+    placements = [(None, d) for d in range(NB_CELLS)]
+    movements = [(s, d) for s in range(NB_CELLS) for d in NEIGHBORS[s]]
+    assert set(MOVE_CODES) == set(placements + movements)
+    assert len(set(MOVE_CODES.values())) == len(MOVE_CODES)
+    assert max(MOVE_CODES.values()) < 256
+    assert all(CODE_MOVES[MOVE_CODES[m]] == m for m in MOVE_CODES)
+    moves = placements + movements
+    assert decode_moves(encode_moves(moves)) == moves
+
+
+def test_round_trip_placement_and_movement(tmp_path):
+    assert replay(PLACEMENT + MOVEMENT) == PLAYER1
+    path = tmp_path / "parties.bin"
+    games = [
+        (PLACEMENT + MOVEMENT, PLAYER1, 3, 0, "minimax", None, "graine-é"),
+        (PLACEMENT[:5], None, 0, 0, None, None, ""),
+        (PLACEMENT, PLAYER2, 5, 1, "mcts", "minimax", "0-1:Difficile/mcts:Facile"),
+    ]
+    with GameRecordWriter(str(path)) as writer:
+        for moves, winner, lx, lo, ex, eo, seed in games[:2]:
+            writer.write(moves, winner, lx, lo, ex, eo, seed)
+        assert writer.written == 2
+    # ajout à un fichier existant: magic écrit une seule fois
+    with GameRecordWriter(str(path)) as writer:
+        moves, winner, lx, lo, ex, eo, seed = games[2]
+        writer.write(moves, winner, lx, lo, ex, eo, seed)
+    assert path.read_bytes().count(RECORD_MAGIC) == 1
+    with GameRecordReader(str(path)) as reader:
+        read = [(decode_moves(data), winner, lx, lo, ex, eo, seed)
+                for lx, lo, ex, eo, seed, winner, data in reader]
+    assert read == games
+
+
+def test_truncated_file_drops_last_game(tmp_path):
+    path = tmp_path / "parties.bin"
+    with GameRecordWriter(str(path)) as writer:
+        writer.write(PLACEMENT, PLAYER2, 1, 1, "minimax", "minimax", "a")
+        writer.write(PLACEMENT + MOVEMENT, PLAYER1, 3, 3, "minimax", "mcts", "b")
+    data = path.read_bytes()
+    first_end = len(RECORD_MAGIC) + RECORD_HEADER.size + 1 + len(PLACEMENT)
+    # coupé dans les coups, dans la graine, dans l'en-tête de la 2e partie
+    for cut in (len(data) - 1, first_end + RECORD_HEADER.size, first_end + 3):
+        path.write_bytes(data[:cut])
+        with GameRecordReader(str(path)) as reader:
+            games = list(reader)
+        assert len(games) == 1
+        assert games[0][4] == "a" and decode_moves(games[0][6]) == PLACEMENT
+
+
+def test_other_format_is_rejected(tmp_path):
+    old = tmp_path / "ancien.bin"
+    old.write_bytes(b"TEEKOGR1" + bytes(6))
+    with pytest.raises(ValueError):
+        GameRecordReader(str(old))
+    with pytest.raises(ValueError):
+        GameRecordWriter(str(old))
+    assert old.read_bytes() == b"TEEKOGR1" + bytes(6)
+
+
+def test_selfplay_record_replays_from_header(tmp_path):
+    # niveau, moteur et graine de l'en-tête suffisent à refaire la partie
+    path = tmp_path / "selfplay.bin"
+    teeko_selfplay.main(["--games", "1", "--jobs", "1", "--levels", "Facile",
+                         "--engines", "minimax", "mcts", "--record", str(path)])
+    with GameRecordReader(str(path)) as reader:
+        records = list(reader)
+    assert {(r[2], r[3]) for r in records} == {(ex, eo) for ex in ("minimax", "mcts")
+                                              for eo in ("minimax", "mcts")}
+    for level_x, level_o, engine_x, engine_o, seed, winner, data in records:
+        moves = decode_moves(data)
+        assert replay(moves) == winner
+        engine = TeekoEngine(seed=seed)
+        sides = {PLAYER1: (level_x, engine_x), PLAYER2: (level_o, engine_o)}
+        player = PLAYER1
+        for move in moves:
+            level, engine.search_engine = sides[player]
+            found, _, _ = engine.choose_move(player, level_budget(level, search_engine=engine.search_engine))
+            assert move_to_indices(found) == move
+            engine.play_move(found, player)
+            player = PLAYER2 if player == PLAYER1 else PLAYER1
@@ -0,0 +1,198 @@
+# tests/test_search.py
+"""La recherche rend le plateau intact: liste inchangée, BitBoard (bits, clé
+Zobrist, occupation des alignements, évaluation) identique avant et après.
+Historique des positions (PositionHistory) et nulles vues par la recherche."""
+import math
+import random
+
+import pytest
+
+from Teeko_ia import (
+    MOVE_LIMIT, PLAYER1, PLAYER2, REPETITION_WINDOW, SIDE,
+    BitBoard, PositionHistory, SearchBudget, TeekoEngine, bits_apply, bits_moves, bits_win, np,
+)
+
+ENGINE_OPTIONS = [
+    {},
+    {"use_tt": True},
+    {"move_ordering": "static"},
+    {"search_algorithm": "pvs", "use_tt": True},
+    {"threat_extension": True},
+    {"collect_pv": True},
+    pytest.param({"batch_leaves": True}, marks=pytest.mark.skipif(np is None, reason="NumPy absent")),
+]
+
+
+def random_positions(n, seed=2):
+    """n positions (BitBoard, joueur au trait) sans gain, placement et mouvement."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < n:
+        bb = BitBoard()
+        side = 0
+        for _ in range(rng.randrange(1, 16)):
+            moves = bits_moves(bb.bits[side], bb.bits[1 - side])
+            bb.make(rng.choice(moves), side)
+            if bits_win(bb.bits[side]):
+                break
+            side = 1 - side
+        else:
+            positions.append((bb, (PLAYER1, PLAYER2)[side]))
+    return positions
+
+
+def state(bb):
+    return bb.bits[:], bb.key, bb.lines[:], bb.seq, bb.center
+
+
+@pytest.mark.parametrize("options", ENGINE_OPTIONS)
+def test_minimax_leaves_list_board_unchanged(options):
+    engine = TeekoEngine(**options)
+    for bb, player in random_positions(20):
+        board = bb.to_board()
+        before = [row[:] for row in board]
+        engine.minimax(board, 3, -math.inf, math.inf, True, player)
+        assert board == before
+
+
+@pytest.mark.parametrize("options", ENGINE_OPTIONS)
+def test_minimax_leaves_bitboard_unchanged(options):
+    engine = TeekoEngine(**options)
+    for bb, player in random_positions(20):
+        before = state(bb)
+        engine.minimax(bb, 3, -math.inf, math.inf, True, player)
+        assert state(bb) == before
+        # et identique à une reconstruction depuis les bits
+        assert state(BitBoard(*bb.bits)) == before
+
+
+@pytest.mark.parametrize("options", ENGINE_OPTIONS)
+@pytest.mark.parametrize("maximizing", [True, False])
+def test_minimax_bits_leaves_bitboard_unchanged(options, maximizing):
+    engine = TeekoEngine(**options)
+    for bb, player in random_positions(20, seed=3):
+        before = state(bb)
+        depth = 3
+        engine._root_depth = depth
+        engine._new_ordering(depth)
+        engine._new_pv(depth)
+        engine._minimax_bits(bb, SIDE[player], depth, -math.inf, math.inf, maximizing)
+        assert state(bb) == before
+
+
+def test_minimax_bits_with_history_leaves_bitboard_unchanged():
+    # nulles suivies (répétitions, 30 coups): historique rendu intact lui aussi
+    engine = TeekoEngine(use_tt=True)
+    for bb, player in random_positions(20, seed=4):
+        history = PositionHistory()
+        history.push(bb.key)
+        keys = list(history.keys)
+        before = state(bb)
+        depth = 3
+        engine._root_depth = depth
+        engine._new_ordering(depth)
+        engine._new_pv(depth)
+        engine._history = history
+        engine._draw_base = 26
+        try:
+            engine._minimax_bits(bb, SIDE[player], depth, -math.inf, math.inf, True)
+        finally:
+            engine._history = None
+            engine._draw_base = 0
+        assert state(bb) == before
+        assert list(history.keys) == keys
+
+
+def test_position_history_counts():
+    history = PositionHistory()
+    assert [history.push(k) for k in (1, 2, 1, 1)] == [1, 1, 2, 3]
+    assert len(history) == 4 and history.count(1) == 3 and history.count(3) == 0
+    history.pop()
+    assert history.count(1) == 2
+    history.pop()
+    history.pop()
+    assert list(history.keys) == [1] and history.count(1) == 1 and history.count(2) == 0
+
+
+def test_position_history_window():
+    # position courante + REPETITION_WINDOW précédentes (cf. check_draw)
+    history = PositionHistory(range(REPETITION_WINDOW + 1))
+    assert len(history) == REPETITION_WINDOW + 1 and history.count(0) == 1
+    assert history.push(0) == 1
+    assert len(history) == REPETITION_WINDOW + 1
+    assert list(history.keys) == list(range(1, REPETITION_WINDOW + 1)) + [0]
+    history.push(-1)
+    assert history.count(0) == 1 and history.count(1) == 0
+    # pop() remet les clés sorties de la fenêtre
+    history.pop()
+    history.pop()
+    assert list(history.keys) == list(range(REPETITION_WINDOW + 1))
+    assert history.counts == {k: 1 for k in range(REPETITION_WINDOW + 1)}
+
+
+def test_position_history_matches_window_of_keys():
+    rng = random.Random(3)
+    history = PositionHistory()
+    pushed = []
+    for _ in range(2000):
+        if pushed and rng.random() < 0.4:
+            history.pop()
+            pushed.pop()
+        else:
+            key = rng.randrange(6)
+            count = history.push(key)
+            pushed.append(key)
+            assert count == pushed[-REPETITION_WINDOW - 1:].count(key)
+        window = pushed[-REPETITION_WINDOW - 1:]
+        assert list(history.keys) == window
+        assert all(history.count(k) == window.count(k) for k in range(6))
+
+
+def test_position_history_copy_is_independent():
+    history = PositionHistory([1, 2, 3], window=2)
+    copy = history.copy()
+    assert copy.window == 2 and list(copy.keys) == [1, 2, 3]
+    copy.push(4)
+    copy.push(2)
+    assert list(history.keys) == [1, 2, 3] and history.count(4) == 0 and history.count(2) == 1
+    history.push(5)
+    assert copy.count(5) == 0 and list(copy.keys) == [3, 4, 2]
+
+
+def movement_positions(n, seed):
+    return [(bb, player) for bb, player in random_positions(4 * n, seed)
+            if bb.bits[0].bit_count() + bb.bits[1].bit_count() == 8][:n]
+
+
+@pytest.mark.parametrize("options", ENGINE_OPTIONS)
+def test_move_limit_draw_in_search(options):
+    # au 29e coup joué, le 30e est nul sauf s'il gagne
+    engine = TeekoEngine(**options)
+    for bb, player in movement_positions(12, seed=7):
+        own, opp = bb.bits[SIDE[player]], bb.bits[1 - SIDE[player]]
+        wins = any(bits_win(bits_apply(own, t)) for t in bits_moves(own, opp))
+        history = PositionHistory([bb.key])
+        _, score = engine.search_move(bb.to_board(), player, SearchBudget(3), history, MOVE_LIMIT - 1)
+        assert score == (100000 + 2 if wins else 0)
+        assert list(history.keys) == [bb.key]
+
+
+@pytest.mark.parametrize("options", ENGINE_OPTIONS)
+def test_move_limit_cuts_search_tree(options):
+    # 30e coup au 3e ply: la recherche à profondeur 5 vaut celle à profondeur 3,
+    # sauf le bonus de distance des gains/pertes forcés
+    engine = TeekoEngine(**options)
+    reference = TeekoEngine()
+    for bb, player in movement_positions(6, seed=7):
+        board = bb.to_board()
+        scores = []
+        for depth in (3, 5):
+            history = PositionHistory([bb.key])
+            _, score = engine.search_move(board, player, SearchBudget(depth), history, MOVE_LIMIT - 3)
+            _, expected = reference.search_move(board, player, SearchBudget(depth), history, MOVE_LIMIT - 3)
+            assert score == expected
+            scores.append(score)
+        if abs(scores[0]) < 100000:
+            assert scores[1] == scores[0]
+        else:
+            assert (scores[1] > 0) == (scores[0] > 0)
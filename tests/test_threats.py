@@ -0,0 +1,106 @@
+# tests/test_threats.py
+"""Menaces sur bitboards (WIN_COMPLETIONS, bits_threats, bits_threat_move,
+bits_unstoppable) sur des positions fixes: gain immédiat, blocage forcé,
+double menace, aucune menace, en placement et en mouvement."""
+import pytest
+
+from Teeko_ia import (
+    WIN_COMPLETIONS, WIN_MASKS,
+    BitBoard, bits_threat_move, bits_threats, bits_unstoppable, board_from_string, iter_bits,
+)
+
+
+def bits(rows):
+    """(X, O) d'un plateau donné ligne par ligne (5 chaînes de 5 car.)."""
+    return tuple(BitBoard.from_board(board_from_string("".join(rows))).bits)
+
+
+def mask(*cells):
+    return sum(1 << c for c in cells)
+
+
+def test_win_completions_match_win_masks():
+    expected = {}
+    for m in WIN_MASKS:
+        for i in iter_bits(m):
+            expected.setdefault(m & ~(1 << i), set()).add(i)
+    assert {k: set(iter_bits(v)) for k, v in WIN_COMPLETIONS.items()} == expected
+    assert all(k.bit_count() == 3 and not k & v for k, v in WIN_COMPLETIONS.items())
+    # 3 pions de la ligne 0: seule la case 3 complète (0 1 2 3)
+    assert WIN_COMPLETIONS[mask(0, 1, 2)] == mask(3)
+    assert WIN_COMPLETIONS[mask(6, 7, 8)] == mask(5, 9)
+    assert mask(0, 12, 24) not in WIN_COMPLETIONS
+
+
+# placement: X a posé 0 1 2 (menace en 3)
+PLACEMENT_THREAT = bits(["XXX..", ".....", "OO...", ".....", "....."])
+# mouvement: X 12 13 17 19, gagne par 19-18 (carré 12 13 17 18); O 0 4 20 24
+MOVEMENT_THREAT = bits(["O...O", ".....", "..XX.", "..X.X", "O...O"])
+
+
+def test_immediate_win_in_placement():
+    x, o = PLACEMENT_THREAT
+    assert bits_threats(x, o) == mask(3)
+    assert bits_threat_move(x, o) == (None, 3)
+
+
+def test_forced_block_in_placement():
+    x, o = PLACEMENT_THREAT
+    assert bits_threat_move(o, x) == (None, 3)
+    # O peut encore poser en 3: menace simple, parable
+    assert not bits_unstoppable(x, o)
+
+
+def test_immediate_win_in_movement():
+    x, o = MOVEMENT_THREAT
+    assert bits_threats(x, o) == mask(18)
+    assert bits_threat_move(x, o) == (19, 18)
+
+
+def test_forced_block_in_movement():
+    # O 24 est voisin de 18: seul blocage
+    x, o = MOVEMENT_THREAT
+    assert bits_threat_move(o, x) == (24, 18)
+    assert not bits_unstoppable(x, o)
+
+
+def test_threat_no_opponent_piece_can_reach():
+    # O 0 4 10 20: aucun pion voisin de 18, menace imparable et pas de blocage
+    x, o = bits(["O...O", ".....", "O.XX.", "..X.X", "O...."])
+    assert bits_unstoppable(x, o)
+    assert bits_threat_move(o, x) is None
+
+
+def test_win_before_block():
+    # O 0 1 2 4 gagne par 4-3 avant de parer la menace de X en 18
+    x, o = bits(["OOO.O", ".....", "..XX.", "..X.X", "....."])
+    assert bits_threat_move(o, x) == (4, 3)
+
+
+def test_double_threat_in_placement():
+    # X 6 7 8: deux cases gagnantes, 5 et 9
+    x, o = bits([".....", ".XXX.", ".....", ".....", "O...O"])
+    assert bits_threats(x, o) == mask(5, 9)
+    assert bits_unstoppable(x, o)
+    # O pare quand même la 1re menace (la partie est perdue)
+    assert bits_threat_move(o, x) == (None, 5)
+
+
+def test_double_threat_in_movement():
+    # X 7 12 13 14 gagne par 7-11 (ligne 2) ou 14-8 (carré 7 8 12 13); O atteint
+    # chacune des deux cases, pas les deux à la fois
+    x, o = bits(["...O.", "O.X.O", "..XXX", ".....", "..O.."])
+    assert bits_threats(x, o) == mask(8, 11)
+    assert bits_unstoppable(x, o)
+    assert bits_threat_move(o, x) == (5, 11)
+
+
+@pytest.mark.parametrize("rows", [
+    ["X...O", ".....", "..X..", ".....", "O...X"],
+    ["XX..O", "O....", "....O", "...XX", "O...."],
+])
+def test_no_threat(rows):
+    x, o = bits(rows)
+    assert bits_threats(x, o) == 0 and bits_threats(o, x) == 0
+    assert bits_threat_move(x, o) is None and bits_threat_move(o, x) is None
+    assert not bits_unstoppable(x, o) and not bits_unstoppable(o, x)